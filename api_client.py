@@ -0,0 +1,528 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import codecs # UTF-8 decoderen terwijl de feed binnenkomt
+import json
+import os
+import random # jitter voor de backoff
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor  # Meerdere NASA-vensters tegelijk ophalen
+from datetime import datetime, date, timedelta
+
+from cprint import cprint                                   # Printen in kleurtjes
+from instrumentatie import gemeten, tel                     # Meetpunten (staan standaard uit)
+
+# Let op: 'requests' en 'dotenv' worden pas geïmporteerd als er echt een API-call gedaan wordt.
+# Zo blijft het importeren van de rekenkern snel en zonder netwerk- of bestandstoegang.
+
+NASA_FEED_URL = "https://api.nasa.gov/neo/rest/v1/feed"
+NASA_LOOKUP_URL = "https://api.nasa.gov/neo/rest/v1/neo"
+REST_COUNTRIES_URL = "https://restcountries.com/v3.1/all?fields=name,population,area,altSpellings"
+# NASA ondersteunt max. 7 dagen per feed-call
+MAX_DAGEN_PER_VENSTER = 7
+# Hoeveel vensters er maximaal tegelijk opgehaald worden
+MAX_WORKERS = 4
+# Hoeveel losse objecten er maximaal tegelijk opgevraagd worden bij de lookup-API (zie neo_details.py)
+MAX_LOOKUP_WORKERS = 16
+# Per hoeveel bytes de feed gelezen wordt als hij gestreamd wordt (zie lees_feed())
+FEED_CHUNK_BYTES = 64 * 1024
+
+# Herhalen bij 429 (te veel verzoeken) en 5xx (serverfout), met exponentiële backoff en willekeurige jitter,
+# zodat meerdere processen met dezelfde API-key niet tegelijk opnieuw proberen
+MAX_POGINGEN = 5
+BACKOFF_BASIS_S = 0.5
+BACKOFF_MAX_S = 30
+# NASA telt het quotum per API-key per uur en geeft de stand mee in X-RateLimit-Limit en X-RateLimit-Remaining.
+# Zijn er minder dan RATELIMIT_RESERVE verzoeken over, dan worden de verzoeken over het uur verspreid
+# (limiet / uur) in plaats van het quotum in één keer op te maken en daarna alleen nog 429's te krijgen.
+RATELIMIT_RESERVE = 2 * max(MAX_WORKERS, MAX_LOOKUP_WORKERS)
+RATELIMIT_VENSTER_S = 60 * 60
+
+# Eén gedeelde requests.Session zodat TCP/TLS-verbindingen hergebruikt worden
+_sessie = None
+_sessie_lock = threading.Lock()
+
+# Laatst bekende stand van het NASA-quotum en het vroegste moment voor het volgende verzoek
+_quotum = {"limiet": None, "resterend": None, "volgende": 0.0}
+_quotum_lock = threading.Lock()
+
+# Verzoeken die nu lopen, zodat een identiek verzoek op het antwoord wacht in plaats van het opnieuw te doen
+_lopend = {}
+_lopend_lock = threading.Lock()
+
+# ----------------------------------------------- API-configuratie --------------------------------------------------- #
+def get_api_key():
+    """
+    Leest de NASA API-key uit het .env bestand (via dotenv) of uit de omgeving.
+    """
+    from dotenv import load_dotenv
+    load_dotenv()
+    return os.getenv("API_KEY")
+
+def get_start_date():
+    """
+    Startdatum op 6 dagen geleden zodat de NASA-feed de volledige laatste 7 dagen meepakt.
+    Deze API-call is live best traag, maar dankzij de cache is de app alsnog snel.
+    NASA ondersteunt max. 7 dagen per call — daarom kies ik hier bewust voor het maximale bereik.
+    """
+    return (datetime.today() - timedelta(days=6)).strftime("%Y-%m-%d")
+
+def get_sessie():
+    """
+    Geeft de gedeelde requests.Session terug, met een connection pool die groot genoeg is voor alle threads
+    (MAX_WORKERS voor de feed, MAX_LOOKUP_WORKERS voor de lookup-API).
+    Met ASTRO_HTTP=opnemen/afspelen/synthetisch gaat het verkeer via een cassette (zie http_cassette.py).
+    """
+    global _sessie
+    with _sessie_lock:
+        if _sessie is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from http_cassette import maak_adapter
+            _sessie = requests.Session()
+            grootte = max(MAX_WORKERS, MAX_LOOKUP_WORKERS)
+            adapter = maak_adapter(HTTPAdapter(pool_connections=grootte, pool_maxsize=grootte))
+            _sessie.mount("https://", adapter)
+            _sessie.mount("http://", adapter)
+    return _sessie
+
+def reset_sessie():
+    """Sluit de gedeelde sessie, de volgende get_sessie() maakt een nieuwe (bijv. na een andere HTTP-modus)."""
+    global _sessie
+    with _sessie_lock:
+        if _sessie is not None:
+            _sessie.close()
+        _sessie = None
+
+# ------------------------------------------- Quotum, herhalen en samenvoegen ---------------------------------------- #
+def werk_quotum_bij(response):
+    """
+    Leest de rate limit headers van NASA en onthoudt hoeveel verzoeken er nog over zijn.
+    """
+    limiet = response.headers.get("X-RateLimit-Limit")
+    resterend = response.headers.get("X-RateLimit-Remaining")
+    if resterend is None or not resterend.isdigit():
+        return
+    with _quotum_lock:
+        _quotum["resterend"] = int(resterend)
+        if limiet is not None and limiet.isdigit():
+            _quotum["limiet"] = int(limiet)
+
+def wacht_op_quotum():
+    """
+    Wacht (indien nodig) tot er weer een verzoek gedaan mag worden.
+    Zolang er genoeg quotum is gebeurt er niets, daarna krijgt elk verzoek een eigen tijdslot van uur / limiet.
+    """
+    with _quotum_lock:
+        resterend = _quotum["resterend"]
+        if resterend is None or resterend > RATELIMIT_RESERVE:
+            return
+        interval = RATELIMIT_VENSTER_S / max(1, _quotum["limiet"] or RATELIMIT_RESERVE)
+        nu = time.monotonic()
+        wacht = max(0.0, _quotum["volgende"] - nu)
+        _quotum["volgende"] = nu + wacht + interval
+    if wacht:
+        tel("nasa_gewacht_op_quotum_s", wacht)
+        time.sleep(wacht)
+
+def backoff_tijd(poging, response=None):
+    """
+    Hoe lang er gewacht wordt voor de volgende poging: de Retry-After van de server als die er is,
+    anders een willekeurige tijd tussen 0 en BACKOFF_BASIS_S * 2^poging (maximaal BACKOFF_MAX_S).
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), BACKOFF_MAX_S)
+    return random.uniform(0, min(BACKOFF_MAX_S, BACKOFF_BASIS_S * 2 ** poging))
+
+def get_met_herhaling(url, params=None, timeout=30, stream=False):
+    """
+    GET via de gedeelde sessie, rekening houdend met het quotum.
+    Bij 429, 5xx en verbindingsfouten wordt het tot MAX_POGINGEN keer opnieuw geprobeerd.
+    Met stream=True is alleen de header binnen; de aanroeper leest de body en sluit het response-object.
+
+    :return: Het laatste response-object, of None als de server helemaal niet bereikbaar was.
+    """
+    import requests
+    response = None
+    for poging in range(MAX_POGINGEN):
+        wacht_op_quotum()
+        try:
+            response = get_sessie().get(url, params=params, timeout=timeout, stream=stream)
+        except (requests.ConnectionError, requests.Timeout) as fout:
+            response = None
+            laatste_fout = fout
+        else:
+            tel("nasa_verzoeken")
+            if not stream:
+                tel("nasa_bytes_ontvangen", len(response.content))
+            werk_quotum_bij(response)
+            if response.status_code != 429 and response.status_code < 500:
+                return response
+            if stream:
+                response.close()
+        if poging < MAX_POGINGEN - 1:
+            tel("nasa_herhalingen")
+            time.sleep(backoff_tijd(poging, response))
+
+    if response is None:
+        cprint(f"NASA API niet bereikbaar: {laatste_fout}", c="rB")
+    return response
+
+def gedeeld_verzoek(sleutel, functie):
+    """
+    Voert functie() uit, tenzij er al een verzoek met dezelfde sleutel loopt: dan wordt op dat antwoord gewacht.
+    Zo kost het maar één verzoek (en één keer quotum) als meerdere threads tegelijk hetzelfde opvragen.
+    """
+    with _lopend_lock:
+        toekomst = _lopend.get(sleutel)
+        eigenaar = toekomst is None
+        if eigenaar:
+            toekomst = _lopend[sleutel] = Future()
+    if not eigenaar:
+        tel("nasa_samengevoegd")
+        return toekomst.result()
+
+    try:
+        resultaat = functie()
+    except BaseException as fout:
+        toekomst.set_exception(fout)
+        raise
+    else:
+        toekomst.set_result(resultaat)
+        return resultaat
+    finally:
+        with _lopend_lock:
+            del _lopend[sleutel]
+
+# ----------------------------------------------------API-Calls------------------------------------------------------- #
+@gemeten("nasa_lookup")
+def haal_neo_op(api_key_nasa, neo_id):
+    """
+    Haalt het volledige record van één asteroïde op bij de NASA lookup-API (/neo/<id>): alle naderingen,
+    ook die buiten het venster van de feed, en de baangegevens.
+    Identieke verzoeken die tegelijk lopen worden samengevoegd (zie gedeeld_verzoek()).
+
+    :return: De JSON van het object, of None als het niet lukte of NASA het object niet kent.
+    """
+    def ophalen():
+        response = get_met_herhaling(f"{NASA_LOOKUP_URL}/{neo_id}", params={"api_key": api_key_nasa})
+        if response is None or not response.ok:
+            # Geen melding per object, bij honderden objecten tegelijk meldt de aanroeper het één keer
+            tel("nasa_fouten")
+            return None
+        return response.json()
+
+    return gedeeld_verzoek(("lookup", api_key_nasa, str(neo_id)), ophalen)
+
+@gemeten("nasa_feed_stroom")
+def stroom_venster(api_key_nasa, start_datum, eind_datum, verwerk):
+    """
+    Haalt één venster van de feed op en geeft elke asteroïde, uitgedund, aan verwerk(datum, object) terwijl de body
+    nog binnenkomt (zie lees_feed()). Het antwoord staat zo nooit in zijn geheel in het geheugen.
+    Vragen meerdere threads tegelijk hetzelfde venster, dan loopt er één verzoek (zie gedeeld_verzoek()). Daarvoor
+    worden de uitgedunde objecten van het venster bewaard tot het binnen is; daarna krijgen de wachtende threads ze
+    ook, elk via hun eigen verwerk().
+
+    :return: True als het hele venster verwerkt is, False als het (ook na herhalen) niet lukte.
+    """
+    import requests
+    ontvangen = []
+
+    def doorgeven(datum, asteroid):
+        ontvangen.append((datum, asteroid))
+        verwerk(datum, asteroid)
+
+    def ophalen():
+        params = {
+            "start_date": start_datum,
+            "end_date": eind_datum,
+            "api_key": api_key_nasa
+        }
+        response = get_met_herhaling(NASA_FEED_URL, params=params, stream=True)
+        if response is None:
+            tel("nasa_fouten")
+            return False, ontvangen
+        with response:
+            if not response.ok:
+                tel("nasa_fouten")
+                print("Er is iets misgegaan")
+                print("Statuscode:", response.status_code)
+                return False, ontvangen
+            try:
+                for datum, asteroid in lees_feed(geteld(response.iter_content(FEED_CHUNK_BYTES))):
+                    doorgeven(datum, asteroid)
+            except (ValueError, requests.RequestException) as fout:
+                # Verbinding halverwege weg of een afgekapt antwoord: het venster telt als mislukt
+                tel("nasa_fouten")
+                cprint(f"De NASA-feed kon niet helemaal gelezen worden: {fout}", c="rB")
+                return False, ontvangen
+        return True, ontvangen
+
+    gelukt, objecten = gedeeld_verzoek(("feed", api_key_nasa, start_datum, eind_datum), ophalen)
+    if objecten is not ontvangen:
+        # Meegelift met het verzoek van een andere thread: de objecten alsnog aan de eigen verwerk() geven
+        for datum, asteroid in objecten:
+            verwerk(datum, asteroid)
+    return gelukt
+
+def geteld(chunks):
+    """Geeft de chunks door en telt de ontvangen bytes."""
+    for chunk in chunks:
+        tel("nasa_bytes_ontvangen", len(chunk))
+        yield chunk
+
+def dun_neo_uit(neo):
+    """
+    Houdt van een NASA-object alleen over wat de app gebruikt (zie kolom_opslag.objecten_naar_kolommen()):
+    id, naam, diameter in meters, gevaarlijk en per nadering de datum, snelheid, afstand en het hemellichaam.
+    """
+    return {
+        "id": str(neo["id"]),
+        "name": neo["name"],
+        "estimated_diameter": {"meters": neo["estimated_diameter"]["meters"]},
+        "is_potentially_hazardous_asteroid": neo["is_potentially_hazardous_asteroid"],
+        "close_approach_data": [
+            {
+                "close_approach_date": nadering["close_approach_date"],
+                "relative_velocity": {
+                    "kilometers_per_hour": nadering["relative_velocity"]["kilometers_per_hour"],
+                    "kilometers_per_second": nadering["relative_velocity"]["kilometers_per_second"],
+                },
+                "miss_distance": {"kilometers": nadering["miss_distance"]["kilometers"]},
+                "orbiting_body": nadering.get("orbiting_body", "Earth"),
+            }
+            for nadering in neo.get("close_approach_data", [])
+        ],
+    }
+
+def dagen_tussen(start_datum, eind_datum):
+    """Alle dagen van start t/m eind als "JJJJ-MM-DD" strings."""
+    start = date.fromisoformat(start_datum)
+    aantal = (date.fromisoformat(eind_datum) - start).days + 1
+    return [(start + timedelta(days=i)).isoformat() for i in range(aantal)]
+
+def voeg_objecten_samen(feeds):
+    """
+    Voegt de "near_earth_objects" van meerdere feed-antwoorden samen tot één lijst zonder dubbele objecten.
+    Komt een asteroïde op meerdere dagen langs, dan blijft er één object over met al zijn naderingen,
+    gesorteerd op datum zodat close_approach_data[0] de eerste nadering blijft.
+    """
+    per_id = {}
+    for feed in feeds:
+        for datum in sorted(feed["near_earth_objects"]):
+            for asteroid in feed["near_earth_objects"][datum]:
+                bestaand = per_id.get(asteroid["id"])
+                if bestaand is None:
+                    per_id[asteroid["id"]] = asteroid
+                    continue
+                bekende_data = {nadering["close_approach_date"] for nadering in bestaand["close_approach_data"]}
+                for nadering in asteroid["close_approach_data"]:
+                    if nadering["close_approach_date"] not in bekende_data:
+                        bestaand["close_approach_data"].append(nadering)
+                bestaand["close_approach_data"].sort(key=lambda nadering: nadering["close_approach_date"])
+    return list(per_id.values())
+
+def dagen_naar_vensters(dagen, max_dagen=MAX_DAGEN_PER_VENSTER):
+    """
+    Groepeert een verzameling losse dagen ("JJJJ-MM-DD") in aaneengesloten vensters van maximaal 7 dagen,
+    zodat alleen de gevraagde dagen opgehaald worden.
+
+    :return: Lijst met (start, eind) tuples als strings.
+    """
+    vensters = []
+    for dag in sorted(date.fromisoformat(d) for d in set(dagen)):
+        if vensters:
+            start, eind = vensters[-1]
+            if dag == eind + timedelta(days=1) and (dag - start).days < max_dagen:
+                vensters[-1] = (start, dag)
+                continue
+        vensters.append((dag, dag))
+    return [(start.isoformat(), eind.isoformat()) for start, eind in vensters]
+
+def haal_dagen_op(api_key_nasa, dagen, max_workers=MAX_WORKERS, verwerk=None):
+    """
+    Haalt de NASA-feed op voor een verzameling dagen, per dag gegroepeerd zoals de feed zelf doet.
+    De dagen worden in vensters van maximaal 7 dagen tegelijk (met maximaal max_workers threads) over de
+    gedeelde sessie opgehaald. Daardoor duurt het ongeveer zo lang als het traagste venster.
+    Elk venster wordt gestreamd (zie stroom_venster()), de objecten zijn dus al uitgedund.
+
+    :param verwerk: Functie verwerk(datum, object) die elke asteroïde krijgt zodra hij binnen is, bijv. om hem meteen
+                    in de kolommen van de cache te zetten. De lijsten in het resultaat blijven dan leeg.
+    :return: Dict {datum: [asteroïde-objecten]} met een (eventueel lege) lijst voor elke gevraagde dag,
+             of None als een van de vensters mislukte.
+    """
+    vensters = dagen_naar_vensters(dagen)
+    if not vensters:
+        return {}
+    per_dag = {dag: [] for dag in dagen}
+    if verwerk is None:
+        def verwerk(datum, asteroid):
+            per_dag.setdefault(datum, []).append(asteroid)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(vensters)))) as pool:
+        gelukt = list(pool.map(lambda venster: stroom_venster(api_key_nasa, *venster, verwerk), vensters))
+    if not all(gelukt):
+        return None
+    return per_dag
+
+def haal_feed_op(api_key_nasa, start_datum, eind_datum, max_workers=MAX_WORKERS):
+    """
+    Haalt een willekeurig datumbereik op uit de NASA-feed (zie haal_dagen_op()).
+
+    :return: Eén lijst met unieke (uitgedunde) asteroïde-objecten, of None als een van de vensters mislukte.
+    """
+    per_dag = haal_dagen_op(api_key_nasa, dagen_tussen(start_datum, eind_datum), max_workers)
+    if per_dag is None:
+        return None
+    return voeg_objecten_samen([{"near_earth_objects": per_dag}])
+
+@gemeten("restcountries")
+def download_landen(etag=None, laatst_gewijzigd=None):
+    """
+    Vraagt alle landen op bij de REST Countries API.
+    Met een etag of 'Last-Modified' datum van een eerdere download wordt het een conditionele request:
+    als er niets veranderd is antwoordt de server met 304 en zonder data.
+
+    :return: Het response-object, of None als de server niet bereikbaar is.
+    """
+    import requests
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if laatst_gewijzigd:
+        headers["If-Modified-Since"] = laatst_gewijzigd
+    try:
+        response = get_sessie().get(REST_COUNTRIES_URL, headers=headers, timeout=30)
+    except requests.RequestException as fout:
+        tel("restcountries_fouten")
+        cprint(f"REST Countries API niet bereikbaar: {fout}", c="rB")
+        return None
+    tel("restcountries_verzoeken")
+    tel("restcountries_bytes_ontvangen", len(response.content))
+    return response
+
+def parse_landen(landen):
+    """Zet de ruwe JSON van REST Countries om naar rijen voor de tabel.
+    Per land wordt de volgende info bewaard:
+    - Landnaam
+    - Populatie
+    - Oppervlakte (in km²)
+    - Bevolkingsdichtheid"""
+    # direct met een list comprehension de data formatteren voor in de tabel
+    return [
+        [
+            land["name"]["common"],
+            land["population"],
+            land["area"],
+            # Dit zat niet in de API dus hier wordt de bevolkingsdichtheid berekend
+            round(land['population'] / land['area'],0)
+        ]
+        for land in landen]
+
+def parse_aliassen(landen):
+    """
+    Andere namen per land uit de ruwe JSON van REST Countries: de officiële naam en de 'altSpellings'
+    (bijv. "United States of America", "USA" en "US" voor "United States"), zodat ook die in de zoekindex staan.
+
+    :return: Dict {landnaam: [andere namen]}.
+    """
+    return {
+        land["name"]["common"]: [land["name"].get("official", ""), *land.get("altSpellings", [])]
+        for land in landen
+    }
+
+# -------------------------------------------------- Feed streamen --------------------------------------------------- #
+class JsonStroom:
+    """
+    Leest JSON uit een reeks byte-chunks, waarde voor waarde. Er wordt alleen zoveel tekst bewaard als nodig is
+    voor de waarde die nu gelezen wordt; de losse waarden (één asteroïde) worden door de json-module zelf gelezen.
+    """
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.json = json.JSONDecoder()
+        self.tekst = ""
+        self.positie = 0
+        self.klaar = False
+
+    def lees_meer(self):
+        """Voegt de volgende chunk toe aan de tekst, het gelezen deel gaat eruit. :return: False aan het eind."""
+        if self.klaar:
+            return False
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.klaar = True
+            nieuw = self.decoder.decode(b"", final=True)
+        else:
+            nieuw = self.decoder.decode(chunk)
+        self.tekst = self.tekst[self.positie:] + nieuw
+        self.positie = 0
+        return True
+
+    def kijk(self):
+        """Het volgende teken dat geen witruimte is, zonder het te lezen."""
+        while True:
+            while self.positie < len(self.tekst) and self.tekst[self.positie] in " \t\r\n":
+                self.positie += 1
+            if self.positie < len(self.tekst):
+                return self.tekst[self.positie]
+            if not self.lees_meer():
+                raise ValueError("Onverwacht einde van de JSON")
+
+    def neem(self, *verwacht):
+        """Leest één leesteken (zoals '{' of ','), dat een van 'verwacht' moet zijn."""
+        teken = self.kijk()
+        if teken not in verwacht:
+            raise ValueError(f"Verwachtte {' of '.join(verwacht)} op positie {self.positie}, niet {teken!r}")
+        self.positie += 1
+        return teken
+
+    def waarde(self):
+        """Leest één volledige JSON-waarde."""
+        self.kijk()
+        while True:
+            try:
+                waarde, eind = self.json.raw_decode(self.tekst, self.positie)
+            except json.JSONDecodeError:
+                if not self.lees_meer():
+                    raise
+                continue
+            # Een getal of literal dat precies op de rand van de chunk eindigt kan nog doorlopen
+            if eind == len(self.tekst) and self.lees_meer():
+                continue
+            self.positie = eind
+            return waarde
+
+def lees_feed(chunks):
+    """
+    Leest een feed-antwoord ({"near_earth_objects": {datum: [objecten]}, ...}) terwijl het binnenkomt.
+    Geeft per asteroïde (datum, uitgedund object) (zie dun_neo_uit()); alle andere velden worden overgeslagen.
+
+    :param chunks: De body in stukken bytes, bijv. response.iter_content().
+    """
+    stroom = JsonStroom(chunks)
+    stroom.neem("{")
+    if stroom.kijk() == "}":
+        return
+    while True:
+        sleutel = stroom.waarde()
+        stroom.neem(":")
+        if sleutel != "near_earth_objects":
+            stroom.waarde()
+        else:
+            stroom.neem("{")
+            while stroom.kijk() != "}":
+                datum = stroom.waarde()
+                stroom.neem(":")
+                stroom.neem("[")
+                while stroom.kijk() != "]":
+                    yield datum, dun_neo_uit(stroom.waarde())
+                    if stroom.kijk() != "]":
+                        stroom.neem(",")
+                stroom.neem("]")
+                if stroom.kijk() != "}":
+                    stroom.neem(",")
+            stroom.neem("}")
+        if stroom.neem(",", "}") == "}":
+            return
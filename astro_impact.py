@@ -1,68 +1,79 @@
 # ----------------------------------------- Import van modules en packages ------------------------------------------- #
-import json # json bestanden uit api-points of eigen files kunnen bekijken
-import requests # API-requests mogelijk maken
 import random # random module
-import math # voor de berekening in joules & magnitude
+import math # voor het aantal pagina's in de tabel
 import os
+import platform
+import sys
 
-from prettytable.colortable import ColorTable, Themes       # Prettytable met kleurthema's
+import numpy as np # voor de Monte Carlo uitkomsten
 from cprint import cprint                                   # Printen in kleurtjes
-from pyfiglet import Figlet                                 # Voor ASCII-art in het hoofdmenu
 from richter_schaal import richter_schaal_data              # Dictionary import uit eigen bestand
-
-# humanize
-import humanize
-from humanize import intword
-humanize.i18n.activate("nl_NL") # Activeer de Nederlandse taal
-
-# voor timestamps
-from datetime import datetime, timedelta
-import platform
-
-# ------------------------------------ Constanten voor simulatie berekening ------------------------------------------ #
-# De energie van de Chicxulub-inslag wordt geschat op ongeveer 5,0 x 10^23 joules
-CHICXULUB_ENERGY = 1e23
-# Wereldbevolking, int want er zijn geen mensen achter de komma, volgens de officiële statistieken dan....
-WORLD_POP = int(8.2e9)
-# Volgens bronnen zoals Our World in Data: Bewoonbaar landoppervlak ≈ 104 miljoen km²
-BEWOONBAAR_OPPERVLAK = 104_000_000
-# Totale oppervlakte aarde 510.1 miljoen km²
-TOTAAL_OPPERVLAKTE_AARDE = 510_100_000
-
-HIROSHIMA_JOULES = 6.3e13     # De (geschatte) energie van de Hiroshima bom
-MEGATON_TNT_JOULE = 4.184e15      # 1 megaton TNT
+from impact_berekening import (                             # Gevectoriseerde rekenkern (numpy)
+    bereken_energie,
+    WORLD_POP,
+)
+from resultaten_cache import impact_van_paar_gecachet      # Eerder berekende scenario's direct terug
+from landen_cache import haal_landen_op, get_landen_index   # Landen uit de cache (REST Countries API)
+from neo_cache import build_table, build_historie_table, laad_neo_data, extract_asteroide_data, ververs_cache
+from kolom_opslag import kolommen_naar_object
+from tabel_pager import Pager                               # Alleen de zichtbare pagina renderen
+from zoekindex import Zoekindex                             # Kiezen uit de historie op ID of naam
+
+# voor het filteren van de historie op datum
+from datetime import date
+
+# Let op: prettytable, pyfiglet en humanize worden pas geladen als de gebruikersinterface ze echt nodig heeft.
+# Zo kan deze module (en de rekenkern) snel en zonder terminal- of netwerktoegang geïmporteerd worden.
 
 # ------------------------------------------- UI-instellingen en opmaak ---------------------------------------------- #
-#Standaard instellingen van de tabel
-table = ColorTable()
-table.theme = Themes.DYSLEXIA_FRIENDLY
-table.align = "l"
-table.float_format = ".0"
-
-# Font figlet
-f = Figlet(font='standard')
-
-# ----------------------------------------------- API-configuratie --------------------------------------------------- #
-# dotenv activeren voor veilige API-KEY
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-api_key = os.getenv("API_KEY")
-
-# Startdatum instellen op 6 dagen geleden zodat de NASA-feed de volledige laatste 7 dagen meepakt.
-# Deze API-call is live best traag, maar dankzij de cache is de app alsnog snel.
-# NASA ondersteunt max. 7 dagen per call — daarom kies ik hier bewust voor het maximale bereik.
-start_date = (datetime.today() - timedelta(days=6)).strftime("%Y-%m-%d")
+# De tabel wordt pas aangemaakt bij het eerste gebruik, zie get_table()
+_table = None
+_humanize_actief = False
+# Met ASTRO_ONZEKERHEID=1 toont de simulatie ook de Monte Carlo-onzekerheidsmarge (zie toon_onzekerheid())
+TOON_ONZEKERHEID = os.getenv("ASTRO_ONZEKERHEID", "") not in ("", "0")
+# Met ASTRO_NADERING=dichtstbij, snelst of volgende rekent de simulatie met die nadering uit alle naderingen van de
+# lookup-API in plaats van de nadering uit de feed (zie neo_details.py)
+NADERING = os.getenv("ASTRO_NADERING", "feed")
+
+def get_table():
+    """
+    Geeft de (enige) ColorTable terug en maakt hem aan bij het eerste gebruik.
+    Standaard instellingen van de tabel: thema DYSLEXIA_FRIENDLY, links uitgelijnd en zonder decimalen.
+    """
+    global _table
+    if _table is None:
+        from prettytable.colortable import ColorTable, Themes   # Prettytable met kleurthema's
+        _table = ColorTable()
+        _table.theme = Themes.DYSLEXIA_FRIENDLY
+        _table.align = "l"
+        _table.float_format = ".0"
+    return _table
+
+def intword(getal):
+    """
+    Leesbare getallen via humanize (zoals 'miljoen' of 'miljard'), de Nederlandse taal wordt bij het eerste
+    gebruik geactiveerd.
+    """
+    global _humanize_actief
+    import humanize
+    if not _humanize_actief:
+        humanize.i18n.activate("nl_NL") # Activeer de Nederlandse taal
+        _humanize_actief = True
+    return humanize.intword(getal)
 
 # -------------------------------------------------- Hulpfuncties ---------------------------------------------------- #
 def toon_value_error():
     """Herbruikbare value error"""
     cprint("Je kunt hier alleen getallen invoeren.", c="rB")
 
-def toon_bestand_error():
-    """Herbruikbare file error"""
-    cprint(f"Er is iets mis met het bestand: De cache kon niet correct worden ingelezen.", c="rB")
+def vraag_datum(vraag):
+    """
+    Vraagt een datum (JJJJ-MM-DD), een lege invoer geeft None.
+
+    :raises ValueError: Bij een ongeldige datum.
+    """
+    invoer = input(vraag).strip()
+    return date.fromisoformat(invoer).isoformat() if invoer else None
 
 def clear_screen():
     """Maakt het scherm leeg, platform-onafhankelijk."""
@@ -71,108 +82,8 @@ def clear_screen():
     else:
         os.system("clear")
 
-# ----------------------------------------------------API-Calls------------------------------------------------------- #
-def toon_nabije_asteroid(api_key_nasa, start_datum):
-    """
-    Haalt near-earth object data op van de NASA API voor een opgegeven startdatum.
-    """
-    url = f"https://api.nasa.gov/neo/rest/v1/feed"
-    params = {
-        "start_date": start_datum,
-        "api_key": api_key_nasa
-    }
-    response = requests.get(url, params=params)
-
-    if response.ok:
-        data = response.json()
-        return data
-    else:
-        print("Er is iets misgegaan")
-        print("Statuscode:", response.status_code)
-        return None
-
-def haal_landen_op():
-    """Haalt gegevens op van alle landen via de REST Countries API.
-    Per land wordt de volgende info opgehaald:
-    - Landnaam
-    - Populatie
-    - Oppervlakte (in km²)"""
-    url = "https://restcountries.com/v3.1/all?fields=name,population,area"
-    response = requests.get(url)
-
-    if response.ok:
-        landen = response.json()
-        # direct met een list comprehension de data formatteren voor in de tabel
-        return [
-            [
-                land["name"]["common"],
-                land["population"],
-                land["area"],
-                # Dit zat niet in de API dus hier wordt de bevolkingsdichtheid berekend
-                round(land['population'] / land['area'],0)
-            ]
-            for land in landen]
-    else:
-        cprint("Fout bij ophalen landdata:", response.status_code, c="rB")
-        return []
-
 # -------------------------------------- Functies voor tabellen en dataweergave -------------------------------------- #
-def build_table():
-    """
-    Laadt de asteroïde-data uit de lokale cache.
-    Als de cache ontbreekt of verouderd is, wordt deze automatisch vernieuwd.
-    De functie returned een lijst met asteroïde informatie voor tabelweergave.
-    """
-    # lees de cache en stop de inhoud in een lijst
-    asteroidenlijst = read_cache()
-
-    # Als er geen cache beschikbaar wordt een loop uitgevoerd waar:
-    # -de data ververst wordt en opgeslagen
-    # -een nieuw bestand wordt aangemaakt als deze nog niet bestaat en beschreven uit de end-point van NASA
-    # -een nieuw pad wordt aangemaakt als deze niet nog bestaat
-    while not asteroidenlijst:
-        cprint("Je hebt nog geen cache, hij wordt beschreven", c="rB")
-        write_cache()
-        return build_table()
-    time_cache = asteroidenlijst["timestamp"]
-
-    # Hier moest de cache time eerst ge-parsed worden van string naar een datetime object,
-    # Anders deed mijn vergelijking voor de actualiteit van de cache niet
-    cache_time_parsen = datetime.strptime(time_cache, "%d%m%Y%H%M")
-    if datetime.now().date() != cache_time_parsen.date():
-        cprint("Je cache is ouder dan een dag, de cache wordt herladen", c="rB")
-        write_cache()
-    try:
-        data = []
-        for astro in asteroidenlijst["objecten"]:
-            diameter = astro["estimated_diameter"]["meters"]
-            min_d = diameter["estimated_diameter_min"]
-            max_d = diameter["estimated_diameter_max"]
-
-            approach = astro["close_approach_data"][0]
-            snelheid = float(approach["relative_velocity"]["kilometers_per_hour"])
-            afstand = float(approach["miss_distance"]["kilometers"])
-
-            data.append([
-                astro["id"],
-                astro["name"],
-                round(min_d,0),
-                round(max_d,0),
-                round(snelheid,0),
-                round(afstand,0),
-                "Ja" if astro["is_potentially_hazardous_asteroid"] else "Nee"
-            ])
-        return data
-    except KeyError:
-        cprint("Foutieve sleutel in de data. Probeer je cache te verversen.", c="rB")
-    except FileNotFoundError:
-        toon_bestand_error()
-    except TypeError:
-        cprint("Je had nog geen cache, de tabel wordt opnieuw opgebouwd.", c="y")
-
-    return build_table()
-
-def show_table(data, kolommen, titel="Tabel"):
+def show_table(data, kolommen, titel="Tabel", bron=None):
     """
     Laat een interactieve tabel zien waarin je zelf kiest hoeveel rijen per pagina je wilt zien.
 
@@ -182,12 +93,13 @@ def show_table(data, kolommen, titel="Tabel"):
     :param data: De rijen van de tabel (lijst van lijsten).
     :param kolommen: De kolomnamen bovenaan de tabel.
     :param titel: De titel van de tabel.
+    :param bron: (kolommen, zoekindex) waaruit [K]iezen een asteroïde haalt, standaard de NEO-cache.
     """
-    table.field_names = kolommen
+    table = get_table()
 
-    # Een FOR-loop gebruiken om alle data in rijen te zetten
-    for rij in data:
-        table.add_row(rij)
+    # De pager houdt alle rijen bij en zet per pagina alleen de zichtbare rijen in de tabel,
+    # zo blijft bladeren en sorteren snel, ook bij duizenden rijen
+    pager = Pager(data, kolommen)
 
     cprint(f"\n{titel}", c="bB")
     try:
@@ -231,7 +143,9 @@ def show_table(data, kolommen, titel="Tabel"):
             # ontdekte ik dat je voor gesorteerde en correcte output gebruik moet maken van de get_string()-methode.
             # Deze respecteert sortby, reversesort én ondersteunt slicing via start en end.
             # Zo kreeg ik de code uiteindelijk wel werkend!
-            print(table.get_string(start=start_index, end=start_index + page_size))
+            # Later bleek dat get_string() bij elke pagina de hele tabel opnieuw sorteert. Daarom sorteert de
+            # Pager (tabel_pager.py) elke kolom nu één keer en rendert alleen de rijen van deze pagina.
+            print(pager.render(table, start_index, start_index + page_size))
 
             cprint(f"Pagina {huidige_pagina} van {aantal_paginas}", c="g")
 
@@ -245,8 +159,8 @@ def show_table(data, kolommen, titel="Tabel"):
             elif actie == 't' and start_index >= page_size:
                 start_index -= page_size
             elif actie == 'k':
-                if titel == "Near-earth objects":
-                    sessie_data["asteroide"] = set_asteroide_in_sessie()
+                if titel in ("Near-earth objects", "Historie van naderingen"):
+                    sessie_data["asteroide"] = set_asteroide_in_sessie(bron)
                     return
                 elif titel == "Landen overzicht":
                     sessie_data["land"] = set_land_in_sessie()
@@ -261,19 +175,18 @@ def show_table(data, kolommen, titel="Tabel"):
                 try:
                     kolom_keuze = int(input("\nVoer het nummer van de kolom in: "))
                     kolom_naam = kolommen[kolom_keuze - 1]
-                    table.sortby = kolom_naam
                     # Uitzondering voor de kolom 'gevaarlijk' omdat dit iets logischer voelt voor het gebruik
                     if kolom_naam == 'Gevaarlijk?':
                         richting = input(
                             f"Sorteervolgorde '{kolom_naam}': [G]evaarlijk → Ongevaarlijk, "
                             f"[O]ngevaarlijk → Gevaarlijk\n> "
                         ).lower().strip()
-                        table.reversesort = richting == "o"
+                        pager.sorteer(kolom_naam, omgekeerd=richting == "o")
                     else:
                         richting = input(
                             f"Sorteervolgorde '{kolom_naam}': [O]plopend of [A]flopend?\n> "
                         ).lower().strip()
-                        table.reversesort = richting == "a"
+                        pager.sorteer(kolom_naam, omgekeerd=richting == "a")
 
                     start_index = 0
 
@@ -303,6 +216,40 @@ def show_astroids():
         titel="Near-earth objects"
     )
 
+def show_historie():
+    """
+    Toont de naderingen uit de historie (files/neo_historie.sqlite), ook die van weken of maanden terug.
+    Vooraf kies je een periode en of je alleen de potentieel gevaarlijke asteroïden wilt zien.
+    """
+    cprint("Laat een vraag leeg om daar niet op te filteren.", c="yI")
+    try:
+        van = vraag_datum("Vanaf welke naderingsdatum? (JJJJ-MM-DD): ")
+        tot = vraag_datum("Tot en met welke naderingsdatum? (JJJJ-MM-DD): ")
+    except ValueError:
+        cprint("Ongeldige datum, gebruik JJJJ-MM-DD (bijv. 2025-01-31).", c="rB")
+        return
+    gevaarlijk = input("Alleen potentieel gevaarlijke asteroïden? (j/n): ").lower().strip() == "j"
+
+    # De nieuwste naderingen eerst, het zoeken gebeurt in SQLite via de indexen (zie neo_historie.py)
+    kolommen, data = build_historie_table(van=van, tot=tot, gevaarlijk=True if gevaarlijk else None,
+                                          sorteer="datum", aflopend=True)
+    if not data:
+        cprint("Er staan geen naderingen in de historie die hierbij passen.", c="y")
+        return
+    show_table(
+        data=data,
+        kolommen=["ID",
+        "Naam",
+        "Min diameter (m)",
+        "Max diameter (m)",
+        "Snelheid (km/u)",
+        "Afstand (km)",
+        "Gevaarlijk?",
+        "Naderingsdatum"],
+        titel="Historie van naderingen",
+        bron=(kolommen, Zoekindex(kolommen["naam"], kolommen["id"].tolist()))
+    )
+
 def tabel_met_landen():
     """
     Toont een tabel met informatie uit de API de REST Countries API.
@@ -313,126 +260,60 @@ def tabel_met_landen():
         titel="Landen overzicht"
     )
 
-# ------------------------------------- Functies voor cachebeheer en data-opslag ------------------------------------- #
-def get_cache_path():
-    """
-    Geeft het volledige pad naar het cachebestand en zorgt dat de map bestaat
-    """
-    path = os.path.join("files", "nabije_asteroid.json")
-    os.makedirs("files", exist_ok=True)
-    return path
-
-def read_cache():
-    """
-    Leest de cache als die bestaat en geldig is, anders lege dict
-    """
-    path = get_cache_path()
-    try:
-        with open(path, 'r') as file:
-            return json.load(file)
-    except (json.JSONDecodeError, FileNotFoundError):
-        toon_bestand_error()
-        return {}
-
-def write_cache():
-    """
-    Haalt verse data op en schrijft die naar het cachebestand
-    """
-    objecten, tijd = refresh_data()
-    cache_data = {
-        "objecten": objecten,
-        "timestamp": tijd
-    }
-    path = get_cache_path()
-    time_stamp_parsen = datetime.strptime(tijd, "%d%m%Y%H%M")
-    with open(path, 'w') as file:
-        json.dump(cache_data, file, indent=4)
-    cprint(f"Cache is bijgewerkt op {time_stamp_parsen}", c="g")
-
-def refresh_data():
-    """
-    Haalt de nieuwste near-earth object data op uit de NASA API en koppelt daar een timestamp aan.
-    """
-    data = toon_nabije_asteroid(api_key, start_date)
-    neo_data = data["near_earth_objects"]
-    asteroidenlijst = [asteroid for datum, lijst in neo_data.items() for asteroid in lijst]
-    tijd = time_stamp()
-    return asteroidenlijst, tijd
-
-def time_stamp():
-    """
-    Geeft een datum-timestamp terug voor controle van cache geldigheid.
-    """
-    nu = datetime.now()
-    if platform.system() == "Windows":
-        return nu.strftime("%#d%#m%Y%H%M")
-    else:
-        # voor een ander platform
-        return nu.strftime("%d%m%Y%H%M")
-
 # ---------------------------------- Functies voor objectselectie door gebruiker ------------------------------------- #
-def set_asteroide_in_sessie():
-    """Vraag de gebruiker een asteroïde te selecteren op basis van ID.
-      Blijft vragen totdat een geldige ID is ingevoerd."""
-    # Cache-gegevens inlezen
-    asteroidenlijst = read_cache()["objecten"]
+def toon_suggesties(suggesties, namen):
+    """Toont de best passende namen uit de zoekindex als hulp bij een typfout"""
+    if suggesties:
+        cprint("Bedoelde je: " + ", ".join(namen[positie] for positie, _ in suggesties) + "?", c="y")
+
+def set_asteroide_in_sessie(bron=None):
+    """Vraag de gebruiker een asteroïde te selecteren op basis van ID of naam.
+      Blijft vragen totdat een geldige ID of naam is ingevoerd.
+      Met 'bron' (kolommen, zoekindex) wordt er gekozen uit bijv. de historie in plaats van de cache."""
+    # Cache-gegevens met zoekindex, die wordt maar één keer per data-load opgebouwd
+    kolommen, index = laad_neo_data() if bron is None else bron
     # Houd de gebruiker in een while loop totdat een geldig id gekozen is
     while True:
-        gekozen_id = input("Voer het ID van de asteroïde in: ").strip()
-        for asteroid in asteroidenlijst:
-            if asteroid["id"] == gekozen_id:
-                # _, is voor ongebruikte info, in dit geval snelheid_kms
-                naam, d_min, d_max, snelheid, _, gevaarlijk = extract_asteroide_data(asteroid)
-
-                cprint("Asteroïde geselecteerd:", c="yB")
-                cprint(f"  Naam: {naam}", c="y")
-                cprint(f"  ID: {gekozen_id}", c="y")
-                cprint(f"  Diameter: {d_min:.0f}–{d_max:.0f} meter", c="y")
-                cprint(f"  Snelheid: {int(snelheid):,} km/u", c="y")
-                cprint(f"  Gevaarlijk: {gevaarlijk}", c="y")
-                return asteroid
+        gekozen_id = input("Voer het ID (of de naam) van de asteroïde in: ").strip()
+        rij = index.zoek_exact(gekozen_id)
+        if rij is not None:
+            asteroid = kolommen_naar_object(kolommen, rij)
+            # _, is voor ongebruikte info, in dit geval snelheid_kms
+            naam, d_min, d_max, snelheid, _, gevaarlijk = extract_asteroide_data(asteroid)
+
+            cprint("Asteroïde geselecteerd:", c="yB")
+            cprint(f"  Naam: {naam}", c="y")
+            cprint(f"  ID: {asteroid['id']}", c="y")
+            cprint(f"  Diameter: {d_min:.0f}–{d_max:.0f} meter", c="y")
+            cprint(f"  Snelheid: {int(snelheid):,} km/u", c="y")
+            cprint(f"  Gevaarlijk: {gevaarlijk}", c="y")
+            return asteroid
         cprint("Geen asteroïde gevonden met dat ID. Probeer opnieuw.", c="r")
+        toon_suggesties(index.suggesties(gekozen_id), kolommen["naam"])
 
 def set_land_in_sessie():
     """
     Laat je een land kiezen op naam en toont informatie zodra het klopt.
-    Geeft pas iets terug als je een geldig land hebt ingevoerd.
+    Geeft pas iets terug als je een geldig land hebt ingevoerd, bij een typfout krijg je suggesties.
     """
-    landen = haal_landen_op()
+    landen, index = get_landen_index()
     # Een "disclaimer" erbij gezet omdat ik opmerkte dat bepaalde gegevens niet klopte, zoals over Nederland
     cprint("Let op: sommige landgegevens, zoals populatie, kunnen verouderd zijn (bron: REST Countries API).",
            c="yI")
     while True:
-        invoer = input("Voer de Engelse naam van het land in (bijv. Netherlands): ").strip().title()
-        for land in landen:
+        invoer = input("Voer de Engelse naam van het land in (bijv. Netherlands): ").strip()
+        positie = index.zoek_exact(invoer)
+        if positie is not None:
+            land = landen[positie]
             naam, populatie, oppervlakte, dichtheid = land
-            if naam == invoer:
-                cprint("Selectie land:", c="yB")
-                cprint(f"  Naam: {naam}", c="y")
-                cprint(f"  Populatie: {intword(populatie)} mensen", c="y")
-                cprint(f"  Oppervlakte: {int(oppervlakte):,} km²", c="y")
-                cprint(f"  Bevolkingsdichtheid: {int(dichtheid)} mensen/km²", c="y")
-                return land
+            cprint("Selectie land:", c="yB")
+            cprint(f"  Naam: {naam}", c="y")
+            cprint(f"  Populatie: {intword(populatie)} mensen", c="y")
+            cprint(f"  Oppervlakte: {int(oppervlakte):,} km²", c="y")
+            cprint(f"  Bevolkingsdichtheid: {int(dichtheid)} mensen/km²", c="y")
+            return land
         cprint(f"'{invoer}' staat niet in de lijst met landen. Probeer opnieuw.", c="r")
-
-def extract_asteroide_data(asteroid):
-    """
-    Haalt de belangrijkste gegevens uit een asteroïde-object,
-    dit heb ik gedaan omdat ik deze info eigenlijk oorspronkelijk 2 keer extraheerde dat vond ik niet heel DRY.
-    Ook loste deze functie deze warning op: Unexpected type(s):(strPossible type(s):(SupportsIndex(slice)
-    - naam
-    - min/max diameter
-    - snelheid (km/u)
-    - snelheid (km/s)
-    - gevaar-indicatie (Ja/Nee)
-    """
-    naam = asteroid["name"]
-    diameter_min = asteroid["estimated_diameter"]["meters"]["estimated_diameter_min"]
-    diameter_max = asteroid["estimated_diameter"]["meters"]["estimated_diameter_max"]
-    snelheid_kmu = float(asteroid["close_approach_data"][0]["relative_velocity"]["kilometers_per_hour"])
-    snelheid_kms = float(asteroid["close_approach_data"][0]["relative_velocity"]["kilometers_per_second"])
-    gevaarlijk = "Ja" if asteroid["is_potentially_hazardous_asteroid"] else "Nee"
-    return naam, diameter_min, diameter_max, snelheid_kmu, snelheid_kms, gevaarlijk
+        toon_suggesties(index.suggesties(invoer), [land[0] for land in landen])
 
 # -------------------------------------- Functies voor berekeningen en simulatie ------------------------------------- #
 def impactenergie_asteroide():
@@ -447,24 +328,9 @@ def impactenergie_asteroide():
     # _, is voor ongebruikte info, in dit geval naam, snelheid_kmu en gevaarlijk
     _, diameter_min, diameter_max, _, snelheid_kms, _ = extract_asteroide_data(astro)
 
-    # gemiddelde diameter in meters
-    diameter = (diameter_min + diameter_max) / 2
-    straal = diameter / 2
-
-    # volume van een bol berekenen in m³
-    volume = (4 / 3) * math.pi * (straal ** 3)
-
-    # Hier heb ik gewoon een aangenomen waarde gebruikt de hoogste dichtheid van steen = 3000 kg/m³
-    # omdat een asteroïde gesteente is, vond ik dat wel gepast. Maar het blijft natuurlijk een benadering
-    massa = volume * 3000
-
-    # snelheid omzetten naar m/s
-    snelheid_ms = snelheid_kms * 1000
-
-    # energie uitrekenen in joules
-    energie = 0.5 * massa * snelheid_ms ** 2
-
-    return energie
+    # De berekening zelf staat in impact_berekening.py, daar werkt hij op arrays voor alle asteroïden tegelijk.
+    # Hier gebruiken we gewoon één "rij" van die berekening.
+    return float(bereken_energie(diameter_min, diameter_max, snelheid_kms))
 
 def impact_simulatie():
     """
@@ -482,7 +348,7 @@ def impact_simulatie():
                 print()
             elif keuze_astro == "n":
                 # Reset tabel om conflicten bij herhaalde weergave te voorkomen
-                table.clear()
+                get_table().clear()
                 show_astroids()
                 impact_simulatie()
                 return
@@ -497,7 +363,7 @@ def impact_simulatie():
                 print()
             # 'n' afvangen om doorsijpelen naar page_size-input te voorkomen
             elif keuze_land == "n":
-                table.clear()
+                get_table().clear()
                 tabel_met_landen()
                 impact_simulatie()
                 return
@@ -506,13 +372,25 @@ def impact_simulatie():
 
     land = sessie_data["land"]
 
-    # Variables toewijzen in de lijst, land: [naam, populatie, oppervlakte_land, dichtheid]
-    naam, populatie, oppervlakte_land, dichtheid = land
+    if NADERING != "feed":
+        from neo_details import object_met_nadering
+        try:
+            sessie_data["asteroide"] = object_met_nadering(sessie_data["asteroide"], NADERING)
+        except ValueError as fout:
+            cprint(f"ASTRO_NADERING: {fout}. De nadering uit de feed wordt gebruikt.", c="rB")
+        else:
+            datum = sessie_data["asteroide"]["close_approach_data"][0]["close_approach_date"]
+            cprint(f"Gerekend met de nadering van {datum} ({NADERING}).", c="y")
 
-    # haal de berekende energie op uit de functie impactenergie_asteroide()
-    joules = impactenergie_asteroide()
-    megaton_tnt = joules / MEGATON_TNT_JOULE
-    aantal_bommen = joules / HIROSHIMA_JOULES
+    # Variables toewijzen in de lijst, land: [naam, populatie, oppervlakte_land, dichtheid]
+    naam, _, _, _ = land
+
+    # Alle getallen komen uit één rij van de batch-berekening in impact_berekening.py,
+    # deze functie zorgt alleen nog voor de weergave. Een scenario dat al eens berekend is komt uit de resultatencache.
+    impact = impact_van_paar_gecachet(sessie_data["asteroide"], land)
+    joules = impact["joules"]
+    megaton_tnt = impact["megaton_tnt"]
+    aantal_bommen = impact["hiroshima"]
     cprint("\nEnergie van de inslag", c="mB")
 
     # Uitpakken hieronder gedaan om een Unexpected type(s):(str)Possible type(s):(SupportsIndex)(slice) op te lossen
@@ -533,12 +411,30 @@ def impact_simulatie():
     # TNT
     cprint(f"- Komt overeen met circa {megaton_tnt:.2f} megaton TNT.", c="c")
 
+    # De tocht door de atmosfeer (zie atmosfeer.py): kleine objecten exploderen al hoog in de lucht.
+    # De vernietigde oppervlakte hieronder blijft op de totale energie gebaseerd, ook een airburst verwoest een
+    # groot gebied met zijn drukgolf (Toengoeska, 1908: ruim 2000 km² bos).
+    cprint("\nDoor de atmosfeer", c="mB")
+    uiteenvallen = impact["hoogte_uiteenvallen_km"]
+    if impact["airburst"]:
+        if uiteenvallen is not None:
+            cprint(f"- {naam_object} valt op {uiteenvallen:.1f} km hoogte uiteen door de luchtdruk.", c="c")
+        cprint(f"- Op {impact['hoogte_airburst_km']:.1f} km hoogte komt de energie in één keer vrij: een airburst, "
+               f"zoals bij Chelyabinsk in 2013. Er bereikt vrijwel niets de grond.", c="c")
+    else:
+        procent_grond = impact["joules_grond"] / joules * 100 if joules else 0
+        if uiteenvallen is not None:
+            cprint(f"- {naam_object} valt op {uiteenvallen:.1f} km hoogte uiteen, maar de brokstukken halen de grond.",
+                   c="c")
+        cprint(f"- De inslag gebeurt met {impact['snelheid_grond_kms']:.1f} km/s en {procent_grond:.0f}% van de "
+               f"energie ({intword(impact['joules_grond'])} joules).", c="c")
+
 
     # Chicxulub (de inslag die de dinosaurussen uitroeide, 66 miljoen jaar geleden)
     # We gebruiken een boolean flag om te bepalen of een asteroïde meer energie heeft dan dat event.
     # Tot nu toe heb ik 'helaas' er nog geen asteroïde in de dataset gevonden die dit niveau overschrijdt.
     extinction_event = False
-    ratio_dino_extinctie = joules / CHICXULUB_ENERGY
+    ratio_dino_extinctie = impact["ratio_chicxulub"]
     cprint("\nVergelijking met historische inslagen", c="mB")
     if ratio_dino_extinctie >= 1:
         cprint(f"- Dit object is {ratio_dino_extinctie:.2f}× krachtiger dan de Chicxulub-inslag "
@@ -562,7 +458,7 @@ def impact_simulatie():
     # Om de magnitude (op de schaal van Richter) van een aardbeving te berekenen op basis van de vrijgekomen energie
     # in joules, kun je een formule gebruiken die de energie (E) relateert aan de magnitude (M).
     # De formule is: E = 10^(4.8 + 1.5M). Je kunt deze formule herleiden om M te vinden: M = (log10(E) - 4.8) / 1.5.
-    magnitude = (math.log10(joules) - 4.8) / 1.5
+    magnitude = impact["magnitude"]
 
     # Aardbeving vergelijkingen als het geen extinction event is
     if not extinction_event:
@@ -579,18 +475,13 @@ def impact_simulatie():
         # Door de bom was er ongeveer 13 km² vernietigd in Hiroshima (stad),
         # inslag modellen van de nasa waren nogal complex ook miste ik de benodigde data.
         # Daarom heb ik er voor gekozen om gewoon van de vernietigingsradius van de Hiroshima bom uit te gaan.
-        vernietigde_oppervlakte = (joules / HIROSHIMA_JOULES) * 13
-
-        if vernietigde_oppervlakte > oppervlakte_land:
-            # Extra oppervlak berekenen wat ook buiten het gekozen land vernietigd wordt
-            extra_oppervlak = vernietigde_oppervlakte - oppervlakte_land
-
-            # De extra slachtoffers worden berekend door de gemiddelde bevolkingsdichtheid van de wereld te nemen.
-            # We nemen aan dat dat extra oppervlak vergelijkbaar bevolkt is als het gemiddelde van de bewoonbare aarde.
-            # Dit is niet ideaal voor het model, maar het geeft een grove indicatie
-            extra_slachtoffers = (extra_oppervlak / BEWOONBAAR_OPPERVLAK) * WORLD_POP
-            slachtoffers = populatie + extra_slachtoffers
-            percentage = (vernietigde_oppervlakte / TOTAAL_OPPERVLAKTE_AARDE) * 100
+        vernietigde_oppervlakte = impact["vernietigde_oppervlakte"]
+        slachtoffers = impact["slachtoffers"]
+
+        if impact["land_vernietigd"]:
+            # De extra slachtoffers buiten het land worden berekend met de gemiddelde bevolkingsdichtheid van de
+            # bewoonbare aarde. Dit is niet ideaal voor het model, maar het geeft een grove indicatie
+            percentage = impact["percentage_aarde"]
             cprint(f"- Het volledige land {naam} zou worden vernietigd!", c="rB")
             cprint(f"- Totale vernietigde oppervlakte: {intword(vernietigde_oppervlakte)} km²", c="y")
             # Om output te voorkomen zoals "Dat is 0.00% van het aardoppervlak" bij zeer kleine inslagen.
@@ -605,21 +496,74 @@ def impact_simulatie():
                 cprint(f"- Verwachte slachtoffers: praktisch de hele wereldbevolking ({intword(WORLD_POP)} "
                        f"mensen)", c="rB")
         else:
-            procent_land = (vernietigde_oppervlakte / oppervlakte_land) * 100
-            slachtoffers = (procent_land / 100) * populatie
+            procent_land = impact["procent_land"]
             cprint(f"- Ongeveer {procent_land:.2f}% van {naam} zou worden vernietigd.", c="y")
             cprint(f"- Totale vernietigde oppervlakte: {intword(vernietigde_oppervlakte)} km²", c="y")
             cprint(f"- Verwachte slachtoffers: {intword(slachtoffers)} mensen", c="y")
 
+    # De berekening hierboven gaat uit van de gemiddelde diameter en een vaste dichtheid,
+    # met een Monte Carlo simulatie kan de gebruiker ook zien hoe groot de onzekerheid daarin is.
+    if TOON_ONZEKERHEID:
+        toon_onzekerheid(sessie_data["asteroide"], land)
+
+    # Staat er een bevolkingsraster in files/, dan kan de gebruiker ook een inslagpunt kiezen
+    if not extinction_event:
+        toon_raster_slachtoffers(joules)
+
     # Reset sessie data zodat de gebruiker nog een keer een willekeurige impact kan simuleren
     sessie_data["asteroide"] = []
     sessie_data["land"] = []
 
+def toon_onzekerheid(asteroid, land):
+    """
+    Toont P5/P50/P95 van energie, magnitude en slachtoffers op basis van een Monte Carlo simulatie
+    met onzekere diameter, dichtheid en snelheid (zie onzekerheid.py).
+    """
+    from onzekerheid import monte_carlo_impact, AANTAL_TREKKINGEN
+
+    # Vaste seed zodat dezelfde asteroïde en hetzelfde land altijd dezelfde marge geven
+    try:
+        uitkomst = monte_carlo_impact([asteroid], [land], seed=int(asteroid["id"]))
+    except ValueError as fout:
+        cprint(f"\nGeen onzekerheidsmarge: {fout}", c="rB")
+        return
+    p5, p50, p95 = uitkomst["joules"][0]
+    m5, m50, m95 = uitkomst["magnitude"][0]
+    s5, s50, s95 = np.minimum(uitkomst["slachtoffers"][0, 0], WORLD_POP)
+
+    cprint(f"\nOnzekerheidsmarge ({AANTAL_TREKKINGEN:,} trekkingen, P5 – P50 – P95)", c="mB")
+    cprint(f"- Energie: {intword(p5)} – {intword(p50)} – {intword(p95)} joules", c="c")
+    cprint(f"- Magnitude: {m5:.2f} – {m50:.2f} – {m95:.2f}", c="c")
+    cprint(f"- Slachtoffers: {intword(s5)} – {intword(s50)} – {intword(s95)} mensen", c="c")
+
+def toon_raster_slachtoffers(joules):
+    """
+    Telt met het (optionele) bevolkingsraster hoeveel mensen er echt binnen de vernietigde oppervlakte rond een
+    inslagpunt wonen, in plaats van de gemiddelde dichtheid van het land (zie bevolkingsraster.py).
+    """
+    from bevolkingsraster import laad_bevolkingsraster
+
+    raster = laad_bevolkingsraster()
+    if raster is None:
+        return
+    invoer = input("\nInslagpunt voor het bevolkingsraster als 'breedte, lengte' (Enter om over te slaan): ").strip()
+    if not invoer:
+        return
+    try:
+        breedte, lengte = (float(deel) for deel in invoer.split(","))
+    except ValueError:
+        cprint("Geef het inslagpunt als twee getallen, bijvoorbeeld: 52.37, 4.90", c="rB")
+        return
+    slachtoffers = float(raster.slachtoffers(joules, breedte, lengte))
+    cprint(f"- Verwachte slachtoffers rond ({breedte:.2f}, {lengte:.2f}) volgens het bevolkingsraster: "
+           f"{intword(slachtoffers)} mensen", c="y")
+
 # ---------------------------------------- Functies voor willekeurige selectie --------------------------------------- #
 def random_asteroide():
     """Deze functie haalt een willekeurige asteroïde op en zet hem vast in de sessie data """
-    asteroiden = read_cache()["objecten"]
-    sessie_data["asteroide"] = random.choice(asteroiden)
+    # Alleen de gekozen rij wordt uit de kolommen omgezet naar een object
+    kolommen, _ = laad_neo_data()
+    sessie_data["asteroide"] = kolommen_naar_object(kolommen, random.randrange(len(kolommen["records"])))
 
     # Uitpakken hieronder om een Unexpected type(s):(str)Possible type(s):(SupportsIndex)(slice) warning op te lossen
     naam_object, _, _, _, _, _ = extract_asteroide_data(sessie_data['asteroide'])
@@ -634,6 +578,8 @@ def random_land():
 # ------------------------------------ Functie voor gebruikersinstellingen (thema) ----------------------------------- #
 def choice_of_theme():
     """Loop door de directory met thema's voor de package prettytable en vraag de gebruiker 1 te selecteren"""
+    from prettytable.colortable import Themes
+    table = get_table()
     thema = {}
     for nummer, theme in enumerate(dir(Themes), start=1):
         # Om zaken uit te sluiten die geen thema's zijn
@@ -656,52 +602,73 @@ sessie_data = {
     "land": []
 }
 
-# Bij opstart build_table() uitvoeren om er voor te zorgen dat cache-geldigheid check wordt uitgevoerd.
-build_table()
-
-# Boolean flag om te zien of dit de eerste keer is dat de gebruiker het programma opstart
-eerste_keer = True
-
 # -------------------------------------------- Hoofdmenu en programmaloop -------------------------------------------- #
-while True:
-    # Toon een pauze zodat de gebruiker de informatie kan lezen voordat het scherm wordt gewist
-    if not eerste_keer:
-        input("\nDruk op Enter om terug te keren naar het hoofdmenu...")
-    else:
-        eerste_keer = False
-    clear_screen()
-    print(f.renderText("ASTRO-impact"))
-    cprint("Welkom bij ASTRO-impact — Simuleer de impact van een asteroïde!", c="bB")
+def main():
+    """
+    Startpunt van de applicatie: controleert de cache en start het hoofdmenu.
+    Dit gebeurt alleen als je het script zelf uitvoert, niet bij een import.
+    """
+    from pyfiglet import Figlet                                 # Voor ASCII-art in het hoofdmenu
 
-    print("\nWat wil je doen?")
-    cprint("1. Bekijk de lijst met asteroïden", c="c")
-    cprint("2. Bekijk de lijst met landen", c="c")
-    cprint("3. Simuleer een inslag", c="c")
-    cprint("4. Kies een ander tabel thema", c="c")
-    cprint("5. Sluit het programma", c="c")
+    # Font figlet
+    f = Figlet(font='standard')
 
-    # Ik gebruik hier de functie table.clear() van pretty-tables zodat ik de tabel kan hergebruiken
-    table.clear()
+    # Bij opstart de cache-geldigheid controleren. Staat er al data in de cache, dan start het menu meteen
+    # en worden de ontbrekende dagen op de achtergrond opgehaald.
+    ververs_cache()
 
-    try:
-        keuze = int(input("\nMaak een keuze (1–5): "))
-        print()
-
-        if keuze == 1:
-            show_astroids()
-        elif keuze == 2:
-            tabel_met_landen()
-        elif keuze == 3:
-            impact_simulatie()
-        elif keuze == 4:
-            choice_of_theme()
-        elif keuze == 5:
-            cprint("Bedankt voor het gebruiken van ASTRO-impact! Tot de volgende keer.", c="g")
-            break
+    # Boolean flag om te zien of dit de eerste keer is dat de gebruiker het programma opstart
+    eerste_keer = True
+
+    while True:
+        # Toon een pauze zodat de gebruiker de informatie kan lezen voordat het scherm wordt gewist
+        if not eerste_keer:
+            input("\nDruk op Enter om terug te keren naar het hoofdmenu...")
         else:
-            cprint("Ongeldige keuze. Kies een getal tussen 1 en 5.", c="rB")
+            eerste_keer = False
+        clear_screen()
+        print(f.renderText("ASTRO-impact"))
+        cprint("Welkom bij ASTRO-impact — Simuleer de impact van een asteroïde!", c="bB")
+
+        print("\nWat wil je doen?")
+        cprint("1. Bekijk de lijst met asteroïden", c="c")
+        cprint("2. Bekijk de lijst met landen", c="c")
+        cprint("3. Simuleer een inslag", c="c")
+        cprint("4. Kies een ander tabel thema", c="c")
+        cprint("5. Bekijk eerdere naderingen (historie)", c="c")
+        cprint("6. Sluit het programma", c="c")
+
+        # Ik gebruik hier de functie table.clear() van pretty-tables zodat ik de tabel kan hergebruiken
+        get_table().clear()
+
+        try:
+            keuze = int(input("\nMaak een keuze (1–6): "))
+            print()
+
+            if keuze == 1:
+                show_astroids()
+            elif keuze == 2:
+                tabel_met_landen()
+            elif keuze == 3:
+                impact_simulatie()
+            elif keuze == 4:
+                choice_of_theme()
+            elif keuze == 5:
+                show_historie()
+            elif keuze == 6:
+                cprint("Bedankt voor het gebruiken van ASTRO-impact! Tot de volgende keer.", c="g")
+                break
+            else:
+                cprint("Ongeldige keuze. Kies een getal tussen 1 en 6.", c="rB")
 
-    except ValueError:
+        except ValueError:
+
+            toon_value_error()
 
-        toon_value_error()
 
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Met argumenten draait de app zonder vragen, bijv. voor geplande taken (zie batch_cli.py)
+        from batch_cli import main as batch_main
+        sys.exit(batch_main(sys.argv[1:]))
+    main()
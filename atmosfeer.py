@@ -0,0 +1,178 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import numpy as np # Alle objecten tegelijk door de atmosfeer
+
+from impact_berekening import DICHTHEID_STEEN
+
+# De gewone berekening neemt aan dat een asteroïde met al zijn bewegingsenergie de grond raakt. De meeste objecten in
+# de cache zijn maar tientallen meters groot en exploderen al hoog in de lucht (een airburst, zoals bij Chelyabinsk
+# in 2013 en Toengoeska in 1908). Dit model volgt elk object door de atmosfeer:
+# - luchtweerstand en zwaartekracht:  dv/dt = -C_D·ρ_lucht·A·v² / (2m) + g·sin(hoek)
+# - ablatie (verdampen):               dm/dt = -C_H·ρ_lucht·A·v³ / (2Q)
+# - uiteenvallen zodra de stuwdruk ρ_lucht·v² groter is dan de sterkte van het gesteente, daarna spreidt de
+#   wolk brokstukken uit als een pannenkoek (Chyba et al. 1993):  d²r/dt² = C_D·ρ_lucht·v² / (2·ρ_object·r)
+# - is de wolk PANNENKOEK_FACTOR keer zo breed als het object, dan komt de rest van de energie in één keer vrij:
+#   dat is de hoogte van de airburst (Collins et al. 2005, Earth Impact Effects Program).
+#
+# Alle objecten worden tegelijk doorgerekend als arrays, elk met een eigen tijdstap (midpuntmethode): hoog in de ijle
+# lucht gaat het in grote stappen, rond het uiteenvallen in kleine. Een object dat klaar is (grond, airburst) valt
+# uit de arrays, zodat de laatste stappen alleen nog voor de grootste objecten gerekend worden.
+# Net als in de rest van de app is de snelheid van NASA de intredesnelheid en is de dichtheid DICHTHEID_STEEN.
+
+# ---------------------------------------------------- Constanten ---------------------------------------------------- #
+LUCHTDICHTHEID_ZEENIVEAU = 1.225    # kg/m³
+SCHAALHOOGTE_M = 8000               # De luchtdichtheid neemt per 8 km met een factor e af
+BEGIN_HOOGTE_M = 100_000            # Daarboven is de lucht te ijl om verschil te maken
+ZWAARTEKRACHT = 9.81                # m/s²
+# 45° is de meest waarschijnlijke invalshoek
+INTREDEHOEK_GRADEN = 45
+WEERSTANDSCOEFFICIENT = 2.0
+# Welk deel van de luchtwrijving het object opwarmt, en hoeveel energie het kost om een kg gesteente te verdampen
+WARMTEOVERDRACHT = 0.1
+ABLATIEWARMTE = 8e6                 # J/kg
+PANNENKOEK_FACTOR = 7
+# Is er minder dan dit deel van de massa over, dan is het object opgebrand (dat telt ook als airburst)
+MIN_MASSA_FRACTIE = 1e-6
+
+# Tijdstap per object: v, m en de breedte van de wolk veranderen per stap hooguit 2%, en de hoogte hooguit 1 km.
+# Het uiteenvallen en de airburst worden tussen twee stappen in gelegd, daardoor mogen de stappen vrij groot zijn.
+MAX_RELATIEVE_VERANDERING = 0.02
+MAX_HOOGTE_STAP_M = 1000
+MAX_STAPPEN = 100_000
+
+# -------------------------------------------------- Hulpfuncties ---------------------------------------------------- #
+def sterkte_gesteente(dichtheid):
+    """
+    Sterkte (Pa) waarboven het object uiteenvalt, uit de dichtheid (Collins et al. 2005): Y = 10^(2.107 + 0.0624·√ρ).
+    Voor steen van 3000 kg/m³ is dat ongeveer 0,3 MPa.
+    """
+    return 10 ** (2.107 + 0.0624 * np.sqrt(dichtheid))
+
+def luchtdichtheid(hoogte_m):
+    """Exponentiële atmosfeer: ρ = ρ_0·e^(-h/H)."""
+    return LUCHTDICHTHEID_ZEENIVEAU * np.exp(-hoogte_m / SCHAALHOOGTE_M)
+
+def afgeleiden(v, m, h, r, vr, dichtheid, sin_hoek, gebroken):
+    """De tijdsafgeleiden van snelheid, massa, hoogte, straal en spreidsnelheid van de wolk."""
+    lucht = luchtdichtheid(h)
+    oppervlak = np.pi * r ** 2
+    dv = -WEERSTANDSCOEFFICIENT * lucht * oppervlak * v ** 2 / (2 * m) + ZWAARTEKRACHT * sin_hoek
+    dm = -WARMTEOVERDRACHT * lucht * oppervlak * v ** 3 / (2 * ABLATIEWARMTE)
+    dh = -v * sin_hoek
+    dvr = np.where(gebroken, WEERSTANDSCOEFFICIENT * lucht * v ** 2 / (2 * dichtheid * r), 0.0)
+    return dv, dm, dh, vr, dvr
+
+def tijdstap(v, m, r, vr, dv, dm, dh, dvr):
+    """De grootste tijdstap per object waarbij v, m en r hooguit MAX_RELATIEVE_VERANDERING veranderen."""
+    klein = 1e-30
+    dt = np.minimum(MAX_RELATIEVE_VERANDERING * v / (np.abs(dv) + klein),
+                    MAX_RELATIEVE_VERANDERING * m / (np.abs(dm) + klein))
+    dt = np.minimum(dt, MAX_HOOGTE_STAP_M / (np.abs(dh) + klein))
+    # De wolk begint stil te spreiden: de versnelling bepaalt dan de stap, daarna de spreidsnelheid
+    dt = np.minimum(dt, MAX_RELATIEVE_VERANDERING * r / (vr + klein))
+    return np.minimum(dt, np.sqrt(2 * MAX_RELATIEVE_VERANDERING * r / (dvr + klein)))
+
+def tussen(hoogte_oud, hoogte, waarde_oud, waarde):
+    """De hoogte waar 'waarde' (lineair tussen twee stappen) door nul gaat."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deel = np.clip(waarde_oud / (waarde_oud - waarde), 0.0, 1.0)
+    return hoogte_oud + np.nan_to_num(deel, nan=1.0) * (hoogte - hoogte_oud)
+
+# ---------------------------------------------------- Intrede ------------------------------------------------------- #
+def bereken_intrede(diameter_m, snelheid_kms, dichtheid=DICHTHEID_STEEN, hoek_graden=INTREDEHOEK_GRADEN):
+    """
+    Volgt alle objecten tegelijk door de atmosfeer (zie bovenaan).
+
+    :param diameter_m: Diameter per object in meters (array).
+    :param snelheid_kms: Intredesnelheid per object in km/s (array).
+    :param dichtheid: Dichtheid in kg/m³, één waarde of per object.
+    :param hoek_graden: Invalshoek ten opzichte van de horizon, één waarde of per object.
+    :return: Dict met per object (1D arrays):
+             - joules_intrede: de bewegingsenergie bij binnenkomst (gelijk aan bereken_energie()),
+             - joules_grond: de bewegingsenergie die de grond bereikt (0 bij een airburst),
+             - joules_lucht: de energie die in de atmosfeer vrijkomt,
+             - snelheid_grond_kms: de snelheid bij de grond (0 bij een airburst),
+             - hoogte_uiteenvallen_km: waar het object uiteenvalt (NaN als het heel blijft),
+             - hoogte_airburst_km: waar de energie vrijkomt (NaN als het de grond raakt),
+             - airburst: True als het object de grond niet haalt.
+    """
+    diameter = np.atleast_1d(np.asarray(diameter_m, dtype=np.float64))
+    aantal = len(diameter)
+    snelheid = np.broadcast_to(np.asarray(snelheid_kms, dtype=np.float64) * 1000, (aantal,))
+    dichtheid = np.broadcast_to(np.asarray(dichtheid, dtype=np.float64), (aantal,))
+    sin_hoek = np.broadcast_to(np.sin(np.radians(np.asarray(hoek_graden, dtype=np.float64))), (aantal,))
+
+    straal_begin = diameter / 2
+    massa_begin = (4 / 3) * np.pi * straal_begin ** 3 * dichtheid
+    sterkte = sterkte_gesteente(dichtheid)
+
+    hoogte_uiteenvallen = np.full(aantal, np.nan)
+    hoogte_airburst = np.full(aantal, np.nan)
+    snelheid_grond = np.zeros(aantal)
+    massa_grond = np.zeros(aantal)
+
+    # Toestand van de objecten die nog vallen; 'index' is hun plek in de uitkomsten
+    index = np.flatnonzero(massa_begin > 0)
+    v = snelheid[index].copy()
+    m = massa_begin[index].copy()
+    h = np.full(len(index), float(BEGIN_HOOGTE_M))
+    r = straal_begin[index].copy()
+    vr = np.zeros(len(index))
+    gebroken = np.zeros(len(index), dtype=bool)
+    constant = {"dichtheid": dichtheid[index], "sin_hoek": sin_hoek[index], "sterkte": sterkte[index],
+                "straal_begin": straal_begin[index], "massa_begin": massa_begin[index]}
+
+    for _ in range(MAX_STAPPEN):
+        if not len(index):
+            break
+        # Midpuntmethode met per object een eigen tijdstap
+        k1 = afgeleiden(v, m, h, r, vr, constant["dichtheid"], constant["sin_hoek"], gebroken)
+        dt = tijdstap(v, m, r, vr, k1[0], k1[1], k1[2], k1[4])
+        half = [waarde + dt / 2 * afgeleide for waarde, afgeleide in zip((v, m, h, r, vr), k1)]
+        half[1] = np.maximum(half[1], 0.0)
+        k2 = afgeleiden(*half, constant["dichtheid"], constant["sin_hoek"], gebroken)
+        v_oud, m_oud, h_oud, r_oud = v, m, h, r
+        v, m, h, r, vr = (waarde + dt * afgeleide for waarde, afgeleide in zip((v, m, h, r, vr), k2))
+        m = np.maximum(m, 0.0)
+
+        # Uiteenvallen zodra de stuwdruk de sterkte overschrijdt, de hoogte lineair tussen de twee stappen in
+        overdruk = luchtdichtheid(h) * v ** 2 - constant["sterkte"]
+        breekt = ~gebroken & (overdruk > 0)
+        if breekt.any():
+            overdruk_oud = luchtdichtheid(h_oud[breekt]) * v_oud[breekt] ** 2 - constant["sterkte"][breekt]
+            hoogte = tussen(h_oud[breekt], h[breekt], overdruk_oud, overdruk[breekt])
+            hoogte_uiteenvallen[index[breekt]] = np.maximum(hoogte, 0.0)
+            gebroken = gebroken | breekt
+
+        grond = h <= 0
+        uitgespreid = r >= PANNENKOEK_FACTOR * constant["straal_begin"]
+        airburst = ~grond & (uitgespreid | (m <= MIN_MASSA_FRACTIE * constant["massa_begin"]))
+        klaar = grond | airburst
+        if not klaar.any():
+            continue
+        if grond.any():
+            # Terugrekenen naar precies h = 0
+            deel = h_oud[grond] / (h_oud[grond] - h[grond])
+            snelheid_grond[index[grond]] = v_oud[grond] + deel * (v[grond] - v_oud[grond])
+            massa_grond[index[grond]] = m_oud[grond] + deel * (m[grond] - m_oud[grond])
+        grens = PANNENKOEK_FACTOR * constant["straal_begin"]
+        hoogte = np.where(uitgespreid, tussen(h_oud, h, r_oud - grens, r - grens), h)
+        hoogte_airburst[index[airburst]] = hoogte[airburst]
+
+        doorgaan = ~klaar
+        index = index[doorgaan]
+        v, m, h, r, vr, gebroken = v[doorgaan], m[doorgaan], h[doorgaan], r[doorgaan], vr[doorgaan], gebroken[doorgaan]
+        constant = {naam: waarde[doorgaan] for naam, waarde in constant.items()}
+    else:
+        raise RuntimeError(f"Intrede van {len(index)} object(en) niet binnen {MAX_STAPPEN} stappen afgerond")
+
+    joules_intrede = 0.5 * massa_begin * snelheid ** 2
+    joules_grond = 0.5 * massa_grond * snelheid_grond ** 2
+    return {
+        "joules_intrede": joules_intrede,
+        "joules_grond": joules_grond,
+        "joules_lucht": joules_intrede - joules_grond,
+        "snelheid_grond_kms": snelheid_grond / 1000,
+        "hoogte_uiteenvallen_km": hoogte_uiteenvallen / 1000,
+        "hoogte_airburst_km": hoogte_airburst / 1000,
+        "airburst": ~np.isnan(hoogte_airburst),
+    }
@@ -0,0 +1,426 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import argparse # subcommando's en opties voor gebruik zonder vragen
+import contextlib
+import csv
+import json
+import math
+import os
+import sys
+
+import numpy as np # voor de reeksen van de sweep
+
+from impact_berekening import bereken_impact_batch, landen_naar_arrays
+from landen_cache import get_landen_index
+from neo_cache import dagen_te_verversen, export_cache, laad_neo_data, start_verversing, vul_historie_aan
+from dreiging_ranking import get_ranking, MATEN
+from neo_details import kolommen_met_nadering, NADERINGEN
+from neo_historie import get_historie, SORTEERBAAR
+from zoekindex import Zoekindex
+
+# Batch-modus: dezelfde berekeningen als het menu, maar zonder input() zodat het in geplande taken kan draaien.
+# Voorbeelden:
+#   python astro_impact.py simuleer --asteroiden all --landen all --formaat jsonl > impact.jsonl
+#   python astro_impact.py simulate --asteroids 2000433,3542519 --countries Netherlands,Belgium --format csv
+#   python astro_impact.py asteroiden --formaat csv -o asteroiden.csv
+#   python astro_impact.py server --poort 8080        (HTTP-service voor dashboards, zie webservice.py)
+#   python astro_impact.py sweep --dichtheid 1500:8000:500 --snelheid-factor 0.8:1.2:0.1 --formaat csv
+#   python astro_impact.py top --maat joules --land Netherlands --aantal 10
+#   python astro_impact.py historie --van 2025-01-01 --gevaarlijk --max-afstand 5000000 --sorteer afstand_km
+#   python astro_impact.py export -o nabije_asteroid.json      (de cache als één JSON-bestand)
+# Elk resultaat wordt direct weggeschreven zodra het berekend is. Er wordt per blok van ASTEROIDEN_PER_BLOK
+# asteroïden gerekend, zodat het geheugengebruik gelijk blijft hoe groot de uitvoer ook wordt.
+ASTEROIDEN_PER_BLOK = 256
+# Commando's die de NEO-kolommen uit de cache nodig hebben; 'landen' en 'historie' werken ook zonder
+NEO_COMMANDOS = ("simuleer", "simulate", "sweep", "asteroiden", "asteroids", "top")
+
+# --------------------------------------------------- Data laden ----------------------------------------------------- #
+def laad_data(verversen=True, met_neo=True):
+    """
+    Laadt de NEO-kolommen en landen uit de cache, en vult de cache eerst aan als dat nodig is.
+    Meldingen van de cache en de API gaan naar stderr, zodat stdout alleen de uitvoer bevat.
+    Met met_neo=False wordt de NEO-cache overgeslagen (kolommen en neo_index zijn dan None).
+
+    :return: (kolommen, neo_index, landen, landen_index)
+    """
+    kolommen = neo_index = None
+    with contextlib.redirect_stdout(sys.stderr):
+        if met_neo:
+            if verversen and dagen_te_verversen():
+                start_verversing(stil=False).join()
+            kolommen, neo_index = laad_neo_data()
+        landen, landen_index = get_landen_index()
+    return kolommen, neo_index, landen, landen_index
+
+def historie_kolommen(args):
+    """
+    Zoekt de naderingen die bij de historie-filters uit de commandoregel passen (zie neo_historie.py).
+
+    :return: (kolommen, zoekindex) met één rij per nadering.
+    """
+    with contextlib.redirect_stdout(sys.stderr):
+        vul_historie_aan()
+    kolommen = get_historie().zoek(
+        van=args.van, tot=args.tot, gevaarlijk=True if args.gevaarlijk else None,
+        max_afstand_km=args.max_afstand, min_diameter=args.min_diameter, max_diameter=args.max_diameter,
+        sorteer=getattr(args, "sorteer", "datum"), aflopend=getattr(args, "aflopend", False),
+        limiet=getattr(args, "limiet", None),
+    )
+    return kolommen, Zoekindex(kolommen["naam"], kolommen["id"].tolist())
+
+def gebruikt_historie(args):
+    """True als er op de commandoregel een historie-filter is opgegeven."""
+    return any(getattr(args, optie, None) for optie in (
+        "van", "tot", "gevaarlijk", "max_afstand", "min_diameter", "max_diameter"))
+
+def met_nadering(kolommen, rijen, nadering):
+    """
+    Kolommen voor de gekozen rijen met de gekozen nadering uit alle naderingen van de lookup-API (zie
+    neo_details.py). Met "feed" blijven de kolommen zoals ze zijn.
+
+    :return: (kolommen, rijen)
+    """
+    if nadering == "feed":
+        return kolommen, rijen
+    with contextlib.redirect_stdout(sys.stderr):
+        kolommen = kolommen_met_nadering(kolommen, rijen, nadering)
+    return kolommen, list(range(len(rijen)))
+
+def selecteer(keuze, index, aantal, soort):
+    """
+    Zet "all" of een komma-gescheiden lijst met ID's of namen om naar posities.
+
+    :raises ValueError: Als een ID of naam niet gevonden wordt.
+    """
+    if keuze.strip().lower() in ("all", "alle"):
+        return list(range(aantal))
+    posities = []
+    for invoer in keuze.split(","):
+        positie = index.zoek_exact(invoer)
+        if positie is None:
+            raise ValueError(f"Onbekende {soort}: '{invoer.strip()}'")
+        posities.append(positie)
+    return posities
+
+# -------------------------------------------------- Records maken --------------------------------------------------- #
+def asteroide_records(kolommen, rijen):
+    """Eén record per asteroïde, met dezelfde kolommen als de tabel in het menu."""
+    for rij in rijen:
+        yield {
+            "id": str(kolommen["id"][rij]),
+            "naam": kolommen["naam"][rij],
+            "diameter_min_m": float(kolommen["diameter_min"][rij]),
+            "diameter_max_m": float(kolommen["diameter_max"][rij]),
+            "snelheid_kmu": float(kolommen["snelheid_kmu"][rij]),
+            "afstand_km": float(kolommen["afstand_km"][rij]),
+            "gevaarlijk": bool(kolommen["gevaarlijk"][rij]),
+        }
+
+def historie_records(kolommen):
+    """Eén record per nadering uit de historie: de asteroïde-kolommen plus de datum van de nadering."""
+    for rij, record in enumerate(asteroide_records(kolommen, range(len(kolommen["id"])))):
+        record["datum"] = str(kolommen["datum"][rij])
+        yield record
+
+def top_records(rijen):
+    """Eén record per plek in een ranglijst (zie dreiging_ranking.py), met de rang vooraan."""
+    for rang, rij in enumerate(rijen, start=1):
+        yield {"rang": rang, **rij}
+
+def land_records(landen, posities):
+    """Eén record per land."""
+    for positie in posities:
+        naam, populatie, oppervlakte, dichtheid = landen[positie]
+        yield {"naam": naam, "populatie": populatie, "oppervlakte_km2": oppervlakte, "dichtheid": dichtheid}
+
+def simulatie_records(kolommen, landen, rijen, posities, blok=ASTEROIDEN_PER_BLOK):
+    """
+    Eén record per combinatie van asteroïde en land, met dezelfde uitkomsten als de simulatie in het menu
+    (inclusief de tocht door de atmosfeer, zie atmosfeer.py).
+    Per blok asteroïden wordt de gevectoriseerde berekening gedaan voor alle gekozen landen tegelijk,
+    daarna worden de records één voor één doorgegeven.
+    """
+    land_arrays = landen_naar_arrays([landen[positie] for positie in posities])
+    for start in range(0, len(rijen), blok):
+        blok_rijen = rijen[start:start + blok]
+        resultaat = bereken_impact_batch({
+            "id": [str(kolommen["id"][rij]) for rij in blok_rijen],
+            "naam": [kolommen["naam"][rij] for rij in blok_rijen],
+            "diameter_min": kolommen["diameter_min"][blok_rijen],
+            "diameter_max": kolommen["diameter_max"][blok_rijen],
+            "snelheid_kms": kolommen["snelheid_kms"][blok_rijen],
+        }, land_arrays, atmosfeer=True)
+
+        # Eén keer per blok omzetten naar Python-getallen, dat is veel sneller dan per waarde
+        per_asteroide = {sleutel: resultaat[sleutel].tolist() for sleutel in (
+            "joules", "megaton_tnt", "hiroshima", "ratio_chicxulub", "magnitude",
+            "vernietigde_oppervlakte", "percentage_aarde", "joules_grond", "airburst")}
+        # Geen airburst (het object raakt de grond) heeft geen hoogte
+        per_asteroide["hoogte_airburst_km"] = [None if math.isnan(hoogte) else hoogte
+                                               for hoogte in resultaat["hoogte_airburst_km"].tolist()]
+        per_paar = {sleutel: resultaat[sleutel].tolist() for sleutel in (
+            "procent_land", "slachtoffers", "land_vernietigd")}
+
+        for i, (neo_id, naam) in enumerate(zip(resultaat["asteroide_id"], resultaat["asteroide_naam"])):
+            for j, land in enumerate(resultaat["land_naam"]):
+                yield {
+                    "asteroide_id": neo_id,
+                    "asteroide_naam": naam,
+                    "land": land,
+                    "joules": per_asteroide["joules"][i],
+                    "megaton_tnt": per_asteroide["megaton_tnt"][i],
+                    "hiroshima": per_asteroide["hiroshima"][i],
+                    "ratio_chicxulub": per_asteroide["ratio_chicxulub"][i],
+                    "magnitude": per_asteroide["magnitude"][i],
+                    "vernietigde_oppervlakte_km2": per_asteroide["vernietigde_oppervlakte"][i],
+                    "percentage_aarde": per_asteroide["percentage_aarde"][i],
+                    "procent_land": per_paar["procent_land"][i][j],
+                    "slachtoffers": per_paar["slachtoffers"][i][j],
+                    "land_vernietigd": per_paar["land_vernietigd"][i][j],
+                    "airburst": per_asteroide["airburst"][i],
+                    "hoogte_airburst_km": per_asteroide["hoogte_airburst_km"][i],
+                    "joules_grond": per_asteroide["joules_grond"][i],
+                }
+
+def sweep_records(resultaat):
+    """Eén record per parametercombinatie uit parameter_sweep.sweep(), ontbrekende waarden (NaN) worden None."""
+    for rij in resultaat.tolist():
+        yield {veld: None if waarde != waarde else waarde for veld, waarde in zip(resultaat.dtype.names, rij)}
+
+def parse_waarden(tekst):
+    """
+    Leest een lijst getallen: "1500,3000,8000" of een reeks "start:stop:stap" (inclusief stop).
+    """
+    if ":" in tekst:
+        start, stop, stap = (float(deel) for deel in tekst.split(":"))
+        return [round(waarde, 10) for waarde in np.arange(start, stop + stap / 2, stap).tolist()]
+    return [float(deel) for deel in tekst.split(",")]
+
+def parse_inslagpunt(tekst):
+    """Leest een inslagpunt "breedte,lengte"."""
+    breedte, lengte = (float(deel) for deel in tekst.split(","))
+    return breedte, lengte
+
+# ---------------------------------------------------- Uitvoer ------------------------------------------------------- #
+def schrijf_jsonl(records, uitvoer):
+    """
+    Schrijft elk record als één regel JSON. Oneindig en NaN (bijv. de magnitude bij 0 joule) bestaan niet in JSON,
+    die worden null.
+    """
+    aantal = 0
+    for record in records:
+        try:
+            regel = json.dumps(record, ensure_ascii=False, allow_nan=False)
+        except ValueError:
+            regel = json.dumps({sleutel: None if isinstance(waarde, float) and not math.isfinite(waarde) else waarde
+                                for sleutel, waarde in record.items()}, ensure_ascii=False)
+        uitvoer.write(regel + "\n")
+        aantal += 1
+    return aantal
+
+def schrijf_csv(records, uitvoer):
+    """Schrijft de records als CSV, de kolomnamen komen uit het eerste record."""
+    schrijver = None
+    aantal = 0
+    for record in records:
+        if schrijver is None:
+            schrijver = csv.DictWriter(uitvoer, fieldnames=list(record))
+            schrijver.writeheader()
+        schrijver.writerow(record)
+        aantal += 1
+    return aantal
+
+SCHRIJVERS = {"jsonl": schrijf_jsonl, "csv": schrijf_csv}
+
+def schrijf(records, formaat, pad=None):
+    """
+    Schrijft de records naar een bestand, of naar stdout als er geen pad is.
+
+    :return: Het aantal geschreven records.
+    """
+    if pad is None:
+        return SCHRIJVERS[formaat](records, sys.stdout)
+    with open(pad, 'w', encoding="utf-8", newline="") as uitvoer:
+        return SCHRIJVERS[formaat](records, uitvoer)
+
+# -------------------------------------------------- Commandoregel --------------------------------------------------- #
+def maak_parser():
+    parser = argparse.ArgumentParser(
+        prog="astro_impact.py",
+        description="ASTRO-impact zonder menu: exporteer de data of simuleer inslagen als CSV of JSONL.",
+    )
+    subparsers = parser.add_subparsers(dest="commando", required=True)
+
+    def gemeenschappelijk(subparser):
+        subparser.add_argument("--formaat", "--format", choices=sorted(SCHRIJVERS), default="jsonl",
+                               help="uitvoerformaat (standaard jsonl)")
+        subparser.add_argument("-o", "--uitvoer", "--output", default=None,
+                               help="bestand om naar te schrijven (standaard stdout)")
+        subparser.add_argument("--geen-verversing", "--no-refresh", action="store_true",
+                               help="alleen de bestaande cache gebruiken, niets bij NASA ophalen")
+
+    def nadering_optie(subparser):
+        subparser.add_argument("--nadering", "--approach", choices=("feed",) + NADERINGEN, default="feed",
+                               help="welke nadering per asteroïde: die uit de feed (standaard), of uit alle "
+                                    "naderingen van de lookup-API de dichtstbijzijnde, snelste of volgende")
+
+    def historie_filters(subparser):
+        subparser.add_argument("--van", "--from", default=None, help="eerste naderingsdatum (JJJJ-MM-DD)")
+        subparser.add_argument("--tot", "--to", default=None, help="laatste naderingsdatum (JJJJ-MM-DD)")
+        subparser.add_argument("--gevaarlijk", "--hazardous", action="store_true",
+                               help="alleen potentieel gevaarlijke objecten")
+        subparser.add_argument("--max-afstand", "--max-distance", type=float, default=None,
+                               help="maximale afstand bij de nadering in km")
+        subparser.add_argument("--min-diameter", type=float, default=None, help="minimale gemiddelde diameter in m")
+        subparser.add_argument("--max-diameter", type=float, default=None, help="maximale gemiddelde diameter in m")
+
+    simuleer = subparsers.add_parser("simuleer", aliases=["simulate"],
+                                     help="impact van elke gekozen asteroïde op elk gekozen land")
+    simuleer.add_argument("--asteroiden", "--asteroids", default="all",
+                          help="'all' of komma-gescheiden ID's/namen (standaard all)")
+    simuleer.add_argument("--landen", "--countries", default="all",
+                          help="'all' of komma-gescheiden Engelse landnamen (standaard all)")
+    nadering_optie(simuleer)
+    # Met een historie-filter worden de asteroïden uit de historie gekozen in plaats van uit de laatste dagen
+    historie_filters(simuleer)
+    gemeenschappelijk(simuleer)
+
+    gemeenschappelijk(subparsers.add_parser("asteroiden", aliases=["asteroids"], help="alle asteroïden in de cache"))
+    gemeenschappelijk(subparsers.add_parser("landen", aliases=["countries"], help="alle landen"))
+
+    top = subparsers.add_parser("top", help="de gevaarlijkste asteroïden in de cache (zie dreiging_ranking.py)")
+    top.add_argument("--maat", "--by", choices=sorted(MATEN), default="joules",
+                     help="rangschikken op energie, diameter of afstand (standaard joules)")
+    top.add_argument("--aantal", "-k", type=int, default=10, help="aantal asteroïden (standaard 10)")
+    top.add_argument("--gevaarlijk", "--hazardous", action="store_true", help="alleen potentieel gevaarlijke objecten")
+    top.add_argument("--land", "--country", default=None,
+                     help="meeste slachtoffers in dit land (Engelse naam), rangschikt op energie")
+    gemeenschappelijk(top)
+
+    historie = subparsers.add_parser("historie", aliases=["history"],
+                                     help="alle naderingen die ooit zijn opgehaald (zie neo_historie.py)")
+    historie_filters(historie)
+    historie.add_argument("--sorteer", "--sort", choices=SORTEERBAAR, default="datum",
+                          help="sorteren op deze kolom (standaard datum)")
+    historie.add_argument("--aflopend", "--descending", action="store_true", help="van groot naar klein sorteren")
+    historie.add_argument("--limiet", "--limit", type=int, default=None, help="hooguit zoveel naderingen")
+    gemeenschappelijk(historie)
+
+    sweep = subparsers.add_parser("sweep", help="'wat als'-berekening over een raster van parameters")
+    sweep.add_argument("--asteroiden", "--asteroids", default="all",
+                       help="'all' of komma-gescheiden ID's/namen (standaard all)")
+    sweep.add_argument("--landen", "--countries", default="all",
+                       help="'all' of komma-gescheiden Engelse landnamen (standaard all)")
+    sweep.add_argument("--dichtheid", "--density", type=parse_waarden, default=[3000.0],
+                       help="dichtheden in kg/m³, bijv. 1500,3000 of 1500:8000:500 (standaard 3000)")
+    sweep.add_argument("--snelheid-factor", "--velocity-scale", type=parse_waarden, default=[1.0],
+                       help="factoren op de NASA-snelheid, bijv. 0.8:1.2:0.1 (standaard 1)")
+    sweep.add_argument("--diameter-percentiel", "--diameter-percentile", type=parse_waarden, default=[50.0],
+                       help="0 = minimale, 100 = maximale NASA-diameter (standaard 50)")
+    sweep.add_argument("--inslagpunt", "--impact-site", type=parse_inslagpunt, action="append", default=None,
+                       help="'breedte,lengte' voor het bevolkingsraster, mag vaker (standaard het landenmodel)")
+    sweep.add_argument("--processen", "--processes", type=int, default=None,
+                       help="aantal processen (standaard het aantal cores)")
+    nadering_optie(sweep)
+    gemeenschappelijk(sweep)
+
+    export = subparsers.add_parser("export", help="de NEO-cache als één JSON-bestand ({\"objecten\": [...]})")
+    export.add_argument("-o", "--uitvoer", "--output", default=os.path.join("files", "nabije_asteroid.json"),
+                        help="bestand om naar te schrijven (standaard files/nabije_asteroid.json)")
+    export.add_argument("--van", "--from", default=None, help="eerste dag (JJJJ-MM-DD, standaard 6 dagen geleden)")
+    export.add_argument("--tot", "--to", default=None, help="laatste dag (JJJJ-MM-DD, standaard vandaag)")
+    export.add_argument("--geen-verversing", "--no-refresh", action="store_true",
+                        help="alleen de bestaande cache gebruiken, niets bij NASA ophalen")
+
+    server = subparsers.add_parser("server", aliases=["serve"], help="lokale HTTP-service (zie webservice.py)")
+    server.add_argument("--host", default="127.0.0.1", help="adres om op te luisteren (standaard 127.0.0.1)")
+    server.add_argument("--poort", "--port", type=int, default=8080, help="poort (standaard 8080)")
+    server.add_argument("--threads", type=int, default=4, help="threads voor blokkerend werk (standaard 4)")
+    return parser
+
+def main(argv=None):
+    """
+    Startpunt van de batch-modus.
+
+    :return: Exitcode (0 = gelukt).
+    """
+    args = maak_parser().parse_args(argv)
+    if args.commando in ("server", "serve"):
+        from webservice import draai
+        draai(args.host, args.poort, args.threads)
+        return 0
+    if args.commando == "export":
+        return exporteer(args)
+
+    kolommen, neo_index, landen, landen_index = laad_data(verversen=not args.geen_verversing,
+                                                          met_neo=args.commando not in ("landen", "countries"))
+    historie = args.commando in ("historie", "history") or (
+        args.commando in ("simuleer", "simulate") and gebruikt_historie(args))
+    if kolommen is None and args.commando in NEO_COMMANDOS and not historie:
+        print("Er staan geen asteroïden in de cache en ze konden niet worden opgehaald.", file=sys.stderr)
+        return 1
+
+    try:
+        if args.commando in ("simuleer", "simulate"):
+            if historie:
+                kolommen, neo_index = historie_kolommen(args)
+            rijen = selecteer(args.asteroiden, neo_index, len(kolommen["id"]), "asteroïde")
+            posities = selecteer(args.landen, landen_index, len(landen), "land")
+            kolommen, rijen = met_nadering(kolommen, rijen, args.nadering)
+            records = simulatie_records(kolommen, landen, rijen, posities)
+        elif args.commando == "sweep":
+            from parameter_sweep import sweep
+            rijen = selecteer(args.asteroiden, neo_index, len(kolommen["id"]), "asteroïde")
+            posities = selecteer(args.landen, landen_index, len(landen), "land")
+            kolommen, rijen = met_nadering(kolommen, rijen, args.nadering)
+            asteroiden = {veld: kolommen[veld][rijen] for veld in ("diameter_min", "diameter_max", "snelheid_kms")}
+            records = sweep_records(sweep(asteroiden, [landen[positie] for positie in posities],
+                                          args.dichtheid, args.snelheid_factor, args.diameter_percentiel,
+                                          args.inslagpunt or [None], args.processen))
+        elif args.commando in ("asteroiden", "asteroids"):
+            records = asteroide_records(kolommen, range(len(kolommen["id"])))
+        elif args.commando == "top":
+            ranking = get_ranking()
+            if args.land is not None:
+                positie = landen_index.zoek_exact(args.land)
+                if positie is None:
+                    raise ValueError(f"Onbekend land: '{args.land.strip()}'")
+                rijen = ranking.top_voor_land(landen[positie], args.aantal, args.gevaarlijk)
+            else:
+                rijen = ranking.top(args.aantal, args.maat, args.gevaarlijk)
+            records = top_records(rijen)
+        elif args.commando in ("historie", "history"):
+            records = historie_records(historie_kolommen(args)[0])
+        else:
+            records = land_records(landen, range(len(landen)))
+        aantal = schrijf(records, args.formaat, args.uitvoer)
+    except ValueError as fout:
+        print(fout, file=sys.stderr)
+        return 2
+    except BrokenPipeError:
+        # De lezer (bijv. 'head') is gestopt, dat is geen fout. Stdout naar devnull zodat ook het
+        # afsluiten van Python niet meer probeert te schrijven.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+
+    if args.uitvoer:
+        print(f"{aantal} records geschreven naar {args.uitvoer}", file=sys.stderr)
+    return 0
+
+def exporteer(args):
+    """Het commando 'export': vult de cache zo nodig aan en schrijft hem als JSON (zie neo_cache.export_cache())."""
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            if not args.geen_verversing and dagen_te_verversen(args.van, args.tot):
+                start_verversing(args.van, args.tot, stil=False).join()
+        aantal = export_cache(args.uitvoer, args.van, args.tot)
+    except ValueError as fout:
+        print(fout, file=sys.stderr)
+        return 2
+    if aantal is None:
+        print("Er staan geen asteroïden in de cache en ze konden niet worden opgehaald.", file=sys.stderr)
+        return 1
+    print(f"{aantal} asteroïden geëxporteerd naar {args.uitvoer}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
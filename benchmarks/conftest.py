@@ -0,0 +1,108 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import pytest
+
+from benchmarks.standin_server import StandinServer
+
+# ------------------------------------------------- Instellingen ---------------------------------------------------- #
+# Welke feed-groottes (totaal aantal NEO's over 7 dagen) gemeten worden. Standaard tot 10k, met bijvoorbeeld
+# BENCH_NEO_AANTALLEN=100,1000,10000,100000 ook de grote variant.
+NEO_AANTALLEN = [int(aantal) for aantal in os.getenv("BENCH_NEO_AANTALLEN", "100,1000,10000").split(",")]
+AANTAL_LANDEN = 250
+HERHALINGEN = int(os.getenv("BENCH_HERHALINGEN", 5))
+RESULTATEN_MAP = os.path.join(os.path.dirname(__file__), "resultaten")
+
+_resultaten = []
+
+# --------------------------------------------------- Fixtures ------------------------------------------------------- #
+@pytest.fixture(params=NEO_AANTALLEN, ids=lambda aantal: f"{aantal}neo", scope="module")
+def standin(request):
+    """
+    Start een lokale stand-in voor NASA en REST Countries met het opgegeven aantal NEO's (verdeeld over 7 dagen).
+    """
+    server = StandinServer(neo_per_dag=max(1, request.param // 7), aantal_landen=AANTAL_LANDEN).start()
+    server.aantal_neo = request.param
+    yield server
+    server.stop()
+
+@pytest.fixture
+def offline(standin, tmp_path, monkeypatch):
+    """
+    Laat de app praten met de stand-in server in plaats van de echte API's, met een lege 'files/' map.
+    """
+    import api_client
+    import landen_cache
+    import resultaten_cache
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("API_KEY", "DEMO_KEY")
+    monkeypatch.setattr(api_client, "NASA_FEED_URL", f"{standin.url}/neo/rest/v1/feed")
+    monkeypatch.setattr(api_client, "NASA_LOOKUP_URL", f"{standin.url}/neo/rest/v1/neo")
+    monkeypatch.setattr(api_client, "REST_COUNTRIES_URL", f"{standin.url}/v3.1/all")
+    landen_cache._landen_geheugen.clear()
+    yield standin
+    landen_cache._landen_geheugen.clear()
+    # De gedeelde resultatencache hoort bij deze 'files/' map, de volgende test opent een nieuwe
+    cache = resultaten_cache._cache.pop("cache", None)
+    if cache is not None:
+        cache.sluit()
+
+@pytest.fixture
+def meet(request):
+    """
+    Meet een functie een aantal keer en bewaart min/mediaan/gemiddelde voor het resultatenbestand.
+
+    Gebruik: resultaat = meet(functie, *args, herhalingen=5, voorbereiding=None)
+    'voorbereiding' wordt vóór elke meting aangeroepen en telt niet mee.
+    """
+    def _meet(functie, *args, herhalingen=HERHALINGEN, voorbereiding=None, **kwargs):
+        tijden = []
+        resultaat = None
+        for _ in range(herhalingen):
+            if voorbereiding is not None:
+                voorbereiding()
+            start = time.perf_counter()
+            resultaat = functie(*args, **kwargs)
+            tijden.append(time.perf_counter() - start)
+        _resultaten.append({
+            "naam": request.node.name,
+            "herhalingen": herhalingen,
+            "min_s": min(tijden),
+            "mediaan_s": statistics.median(tijden),
+            "gemiddeld_s": statistics.fmean(tijden),
+        })
+        return resultaat
+    return _meet
+
+# ------------------------------------------------ Resultaten opslaan ------------------------------------------------ #
+def huidige_commit():
+    """Korte hash van de huidige git-commit, zodat resultaten per commit vergeleken kunnen worden."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "onbekend"
+
+def pytest_sessionfinish(session, exitstatus):
+    """Schrijft alle metingen naar benchmarks/resultaten/<commit>.json."""
+    if not _resultaten:
+        return
+    os.makedirs(RESULTATEN_MAP, exist_ok=True)
+    commit = huidige_commit()
+    pad = os.path.join(RESULTATEN_MAP, f"{commit}.json")
+    with open(pad, "w") as file:
+        json.dump({
+            "commit": commit,
+            "datum": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "machine": platform.platform(),
+            "resultaten": _resultaten,
+        }, file, indent=4)
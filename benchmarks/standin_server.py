@@ -0,0 +1,111 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import json
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from synthetische_data import maak_feed, maak_landen, maak_neo_details
+
+# Deze module bootst de NASA NeoWs-feed en de REST Countries API lokaal na, met synthetische data van een
+# instelbare grootte (zie synthetische_data.py). Zo draaien de benchmarks zonder netwerk en zonder API-quota.
+
+# ---------------------------------------------------- HTTP-server --------------------------------------------------- #
+class StandinServer:
+    """
+    Lokale HTTP-server die /neo/rest/v1/feed, /neo/rest/v1/neo/<id> en /v3.1/all beantwoordt.
+    Antwoorden worden per verzoek gecachet zodat het genereren niet in de metingen terechtkomt.
+    Net als NASA stuurt de feed X-RateLimit-headers mee. Met 'storingen' beantwoordt de feed de eerstvolgende
+    zoveel verzoeken met een 503, om het herhalen te testen. Met 'vertraging_s' duurt elk feed-antwoord langer.
+    """
+    def __init__(self, neo_per_dag=100, aantal_landen=250, ratelimit=1000):
+        self.neo_per_dag = neo_per_dag
+        self.aantal_landen = aantal_landen
+        self.ratelimit = ratelimit
+        self.storingen = 0
+        self.vertraging_s = 0
+        self.aantal_verzoeken = 0
+        self.feed_verzoeken = 0
+        self.lookup_verzoeken = 0
+        self._antwoorden = {}
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._maak_handler())
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, poort = self.httpd.server_address
+        return f"http://{host}:{poort}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def antwoord(self, sleutel, maak):
+        """Geeft de JSON-bytes voor een verzoek, en maakt ze de eerste keer aan."""
+        with self._lock:
+            if sleutel not in self._antwoorden:
+                self._antwoorden[sleutel] = json.dumps(maak()).encode("utf-8")
+            return self._antwoorden[sleutel]
+
+    def _maak_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.aantal_verzoeken += 1
+                url = urlparse(self.path)
+                params = {sleutel: waarden[0] for sleutel, waarden in parse_qs(url.query).items()}
+                if url.path == "/neo/rest/v1/feed":
+                    with server._lock:
+                        server.feed_verzoeken += 1
+                        storing = server.storingen > 0
+                        server.storingen -= storing
+                    if storing:
+                        self.send_error(503)
+                        return
+                    time.sleep(server.vertraging_s)
+                    start = params["start_date"]
+                    eind = params.get("end_date") or (date.fromisoformat(start) + timedelta(days=6)).isoformat()
+                    sleutel = ("feed", start, eind, server.neo_per_dag)
+                    body = server.antwoord(sleutel, lambda: maak_feed(start, eind, server.neo_per_dag))
+                elif url.path.startswith("/neo/rest/v1/neo/"):
+                    with server._lock:
+                        server.lookup_verzoeken += 1
+                    time.sleep(server.vertraging_s)
+                    neo_id = url.path.rsplit("/", 1)[1]
+                    if not neo_id.isdigit():
+                        self.send_error(404)
+                        return
+                    body = server.antwoord(("neo", neo_id), lambda: maak_neo_details(int(neo_id)))
+                elif url.path == "/v3.1/all":
+                    sleutel = ("landen", server.aantal_landen)
+                    if self.headers.get("If-None-Match") == '"landen"':
+                        self.send_response(304)
+                        self.end_headers()
+                        return
+                    body = server.antwoord(sleutel, lambda: maak_landen(server.aantal_landen))
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if url.path == "/v3.1/all":
+                    self.send_header("ETag", '"landen"')
+                else:
+                    self.send_header("X-RateLimit-Limit", str(server.ratelimit))
+                    verbruikt = server.feed_verzoeken + server.lookup_verzoeken
+                    self.send_header("X-RateLimit-Remaining", str(max(0, server.ratelimit - verbruikt)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
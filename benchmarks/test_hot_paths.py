@@ -0,0 +1,250 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import io
+import json
+import os
+import shutil
+
+import numpy as np
+
+import api_client
+import atmosfeer
+import kolom_opslag
+import astro_impact
+import batch_cli
+import bevolkingsraster
+import dreiging_ranking
+import impact_berekening
+import instrumentatie
+import landen_cache
+import neo_cache
+import neo_details
+import neo_historie
+import parameter_sweep
+import resultaten_cache
+import synthetische_data
+
+# Benchmarks van de hot paths, tegen de lokale stand-in server (zie conftest.py). De correctheidstests staan per
+# onderdeel in tests/.
+# Draaien met: python -m pytest benchmarks -q
+# Resultaten komen in benchmarks/resultaten/<commit>.json, vergelijken met: python -m benchmarks.vergelijk A B
+
+# --------------------------------------------------- Hulpfuncties --------------------------------------------------- #
+def leeg_neo_cache():
+    """Verwijdert de NEO-cache zodat write_cache() alles opnieuw moet ophalen."""
+    shutil.rmtree(neo_cache.CACHE_MAP, ignore_errors=True)
+
+def vul_neo_cache():
+    leeg_neo_cache()
+    neo_cache.write_cache()
+
+# ----------------------------------------------------- Cache ------------------------------------------------------- #
+def test_write_cache(offline, meet):
+    meet(neo_cache.write_cache, voorbereiding=leeg_neo_cache)
+
+def test_read_cache(offline, meet):
+    vul_neo_cache()
+    meet(neo_cache.read_cache)
+
+def test_read_kolommen(offline, meet):
+    vul_neo_cache()
+    meet(neo_cache.read_kolommen)
+
+def test_build_table(offline, meet):
+    vul_neo_cache()
+    meet(neo_cache.build_table)
+
+def test_historie_zoeken(offline, meet):
+    vul_neo_cache()
+    kolommen, _ = neo_cache.read_kolommen()
+    grens = float(np.median(kolommen["afstand_km"]))
+    meet(neo_historie.get_historie().zoek, gevaarlijk=True, max_afstand_km=grens, sorteer="afstand_km", herhalingen=20)
+
+# --------------------------------------------------- Berekeningen --------------------------------------------------- #
+def test_extract_asteroide_data(offline, meet):
+    vul_neo_cache()
+    objecten = neo_cache.read_cache()["objecten"]
+    meet(lambda: [neo_cache.extract_asteroide_data(asteroid) for asteroid in objecten])
+
+def test_impactenergie_asteroide(offline, meet):
+    vul_neo_cache()
+    objecten = neo_cache.read_cache()["objecten"]
+
+    def alle_energieen():
+        energieen = []
+        for asteroid in objecten:
+            astro_impact.sessie_data["asteroide"] = asteroid
+            energieen.append(astro_impact.impactenergie_asteroide())
+        return energieen
+
+    meet(alle_energieen)
+
+def test_impact_batch_alle_paren(offline, meet):
+    vul_neo_cache()
+    kolommen, _ = neo_cache.read_kolommen()
+    landen = landen_cache.haal_landen_op()
+    meet(impact_berekening.bereken_impact_batch, kolommen, landen)
+
+def test_impact_van_paar(offline, meet):
+    vul_neo_cache()
+    asteroid = neo_cache.read_cache()["objecten"][0]
+    land = landen_cache.haal_landen_op()[0]
+    meet(impact_berekening.impact_van_paar, asteroid, land, herhalingen=50)
+
+def test_atmosferische_intrede(offline, meet):
+    """De hele cache in één keer door de atmosfeer (ijkpunten: tests/test_atmosfeer.py)."""
+    vul_neo_cache()
+    kolommen, _ = neo_cache.read_kolommen()
+    diameter = (kolommen["diameter_min"] + kolommen["diameter_max"]) / 2
+    meet(atmosfeer.bereken_intrede, diameter, kolommen["snelheid_kms"])
+
+def test_resultaten_cache(offline, meet):
+    vul_neo_cache()
+    asteroid = neo_cache.read_cache()["objecten"][0]
+    land = landen_cache.haal_landen_op()[0]
+    cache = resultaten_cache.Resultatencache()
+    cache.haal_op(asteroid, land)
+    meet(cache.haal_op, asteroid, land, herhalingen=50)
+    cache.sluit()
+
+def test_dreiging_top_k(offline, meet):
+    vul_neo_cache()
+    meet(dreiging_ranking.get_ranking().top, 10, "joules", herhalingen=200)
+
+def test_dreiging_top_k_voor_land(offline, meet):
+    vul_neo_cache()
+    land = landen_cache.haal_landen_op()[0]
+    meet(dreiging_ranking.get_ranking().top_voor_land, land, 10, herhalingen=200)
+
+def test_batch_simulatie_jsonl(offline, meet):
+    vul_neo_cache()
+    kolommen, _ = neo_cache.laad_neo_data()
+    landen = landen_cache.haal_landen_op()
+    rijen = list(range(min(100, len(kolommen["id"]))))
+
+    def stream():
+        records = batch_cli.simulatie_records(kolommen, landen, rijen, range(len(landen)))
+        return batch_cli.schrijf_jsonl(records, io.StringIO())
+
+    meet(stream, herhalingen=3)
+
+# ------------------------------------------------------ Landen ------------------------------------------------------ #
+def test_parse_landen(offline, meet):
+    meet(api_client.parse_landen, api_client.download_landen().json())
+
+def test_haal_landen_op_zonder_cache(offline, meet):
+    def leeg_landen_cache():
+        landen_cache._landen_geheugen.clear()
+        shutil.rmtree("files", ignore_errors=True)
+    meet(landen_cache.haal_landen_op, voorbereiding=leeg_landen_cache)
+
+def test_haal_landen_op_uit_geheugen(offline, meet):
+    landen_cache.haal_landen_op()
+    meet(landen_cache.haal_landen_op, herhalingen=50)
+
+# -------------------------------------------------- Instrumentatie -------------------------------------------------- #
+def test_instrumentatie_uit(offline, meet, monkeypatch):
+    """Uitgeschakeld mag een meetpunt vrijwel niets kosten."""
+    monkeypatch.setattr(instrumentatie, "_actief", False)
+    instrumentatie.reset()
+    vul_neo_cache()
+    meet(neo_cache.read_kolommen, herhalingen=50)
+
+def test_instrumentatie_aan(offline, meet, monkeypatch):
+    monkeypatch.setattr(instrumentatie, "_actief", True)
+    instrumentatie.reset()
+    vul_neo_cache()
+    meet(neo_cache.read_kolommen, herhalingen=50)
+    instrumentatie.reset()
+
+# --------------------------------------------------- NASA-client ---------------------------------------------------- #
+def test_feed_streamen(meet):
+    """De feed incrementeel lezen (de geheugenpiek: tests/test_api_client.py)."""
+    body = json.dumps(synthetische_data.maak_feed("2024-01-01", "2024-01-07", 2000)).encode("utf-8")
+
+    def streamen():
+        bouwer = kolom_opslag.KolommenBouwer()
+        chunks = (body[i:i + api_client.FEED_CHUNK_BYTES] for i in range(0, len(body), api_client.FEED_CHUNK_BYTES))
+        for _, neo in api_client.lees_feed(chunks):
+            bouwer.voeg_toe(neo)
+        return bouwer.kolommen()
+
+    meet(streamen, herhalingen=1)
+
+def test_neo_details_laden(offline, meet, monkeypatch):
+    """Details van (hooguit) 100 objecten: eerst tegelijk van de server (0,05 s per verzoek), daarna uit de cache."""
+    monkeypatch.setattr(offline, "vertraging_s", 0.05)
+
+    def leeg_details():
+        neo_details._geheugen.clear()
+        shutil.rmtree(neo_details.DETAILS_MAP, ignore_errors=True)
+
+    monkeypatch.setattr(neo_details, "_geheugen", {})
+    vul_neo_cache()
+    kolommen, _ = neo_cache.read_kolommen()
+    ids = [str(neo_id) for neo_id in kolommen["id"][:100]]
+    meet(neo_details.laad_details, ids, herhalingen=3, voorbereiding=leeg_details)
+    meet(neo_details.laad_details, ids, herhalingen=20)
+
+# --------------------------------------------------- Webservice ----------------------------------------------------- #
+def test_webservice_simulaties(offline, meet):
+    import asyncio
+    import http.client
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    import webservice
+
+    vul_neo_cache()
+    loop = asyncio.new_event_loop()
+    loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+    loop_thread.start()
+    service = webservice.Webservice()
+    server = asyncio.run_coroutine_threadsafe(service.start("127.0.0.1", 0), loop).result()
+    poort = server.sockets[0].getsockname()[1]
+    kolommen, _ = neo_cache.laad_neo_data()
+    ids = [str(neo_id) for neo_id in kolommen["id"][:20].tolist()]
+
+    def client(_):
+        verbinding = http.client.HTTPConnection("127.0.0.1", poort)
+        statussen = []
+        for i in range(50):
+            verbinding.request("GET", f"/simulatie?asteroide={ids[i % len(ids)]}&land=Land%20{i % 10}")
+            antwoord = verbinding.getresponse()
+            antwoord.read()
+            statussen.append(antwoord.status)
+        verbinding.close()
+        return statussen
+
+    def duizend_verzoeken():
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            return [status for statussen in pool.map(client, range(20)) for status in statussen]
+
+    try:
+        meet(duizend_verzoeken, herhalingen=3)
+    finally:
+        asyncio.run_coroutine_threadsafe(service.stop(server), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        loop_thread.join()
+        loop.close()
+
+# ------------------------------------------------- Bevolkingsraster ------------------------------------------------- #
+def test_bevolkingsraster_inslagpunten(tmp_path, meet):
+    rng = np.random.default_rng(0)
+    raster = rng.random((720, 1440)).astype(np.float32) * 1000
+    pad = str(tmp_path / "bevolking.npy")
+    np.save(pad, raster)
+    model = bevolkingsraster.Bevolkingsraster(pad)
+    aantal = 100_000
+    breedte = rng.uniform(-85, 85, aantal)
+    lengte = rng.uniform(-180, 180, aantal)
+    joules = 10 ** rng.uniform(13, 20, aantal)
+    meet(model.slachtoffers, joules, breedte, lengte)
+
+# ------------------------------------------------- Parameter-sweep -------------------------------------------------- #
+def test_parameter_sweep(offline, meet):
+    vul_neo_cache()
+    kolommen, _ = neo_cache.laad_neo_data()
+    landen = landen_cache.haal_landen_op()
+    raster = dict(dichtheden=range(1500, 8001, 1000), snelheid_factoren=(0.8, 1.0, 1.2), diameter_percentielen=(0, 100))
+    processen = max(2, os.cpu_count() or 1)
+
+    meet(parameter_sweep.sweep, kolommen, landen, processen=processen, herhalingen=2, **raster)
@@ -0,0 +1,38 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import json
+import os
+import subprocess
+import sys
+
+# Opstarttijd-budget: 'import astro_impact' moet snel zijn en mag geen netwerk, terminal of zware UI-libraries
+# aanraken. numpy hoort bij de rekenkern en wordt apart gemeten; het budget geldt voor alles daarbovenop.
+IMPORT_BUDGET_S = float(os.getenv("BENCH_IMPORT_BUDGET_S", 0.1))
+PROJECT_MAP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEET_SCRIPT = """
+import json, os, sys, time
+import numpy
+start = time.perf_counter()
+import astro_impact
+duur = time.perf_counter() - start
+zwaar = [naam for naam in ("requests", "prettytable", "pyfiglet", "humanize", "dotenv") if naam in sys.modules]
+print(json.dumps({"duur": duur, "zwaar": zwaar, "files": os.path.exists("files")}))
+"""
+
+def meet_import(werkmap):
+    """Importeert astro_impact in een schoon proces en geeft de meting terug."""
+    uitvoer = subprocess.run([sys.executable, "-c", MEET_SCRIPT], cwd=werkmap, capture_output=True, text=True,
+                             env={**os.environ, "PYTHONPATH": PROJECT_MAP}, check=True, timeout=60)
+    return json.loads(uitvoer.stdout)
+
+def test_import_binnen_budget(tmp_path, meet):
+    # Eén keer opwarmen zodat de .pyc-bestanden er zijn, daarna telt de snelste meting
+    meet_import(tmp_path)
+    metingen = meet(lambda: [meet_import(tmp_path) for _ in range(5)], herhalingen=1)
+    snelste = min(meting["duur"] for meting in metingen)
+    assert snelste < IMPORT_BUDGET_S, f"import astro_impact duurde {snelste * 1000:.0f} ms"
+
+def test_import_zonder_bijwerkingen(tmp_path):
+    meting = meet_import(tmp_path)
+    assert meting["zwaar"] == []
+    assert not meting["files"]
@@ -0,0 +1,39 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import json
+import os
+import sys
+
+from benchmarks.conftest import RESULTATEN_MAP
+
+# Vergelijkt de benchmark-resultaten van twee commits.
+# Gebruik: python -m benchmarks.vergelijk <oude-commit> <nieuwe-commit> [drempel, standaard 1.2]
+
+def laad(commit):
+    with open(os.path.join(RESULTATEN_MAP, f"{commit}.json")) as file:
+        return {resultaat["naam"]: resultaat for resultaat in json.load(file)["resultaten"]}
+
+def vergelijk(oud, nieuw, drempel=1.2):
+    """
+    Print per benchmark de mediaan van beide commits en de verhouding.
+    Een benchmark die meer dan 'drempel' keer trager is geworden telt als regressie.
+
+    :return: Het aantal regressies.
+    """
+    oude_resultaten = laad(oud)
+    nieuwe_resultaten = laad(nieuw)
+    regressies = 0
+    print(f"{'benchmark':<60} {oud:>12} {nieuw:>12} {'verhouding':>10}")
+    for naam in sorted(set(oude_resultaten) & set(nieuwe_resultaten)):
+        oude_tijd = oude_resultaten[naam]["mediaan_s"]
+        nieuwe_tijd = nieuwe_resultaten[naam]["mediaan_s"]
+        verhouding = nieuwe_tijd / oude_tijd if oude_tijd else float("inf")
+        markering = "  <-- regressie" if verhouding > drempel else ""
+        regressies += verhouding > drempel
+        print(f"{naam:<60} {oude_tijd * 1000:>10.2f}ms {nieuwe_tijd * 1000:>10.2f}ms {verhouding:>9.2f}x{markering}")
+    return regressies
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Gebruik: python -m benchmarks.vergelijk <oude-commit> <nieuwe-commit> [drempel]")
+        sys.exit(2)
+    sys.exit(1 if vergelijk(sys.argv[1], sys.argv[2], float(sys.argv[3]) if len(sys.argv) > 3 else 1.2) else 0)
@@ -0,0 +1,117 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import contextlib
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl # Unix: flock
+except ImportError:
+    fcntl = None
+    import msvcrt # Windows: byte-range lock
+
+# Meerdere processen (het menu, de batch-modus, de webservice) kunnen dezelfde 'files/' map gebruiken.
+# - atomair_schrijven(): schrijft naar een tijdelijk bestand en hernoemt dat pas als alles erin staat. Een lezer ziet
+#   zo altijd het oude of het nieuwe bestand, nooit een half geschreven bestand.
+# - Bestandsslot: een advisory lock op een bestand, zodat maar één proces tegelijk iets doet (bijv. de NASA-data
+#   verversen). Het besturingssysteem geeft het slot vrij als het proces stopt, ook bij een crash.
+SLOT_POLL_S = 0.05
+_umask_lock = threading.Lock()
+
+def standaard_modus():
+    """
+    De rechten die open() een nieuw bestand geeft: 0o666 zonder de umask (mkstemp() geeft altijd 0o600).
+    Linux toont de umask in /proc/self/status. Elders is hij alleen te lezen door hem even te zetten; dat geldt voor
+    het hele proces, dus gebeurt het onder een lock en pas bij het schrijven, niet al bij het importeren.
+    """
+    with contextlib.suppress(OSError, ValueError):
+        with open("/proc/self/status") as file:
+            for regel in file:
+                if regel.startswith("Umask:"):
+                    return 0o666 & ~int(regel.split()[1], 8)
+    with _umask_lock:
+        umask = os.umask(0o077)
+        os.umask(umask)
+    return 0o666 & ~umask
+
+# ------------------------------------------------- Atomair schrijven ------------------------------------------------ #
+@contextlib.contextmanager
+def atomair_schrijven(pad, mode="w", **kwargs):
+    """
+    Opent een tijdelijk bestand naast 'pad' om in te schrijven. Gaat het blok zonder fout, dan vervangt het in één
+    keer 'pad'; bij een fout wordt het tijdelijke bestand weggegooid en blijft 'pad' zoals het was.
+    De inhoud staat op schijf (fsync) vóór het hernoemen, zodat ook na een stroomstoring nooit een leeg bestand
+    onder 'pad' staat. Het bestand krijgt dezelfde rechten als een bestand dat met open() gemaakt is.
+
+    Gebruik: with atomair_schrijven(pad) as file: json.dump(data, file)
+    """
+    map_pad = os.path.dirname(pad) or "."
+    os.makedirs(map_pad, exist_ok=True)
+    fd, tijdelijk = tempfile.mkstemp(dir=map_pad, prefix=os.path.basename(pad) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, **kwargs) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(tijdelijk, standaard_modus())
+        os.replace(tijdelijk, pad)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tijdelijk)
+        raise
+
+# ---------------------------------------------------- Bestandsslot -------------------------------------------------- #
+class Bestandsslot:
+    """
+    Advisory lock op een bestand, tussen processen én tussen threads (elk slot opent het bestand zelf).
+
+    Gebruik: with Bestandsslot(pad): ...   of   if slot.verkrijg(timeout=10): try: ... finally: slot.geef_vrij()
+    """
+    def __init__(self, pad):
+        self.pad = pad
+        self.file = None
+
+    def verkrijg(self, timeout=None):
+        """
+        Wacht tot het slot vrij is, hooguit 'timeout' seconden (None = onbeperkt, 0 = niet wachten).
+
+        :return: True als het slot verkregen is, False na de timeout.
+        """
+        os.makedirs(os.path.dirname(self.pad) or ".", exist_ok=True)
+        self.file = open(self.pad, "a+")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(self.file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    self.file.seek(0)
+                    msvcrt.locking(self.file.fileno(), msvcrt.LK_NBLCK, 1)
+                return True
+            except OSError:
+                if deadline is not None and time.monotonic() >= deadline:
+                    self.file.close()
+                    self.file = None
+                    return False
+                time.sleep(SLOT_POLL_S)
+
+    def geef_vrij(self):
+        if self.file is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+            else:
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        self.verkrijg()
+        return self
+
+    def __exit__(self, *_):
+        self.geef_vrij()
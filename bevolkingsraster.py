@@ -0,0 +1,193 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import json
+import os
+
+import numpy as np # Raster en summed-area table als (memory-mapped) arrays
+
+from impact_berekening import HIROSHIMA_JOULES, HIROSHIMA_OPPERVLAK
+
+# Optioneel bevolkingsmodel: in plaats van de slachtoffers gelijk over een land te verdelen, tellen we de mensen die
+# echt binnen de vernietigde oppervlakte rond een inslagpunt wonen, op basis van een bevolkingsraster
+# (bijv. GPW of WorldPop: per rastercel het aantal inwoners op een regelmatig lat/lon-grid).
+#
+# Het raster staat als files/bevolking.npy met de ligging in files/bevolking.json. Een ESRI ASCII-grid (.asc, zoals
+# GPW ze aanbiedt) is om te zetten met converteer_ascii_grid(). Bij het eerste gebruik wordt er een summed-area table
+# van gemaakt (files/bevolking.sat.npy): elke cel bevat de som van alle cellen linksboven. Daarmee is de bevolking in
+# elke rechthoek met vier opzoekingen bekend, hoe groot de rechthoek ook is.
+RASTER_PAD = os.path.join("files", "bevolking.npy")
+# Aantal rasterrijen dat tegelijk in het geheugen staat bij het omzetten en bij het opbouwen van de tabel
+RIJEN_PER_BLOK = 256
+KM_PER_GRAAD = 111.32
+
+# -------------------------------------------------- Inlezen en omzetten --------------------------------------------- #
+def lees_metadata(pad):
+    """
+    Leest de ligging van het raster uit <pad zonder .npy>.json. Zonder dat bestand wordt aangenomen
+    dat het raster de hele aarde beslaat (lengte -180..180, breedte -90..90) met de bovenste rij in het noorden.
+    """
+    try:
+        with open(os.path.splitext(pad)[0] + ".json", 'r') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+def converteer_ascii_grid(pad_asc, pad=RASTER_PAD):
+    """
+    Zet een ESRI ASCII-grid (.asc) regel voor regel om naar een .npy raster met .json metadata,
+    zonder het hele grid in het geheugen te laden. NODATA-cellen worden 0.
+
+    :raises ValueError: Als de kop geen ncols, nrows, cellsize en linkeronderhoek bevat.
+    """
+    with open(pad_asc, 'r') as file:
+        # De kop heeft 5 of 6 regels (NODATA_value is optioneel) in willekeurige volgorde: lezen tot de eerste
+        # regel die met een getal begint, dat is de eerste rij van het raster
+        kop = {}
+        regel = file.readline()
+        while regel.split() and regel.split()[0][0].isalpha():
+            sleutel, waarde = regel.split()[:2]
+            kop[sleutel.lower()] = float(waarde)
+            regel = file.readline()
+        if not {"ncols", "nrows", "cellsize"} <= kop.keys() or not (
+                {"xllcorner", "xllcenter"} & kop.keys() and {"yllcorner", "yllcenter"} & kop.keys()):
+            raise ValueError(f"Geen geldige kop voor een ESRI ASCII-grid in {pad_asc}: {sorted(kop)}")
+        rijen, kolommen = int(kop["nrows"]), int(kop["ncols"])
+        raster = np.lib.format.open_memmap(pad, mode="w+", dtype=np.float32, shape=(rijen, kolommen))
+        for rij in range(rijen):
+            waarden = np.array(regel.split(), dtype=np.float32)
+            waarden[waarden == kop.get("nodata_value", -9999)] = 0
+            raster[rij] = waarden
+            regel = file.readline()
+        raster.flush()
+
+    # De linkeronderhoek staat in het bestand als hoek van de cel (xllcorner) of als middelpunt (xllcenter)
+    half = kop["cellsize"] / 2
+    metadata = {
+        "west": kop["xllcorner"] if "xllcorner" in kop else kop["xllcenter"] - half,
+        "zuid": kop["yllcorner"] if "yllcorner" in kop else kop["yllcenter"] - half,
+        "celgrootte": kop["cellsize"],
+    }
+    with open(os.path.splitext(pad)[0] + ".json", 'w') as file:
+        json.dump(metadata, file, indent=4)
+
+def bouw_summed_area_table(raster, pad_sat):
+    """
+    Bouwt de summed-area table S met vorm (rijen + 1, kolommen + 1), waarbij S[i, j] de som is van raster[:i, :j].
+    Dit gebeurt per blok rijen, direct in een memory-mapped bestand, zodat ook een groot raster in weinig geheugen past.
+    """
+    rijen, kolommen = raster.shape
+    sat = np.lib.format.open_memmap(pad_sat + ".tmp.npy", mode="w+", dtype=np.float64,
+                                    shape=(rijen + 1, kolommen + 1))
+    sat[0] = 0
+    vorige = np.zeros(kolommen, dtype=np.float64)
+    for start in range(0, rijen, RIJEN_PER_BLOK):
+        blok = np.asarray(raster[start:start + RIJEN_PER_BLOK], dtype=np.float64)
+        blok = np.where(np.isfinite(blok) & (blok > 0), blok, 0)
+        cumulatief = np.cumsum(np.cumsum(blok, axis=1), axis=0) + vorige
+        sat[start + 1:start + 1 + len(blok), 0] = 0
+        sat[start + 1:start + 1 + len(blok), 1:] = cumulatief
+        vorige = cumulatief[-1]
+    sat.flush()
+    del sat
+    os.replace(pad_sat + ".tmp.npy", pad_sat)
+
+# ------------------------------------------------------ Model ------------------------------------------------------- #
+class Bevolkingsraster:
+    """
+    Bevolkingsraster met summed-area table. Alle functies werken op arrays, zodat duizenden inslagpunten in één
+    keer berekend worden.
+    """
+    def __init__(self, pad=RASTER_PAD):
+        self.raster = np.load(pad, mmap_mode="r")
+        self.rijen, self.kolommen = self.raster.shape
+        metadata = lees_metadata(pad)
+        if metadata is None:
+            metadata = {"west": -180.0, "zuid": -90.0, "celgrootte": 360.0 / self.kolommen}
+        self.west = metadata["west"]
+        self.celgrootte = metadata["celgrootte"]
+        self.noord = metadata["zuid"] + self.rijen * self.celgrootte
+        # Beslaat het raster de hele aarde, dan loopt een gebied over de datumgrens door aan de andere kant
+        self.rondom = abs(self.kolommen * self.celgrootte - 360) < 1e-6
+
+        # De tabel opnieuw bouwen als het raster nieuwer is dan de tabel
+        pad_sat = os.path.splitext(pad)[0] + ".sat.npy"
+        if not os.path.exists(pad_sat) or os.path.getmtime(pad_sat) < os.path.getmtime(pad):
+            bouw_summed_area_table(self.raster, pad_sat)
+        self.sat = np.load(pad_sat, mmap_mode="r")
+
+    @property
+    def totaal(self):
+        return float(self.sat[-1, -1])
+
+    def prefix(self, y, x):
+        """
+        De bevolking boven y en links van x (in rastercellen, mag een breuk zijn).
+        Binnen een cel is de bevolking gelijk verdeeld, dus tussen de vier hoekpunten is dit precies bilineair.
+        """
+        y = np.clip(y, 0, self.rijen)
+        x = np.clip(x, 0, self.kolommen)
+        i = np.minimum(np.floor(y).astype(np.int64), self.rijen - 1)
+        j = np.minimum(np.floor(x).astype(np.int64), self.kolommen - 1)
+        fy = y - i
+        fx = x - j
+        s00 = self.sat[i, j]
+        s10 = self.sat[i + 1, j]
+        s01 = self.sat[i, j + 1]
+        s11 = self.sat[i + 1, j + 1]
+        return s00 + fy * (s10 - s00) + fx * (s01 - s00) + fy * fx * (s11 - s10 - s01 + s00)
+
+    def rechthoek(self, y1, x1, y2, x2):
+        """Bevolking in de rechthoek [y1, y2) × [x1, x2) in rastercellen, vier opzoekingen per rechthoek."""
+        return self.prefix(y2, x2) - self.prefix(y1, x2) - self.prefix(y2, x1) + self.prefix(y1, x1)
+
+    def bevolking_binnen_straal(self, breedte, lengte, straal_km):
+        """
+        Het aantal mensen binnen straal_km rond (breedte, lengte) in graden. Alle argumenten mogen arrays zijn.
+
+        De cirkel wordt benaderd met een vierkant met dezelfde oppervlakte (zijde straal × √π), zodat de som met de
+        summed-area table in constante tijd gaat. Over de datumgrens loopt het vierkant door aan de andere kant,
+        bij de polen wordt het afgekapt.
+        """
+        breedte, lengte, straal_km = np.broadcast_arrays(np.asarray(breedte, dtype=np.float64),
+                                                         np.asarray(lengte, dtype=np.float64),
+                                                         np.asarray(straal_km, dtype=np.float64))
+        half_km = straal_km * np.sqrt(np.pi) / 2
+        half_breedte = half_km / KM_PER_GRAAD
+        half_lengte = np.minimum(half_breedte / np.maximum(np.cos(np.radians(breedte)), 1e-6), 180.0)
+
+        y1 = (self.noord - (breedte + half_breedte)) / self.celgrootte
+        y2 = (self.noord - (breedte - half_breedte)) / self.celgrootte
+        x1 = (lengte - half_lengte - self.west) / self.celgrootte
+        x2 = (lengte + half_lengte - self.west) / self.celgrootte
+
+        if not self.rondom:
+            return np.maximum(self.rechthoek(y1, x1, y2, x2), 0)
+        # Eerst het middelpunt binnen het raster leggen, daarna het stuk dat links of rechts uitsteekt erbij tellen
+        verschuiving = np.floor(((x1 + x2) / 2) / self.kolommen) * self.kolommen
+        x1 = x1 - verschuiving
+        x2 = x2 - verschuiving
+        som = self.rechthoek(y1, x1, y2, x2)
+        som = som + np.where(x1 < 0, self.rechthoek(y1, x1 + self.kolommen, y2, self.kolommen), 0)
+        som = som + np.where(x2 > self.kolommen, self.rechthoek(y1, 0, y2, x2 - self.kolommen), 0)
+        # Afrondingsfouten van het aftrekken mogen geen negatieve bevolking geven
+        return np.maximum(som, 0)
+
+    def slachtoffers(self, joules, breedte, lengte):
+        """
+        Slachtoffers van een inslag met deze energie op (breedte, lengte): iedereen binnen de vernietigde oppervlakte,
+        die op dezelfde manier uit de energie volgt als in impact_berekening.py (Hiroshima-equivalenten × 13 km²).
+        """
+        vernietigde_oppervlakte = np.asarray(joules, dtype=np.float64) / HIROSHIMA_JOULES * HIROSHIMA_OPPERVLAK
+        return self.bevolking_binnen_straal(breedte, lengte, np.sqrt(vernietigde_oppervlakte / np.pi))
+
+# Het geladen raster, het openen en eventueel bouwen van de tabel gebeurt maar één keer per proces
+_geladen = {}
+
+def laad_bevolkingsraster(pad=RASTER_PAD):
+    """
+    Geeft het bevolkingsraster, of None als er geen raster in files/ staat (het model is optioneel).
+    """
+    if not os.path.exists(pad):
+        return None
+    if pad not in _geladen:
+        _geladen[pad] = Bevolkingsraster(pad)
+    return _geladen[pad]
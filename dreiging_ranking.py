@@ -0,0 +1,176 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import heapq # Top-K zonder alles te sorteren
+import itertools
+import os
+import threading
+
+import numpy as np # Energie per dag in één keer uitrekenen
+
+from impact_berekening import bereken_energie, bereken_slachtoffers, HIROSHIMA_JOULES, HIROSHIMA_OPPERVLAK
+from instrumentatie import gemeten, tel
+from neo_cache import CACHE_MAP, dag_versies, read_shard
+
+# Ranglijsten van de gevaarlijkste naderingen in de cache: "welke asteroïden zouden het meest verwoesten?" of
+# "welke grote, gevaarlijke objecten komen het dichtstbij?".
+#
+# Per maat staat er één binaire heap met alle naderingen (en één met alleen de potentieel gevaarlijke). De top-K wordt
+# gevonden door de heap vanaf de wortel af te lopen met een tweede, kleine heap van kandidaten: elke stap haalt de
+# beste kandidaat eruit en voegt zijn twee kinderen toe. Dat kost O(K log K) in plaats van alles te sorteren.
+#
+# De ranglijst wordt per dag bijgewerkt: komt er een nieuwe versie van een dag in de cache, dan worden alleen die
+# naderingen erbij gezet (O(log N) per nadering). Oude naderingen blijven als verouderd in de heap staan en worden
+# bij het aflopen overgeslagen; zijn er meer verouderde dan actuele, dan worden de heaps opnieuw opgebouwd.
+MATEN = {
+    "joules": lambda rij: -rij["joules"],          # Meeste energie eerst
+    "diameter": lambda rij: -rij["diameter"],      # Grootste eerst
+    "afstand": lambda rij: rij["afstand_km"],      # Dichtstbij eerst
+}
+
+# ---------------------------------------------------- Ranglijst ----------------------------------------------------- #
+class Dreigingsranking:
+    """
+    Top-K ranglijsten over de naderingen in de cache, per dag bij te werken. Veilig om vanuit meerdere threads te
+    gebruiken (de webservice).
+    """
+    def __init__(self):
+        # {(maat, alleen_gevaarlijk): [(sleutel, volgnummer, rij)]}
+        self.heaps = {(maat, gevaarlijk): [] for maat in MATEN for gevaarlijk in (False, True)}
+        # De actuele rij per (id, datum), en per dag de versie en de sleutels van zijn naderingen
+        self.rijen = {}
+        self.dagen = {}
+        self.dag_sleutels = {}
+        self.lock = threading.RLock()
+        self.verouderd = 0
+        self.volgnummer = itertools.count()
+
+    def voeg_dag_toe(self, datum, versie, kolommen):
+        """Zet de naderingen van één dag (kolommen uit de cache) in de ranglijsten, een eerdere versie vervalt."""
+        self.verwijder_dag(datum)
+        sleutels = []
+        joules = bereken_energie(kolommen["diameter_min"], kolommen["diameter_max"], kolommen["snelheid_kms"])
+        diameter = (np.asarray(kolommen["diameter_min"]) + np.asarray(kolommen["diameter_max"])) / 2
+        for neo_id, naam, dag, d, snelheid, afstand, gevaarlijk, energie in zip(
+                kolommen["id"].tolist(), kolommen["naam"], kolommen["datum"].astype(str).tolist(),
+                diameter.tolist(), kolommen["snelheid_kms"].tolist(), kolommen["afstand_km"].tolist(),
+                kolommen["gevaarlijk"].tolist(), joules.tolist()):
+            rij = {"id": str(neo_id), "naam": naam, "datum": dag, "diameter": d, "snelheid_kms": snelheid,
+                   "afstand_km": afstand, "gevaarlijk": gevaarlijk, "joules": energie}
+            sleutel = (rij["id"], dag)
+            if sleutel in self.rijen:
+                self.verouderd += 1
+            self.rijen[sleutel] = rij
+            sleutels.append(sleutel)
+            nummer = next(self.volgnummer)
+            for maat, waarde in MATEN.items():
+                heapq.heappush(self.heaps[maat, False], (waarde(rij), nummer, rij))
+                if gevaarlijk:
+                    heapq.heappush(self.heaps[maat, True], (waarde(rij), nummer, rij))
+        self.dagen[datum] = versie
+        self.dag_sleutels[datum] = sleutels
+        tel("ranking_naderingen_toegevoegd", len(joules))
+
+    def verwijder_dag(self, datum):
+        """Haalt de naderingen van een dag uit de ranglijsten (ze blijven als verouderd in de heaps staan)."""
+        if datum not in self.dagen:
+            return
+        del self.dagen[datum]
+        for sleutel in self.dag_sleutels.pop(datum):
+            if self.rijen.pop(sleutel, None) is not None:
+                self.verouderd += 1
+        if self.verouderd > len(self.rijen):
+            self.bouw_opnieuw()
+
+    def bouw_opnieuw(self):
+        """Bouwt de heaps opnieuw op uit alleen de actuele rijen, in O(N)."""
+        for (maat, gevaarlijk), heap in self.heaps.items():
+            heap[:] = [(MATEN[maat](rij), next(self.volgnummer), rij) for rij in self.rijen.values()
+                       if rij["gevaarlijk"] or not gevaarlijk]
+            heapq.heapify(heap)
+        self.verouderd = 0
+        tel("ranking_herbouwd")
+
+    def synchroniseer(self, dagen, lees_dag):
+        """
+        Brengt de ranglijst in lijn met de cache: dagen die er niet meer bij horen gaan eruit, nieuwe dagen en
+        nieuwe versies van een dag komen erbij. Dagen die niet veranderd zijn worden niet opnieuw gelezen.
+
+        :param dagen: {datum: versie} van de dagen die in de ranglijst horen.
+        :param lees_dag: Functie die de kolommen van een dag geeft (of None).
+        """
+        with self.lock:
+            for datum in set(self.dagen) - set(dagen):
+                self.verwijder_dag(datum)
+            for datum, versie in dagen.items():
+                if self.dagen.get(datum) != versie:
+                    kolommen = lees_dag(datum)
+                    if kolommen is not None:
+                        self.voeg_dag_toe(datum, versie, kolommen)
+
+    @gemeten("ranking_top")
+    def top(self, k=10, maat="joules", alleen_gevaarlijk=False):
+        """
+        De k hoogst gerangschikte asteroïden op 'maat' (zie MATEN), elke asteroïde één keer (met zijn beste nadering).
+
+        :return: Lijst met rijen {id, naam, datum, diameter, snelheid_kms, afstand_km, gevaarlijk, joules}.
+        """
+        if maat not in MATEN:
+            raise ValueError(f"Rangschikken kan op: {', '.join(MATEN)}")
+        uitkomst = []
+        gezien = set()
+        with self.lock:
+            heap = self.heaps[maat, alleen_gevaarlijk]
+            kandidaten = [(heap[0][0], heap[0][1], 0)] if heap else []
+            while kandidaten and len(uitkomst) < k:
+                _, _, positie = heapq.heappop(kandidaten)
+                for kind in (2 * positie + 1, 2 * positie + 2):
+                    if kind < len(heap):
+                        heapq.heappush(kandidaten, (heap[kind][0], heap[kind][1], kind))
+                rij = heap[positie][2]
+                # Verouderde naderingen en een tweede nadering van dezelfde asteroïde overslaan
+                if self.rijen.get((rij["id"], rij["datum"])) is not rij or rij["id"] in gezien:
+                    continue
+                gezien.add(rij["id"])
+                uitkomst.append(rij)
+        return uitkomst
+
+    def top_voor_land(self, land, k=10, alleen_gevaarlijk=False):
+        """
+        De k asteroïden met de meeste slachtoffers in één land ([naam, populatie, oppervlakte, dichtheid]).
+        De slachtoffers nemen voor elk land toe met de energie, dus dit is de top-k op energie; alleen voor die k
+        worden de slachtoffers uitgerekend.
+        """
+        rijen = self.top(k, "joules", alleen_gevaarlijk)
+        vernietigd = np.array([rij["joules"] for rij in rijen]) / HIROSHIMA_JOULES * HIROSHIMA_OPPERVLAK
+        procent_land, slachtoffers, land_vernietigd = bereken_slachtoffers(vernietigd, [land[1]], [land[2]])
+        return [
+            {**rij, "land": land[0], "procent_land": float(procent_land[i, 0]),
+             "slachtoffers": float(slachtoffers[i, 0]), "land_vernietigd": bool(land_vernietigd[i, 0])}
+            for i, rij in enumerate(rijen)
+        ]
+
+# De ranglijsten van dit proces per cache en datumvenster, bij elk gebruik bijgewerkt met de veranderde dagen
+_ranking = {}
+_ranking_lock = threading.Lock()
+
+def lees_dag(datum):
+    shard = read_shard(datum)
+    return None if shard is None else shard["kolommen"]
+
+def ranking_van_kolommen(kolommen):
+    """
+    Een losse ranglijst over precies deze kolommen (bijv. de data die de webservice op dat moment serveert), die
+    niet meegaat met de cache op schijf. Alle naderingen komen erin als één "dag".
+    """
+    ranking = Dreigingsranking()
+    if kolommen is not None:
+        ranking.voeg_dag_toe("kolommen", None, kolommen)
+    return ranking
+
+def get_ranking(start_datum=None, eind_datum=None):
+    """
+    Geeft de ranglijst over de dagen in de cache (standaard de laatste 7 dagen), bijgewerkt met nieuwe dagen.
+    """
+    with _ranking_lock:
+        ranking = _ranking.setdefault((os.path.abspath(CACHE_MAP), start_datum, eind_datum), Dreigingsranking())
+    ranking.synchroniseer(dag_versies(start_datum, eind_datum), lees_dag)
+    return ranking
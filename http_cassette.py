@@ -0,0 +1,233 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import functools
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import date, timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from requests import Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from bestandsslot import Bestandsslot
+from instrumentatie import tel
+from synthetische_data import maak_feed, maak_landen, maak_neo_details
+
+# Een transportlaag onder de gedeelde requests.Session van api_client.py, zodat tests, demo's en loadtests zonder
+# netwerk en zonder API-quotum door dezelfde parse- en cachecode gaan als een echte run. De modus komt uit de
+# omgevingsvariabele ASTRO_HTTP (of configureer()):
+# - "live" (standaard): gewoon het netwerk op, de adapter van requests zelf wordt gebruikt.
+# - "opnemen": het netwerk op, en elk antwoord wordt bewaard in een cassette (gzip, één JSON-regel per antwoord).
+# - "afspelen": nooit het netwerk op, antwoorden komen uit de cassette (met 0, de echte of een vaste vertraging).
+# - "synthetisch": nooit het netwerk op, antwoorden worden gemaakt met synthetische_data.py, zo groot als gewenst.
+#
+# De API-key wordt nooit opgeslagen: hij gaat uit de URL en wordt in de body vervangen door DEMO_KEY. Een cassette
+# die met de ene key is opgenomen speelt dus ook met een andere key af.
+MODI = ("live", "opnemen", "afspelen", "synthetisch")
+CASSETTE_PAD = os.path.join("files", "cassettes", "http.jsonl.gz")
+
+# Alleen deze headers doen ertoe voor de app (quotum, revalidatie), de rest wordt niet bewaard
+BEWAARDE_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After", "X-RateLimit-Limit",
+                    "X-RateLimit-Remaining")
+# Conditionele headers horen bij de sleutel: een revalidatie krijgt zijn eigen (304-)antwoord
+SLEUTEL_HEADERS = ("If-None-Match", "If-Modified-Since")
+# Het synthetische quotum is zo groot dat het verspreiden van verzoeken (zie api_client.wacht_op_quotum) nooit start
+SYNTHETISCH_QUOTUM = 1_000_000
+SYNTHETISCHE_ETAG = '"synthetisch"'
+
+_instellingen = {
+    "modus": os.getenv("ASTRO_HTTP", "live"),
+    "pad": os.getenv("ASTRO_CASSETTE", CASSETTE_PAD),
+    # "0" = direct antwoorden, "echt" = zo lang als het opgenomen antwoord duurde, of een vast aantal seconden
+    "vertraging": os.getenv("ASTRO_HTTP_VERTRAGING", "0"),
+    "neo_per_dag": int(os.getenv("ASTRO_SYNTH_NEO_PER_DAG", 100)),
+    "aantal_landen": int(os.getenv("ASTRO_SYNTH_LANDEN", 250)),
+}
+
+# ------------------------------------------------- Configuratie ----------------------------------------------------- #
+def configureer(**instellingen):
+    """
+    Past de instellingen aan (modus, pad, vertraging, neo_per_dag, aantal_landen) en laat api_client een nieuwe
+    sessie maken, zodat de volgende verzoeken ze gebruiken.
+    """
+    onbekend = set(instellingen) - set(_instellingen)
+    if onbekend:
+        raise ValueError(f"Onbekende instelling(en): {', '.join(sorted(onbekend))}")
+    if instellingen.get("modus", _instellingen["modus"]) not in MODI:
+        raise ValueError(f"Kies een HTTP-modus uit: {', '.join(MODI)}")
+    _instellingen.update(instellingen)
+    import api_client
+    api_client.reset_sessie()
+
+def maak_adapter(echte_adapter):
+    """
+    De adapter voor de gedeelde sessie: in de modus "live" de echte adapter zelf, anders een CassetteAdapter.
+    """
+    modus = _instellingen["modus"]
+    if modus not in MODI:
+        raise ValueError(f"ASTRO_HTTP moet een van {', '.join(MODI)} zijn, niet '{modus}'")
+    if modus == "live":
+        return echte_adapter
+    return CassetteAdapter(modus, echte_adapter, _instellingen["pad"], _instellingen["vertraging"],
+                           _instellingen["neo_per_dag"], _instellingen["aantal_landen"])
+
+# ---------------------------------------------------- Hulpfuncties -------------------------------------------------- #
+def zonder_api_key(url):
+    """De URL zonder api_key en met de parameters gesorteerd, plus de weggehaalde key (of None)."""
+    delen = urlsplit(url)
+    params = parse_qsl(delen.query, keep_blank_values=True)
+    api_key = next((waarde for naam, waarde in params if naam == "api_key"), None)
+    query = urlencode(sorted((naam, waarde) for naam, waarde in params if naam != "api_key"))
+    return urlunsplit((delen.scheme, delen.netloc, delen.path, query, "")), api_key
+
+def verzoek_sleutel(request):
+    """Waarop een opgenomen antwoord teruggevonden wordt: methode, URL zonder key en de conditionele headers."""
+    url, _ = zonder_api_key(request.url)
+    conditioneel = "".join(f"|{naam}={request.headers[naam]}" for naam in SLEUTEL_HEADERS if naam in request.headers)
+    return f"{request.method} {url}{conditioneel}"
+
+def maak_response(request, status, body=b"", headers=None, reden="", duur_s=0.0, adapter=None):
+    """Een requests.Response zoals de echte adapter die zou geven."""
+    response = Response()
+    response.status_code = status
+    response.reason = reden
+    response._content = body
+    response._content_consumed = True  # De body is er al, ook iter_content() leest hem dan uit _content
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.encoding = "utf-8"
+    response.url = request.url
+    response.request = request
+    response.elapsed = timedelta(seconds=duur_s)
+    response.connection = adapter
+    return response
+
+@functools.lru_cache(maxsize=32)
+def synthetische_body(soort, *args):
+    """Gecodeerde synthetische antwoorden, zodat herhaalde verzoeken niet opnieuw gegenereerd worden."""
+    maak = {"feed": maak_feed, "neo": maak_neo_details, "landen": maak_landen}[soort]
+    return json.dumps(maak(*args)).encode("utf-8")
+
+# ----------------------------------------------------- Adapter ------------------------------------------------------ #
+class CassetteAdapter(BaseAdapter):
+    """
+    Transport-adapter voor requests die antwoorden opneemt, afspeelt of synthetisch maakt (zie bovenaan).
+    Veilig vanuit meerdere threads; opnemen kan ook vanuit meerdere processen in dezelfde cassette.
+    """
+    def __init__(self, modus, echte_adapter, pad=CASSETTE_PAD, vertraging="0", neo_per_dag=100, aantal_landen=250):
+        super().__init__()
+        self.modus = modus
+        self.echte_adapter = echte_adapter
+        self.pad = pad
+        self.vertraging = vertraging
+        self.neo_per_dag = neo_per_dag
+        self.aantal_landen = aantal_landen
+        self.lock = threading.Lock()
+        self.opgenomen = None     # {sleutel: [antwoorden]} in volgorde van opnemen
+        self.afgespeeld = {}      # {sleutel: aantal keer afgespeeld}
+        self.verbruikt = 0
+
+    def send(self, request, **kwargs):
+        if self.modus == "opnemen":
+            return self.neem_op(request, **kwargs)
+        if self.modus == "afspelen":
+            return self.speel_af(request)
+        return self.synthetisch(request)
+
+    def close(self):
+        self.echte_adapter.close()
+
+    # -------------------------------------------------- Opnemen ---------------------------------------------------- #
+    def neem_op(self, request, **kwargs):
+        start = time.perf_counter()
+        response = self.echte_adapter.send(request, **kwargs)
+        body = response.content
+        duur_s = time.perf_counter() - start
+        url, api_key = zonder_api_key(request.url)
+        tekst = body.decode(response.encoding or "utf-8", errors="replace")
+        if api_key:
+            tekst = tekst.replace(api_key, "DEMO_KEY")
+        regel = json.dumps({
+            "sleutel": verzoek_sleutel(request),
+            "url": url,
+            "status": response.status_code,
+            "reden": response.reason,
+            "headers": {naam: response.headers[naam] for naam in BEWAARDE_HEADERS if naam in response.headers},
+            "body": tekst,
+            "duur_s": round(duur_s, 4),
+        }) + "\n"
+        # Elke regel is een los gzip-member, zo blijft een half afgebroken opname leesbaar
+        with Bestandsslot(self.pad + ".lock"), gzip.open(self.pad, "at", encoding="utf-8") as file:
+            file.write(regel)
+        tel("cassette_opgenomen")
+        return response
+
+    # -------------------------------------------------- Afspelen --------------------------------------------------- #
+    def laad_cassette(self):
+        opgenomen = {}
+        try:
+            with gzip.open(self.pad, "rt", encoding="utf-8") as file:
+                for regel in file:
+                    if regel.strip():
+                        antwoord = json.loads(regel)
+                        opgenomen.setdefault(antwoord["sleutel"], []).append(antwoord)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Geen cassette om af te spelen: {self.pad} (neem eerst op met "
+                                    f"ASTRO_HTTP=opnemen)") from None
+        except EOFError:
+            pass  # Een opname die halverwege afgebroken is: alles tot daar is bruikbaar
+        return opgenomen
+
+    def speel_af(self, request):
+        sleutel = verzoek_sleutel(request)
+        with self.lock:
+            if self.opgenomen is None:
+                self.opgenomen = self.laad_cassette()
+            antwoorden = self.opgenomen.get(sleutel)
+            if antwoorden:
+                # Op volgorde afspelen (bijv. eerst een 503, dan een 200), daarna blijft het laatste antwoord staan
+                keer = self.afgespeeld.get(sleutel, 0)
+                self.afgespeeld[sleutel] = keer + 1
+                antwoord = antwoorden[min(keer, len(antwoorden) - 1)]
+        if not antwoorden:
+            # Een 404 in plaats van een fout of 5xx, zodat de app het niet blijft herhalen
+            tel("cassette_missers")
+            return maak_response(request, 404, f"Niet opgenomen: {sleutel}".encode("utf-8"),
+                                 {"Content-Type": "text/plain"}, "Not Recorded", adapter=self)
+        tel("cassette_afgespeeld")
+        if self.vertraging == "echt":
+            wacht = antwoord["duur_s"]
+        else:
+            wacht = float(self.vertraging)
+        if wacht > 0:
+            time.sleep(wacht)
+        return maak_response(request, antwoord["status"], antwoord["body"].encode("utf-8"), antwoord["headers"],
+                             antwoord["reden"], wacht, self)
+
+    # ------------------------------------------------ Synthetisch -------------------------------------------------- #
+    def synthetisch(self, request):
+        delen = urlsplit(request.url)
+        params = dict(parse_qsl(delen.query))
+        headers = {"Content-Type": "application/json"}
+        if delen.path.endswith("/feed"):
+            start = params["start_date"]
+            eind = params.get("end_date") or (date.fromisoformat(start) + timedelta(days=6)).isoformat()
+            body = synthetische_body("feed", start, eind, self.neo_per_dag)
+        elif "/neo/" in delen.path and delen.path.rsplit("/", 1)[1].isdigit():
+            body = synthetische_body("neo", int(delen.path.rsplit("/", 1)[1]))
+        elif delen.path.endswith("/all"):
+            if request.headers.get("If-None-Match") == SYNTHETISCHE_ETAG:
+                return maak_response(request, 304, reden="Not Modified", adapter=self)
+            body = synthetische_body("landen", self.aantal_landen)
+            headers["ETag"] = SYNTHETISCHE_ETAG
+        else:
+            return maak_response(request, 404, reden="Not Found", adapter=self)
+        if not delen.path.endswith("/all"):
+            with self.lock:
+                self.verbruikt += 1
+                resterend = max(0, SYNTHETISCH_QUOTUM - self.verbruikt)
+            headers.update({"X-RateLimit-Limit": str(SYNTHETISCH_QUOTUM), "X-RateLimit-Remaining": str(resterend)})
+        tel("cassette_synthetisch")
+        return maak_response(request, 200, body, headers, "OK", adapter=self)
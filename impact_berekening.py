@@ -0,0 +1,179 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import numpy as np # Rekenen met arrays in plaats van één asteroïde per keer
+
+# ------------------------------------ Constanten voor simulatie berekening ------------------------------------------ #
+# De energie van de Chicxulub-inslag wordt geschat op ongeveer 5,0 x 10^23 joules
+CHICXULUB_ENERGY = 1e23
+# Wereldbevolking, int want er zijn geen mensen achter de komma, volgens de officiële statistieken dan....
+WORLD_POP = int(8.2e9)
+# Volgens bronnen zoals Our World in Data: Bewoonbaar landoppervlak ≈ 104 miljoen km²
+BEWOONBAAR_OPPERVLAK = 104_000_000
+# Totale oppervlakte aarde 510.1 miljoen km²
+TOTAAL_OPPERVLAKTE_AARDE = 510_100_000
+
+HIROSHIMA_JOULES = 6.3e13     # De (geschatte) energie van de Hiroshima bom
+MEGATON_TNT_JOULE = 4.184e15      # 1 megaton TNT
+# Door de bom was er ongeveer 13 km² vernietigd in Hiroshima (stad)
+HIROSHIMA_OPPERVLAK = 13
+# Aangenomen dichtheid van gesteente in kg/m³
+DICHTHEID_STEEN = 3000
+
+# ------------------------------------------ Omzetten naar kolommen (arrays) ----------------------------------------- #
+def asteroiden_naar_arrays(asteroiden):
+    """
+    Zet een lijst met ruwe NASA-objecten om naar kolommen (numpy arrays).
+    Zo hoeft de dict-structuur maar één keer doorlopen te worden, daarna rekent alles in één keer.
+    """
+    aantal = len(asteroiden)
+    ids = []
+    namen = []
+    diameter_min = np.empty(aantal, dtype=np.float64)
+    diameter_max = np.empty(aantal, dtype=np.float64)
+    snelheid_kms = np.empty(aantal, dtype=np.float64)
+    gevaarlijk = np.empty(aantal, dtype=bool)
+
+    for i, astro in enumerate(asteroiden):
+        diameter = astro["estimated_diameter"]["meters"]
+        ids.append(astro["id"])
+        namen.append(astro["name"])
+        diameter_min[i] = diameter["estimated_diameter_min"]
+        diameter_max[i] = diameter["estimated_diameter_max"]
+        snelheid_kms[i] = float(astro["close_approach_data"][0]["relative_velocity"]["kilometers_per_second"])
+        gevaarlijk[i] = bool(astro["is_potentially_hazardous_asteroid"])
+
+    return {
+        "id": ids,
+        "naam": namen,
+        "diameter_min": diameter_min,
+        "diameter_max": diameter_max,
+        "snelheid_kms": snelheid_kms,
+        "gevaarlijk": gevaarlijk,
+    }
+
+def landen_naar_arrays(landen):
+    """
+    Zet de landenlijst uit haal_landen_op() ([naam, populatie, oppervlakte, dichtheid]) om naar kolommen.
+    """
+    return {
+        "naam": [land[0] for land in landen],
+        "populatie": np.array([land[1] for land in landen], dtype=np.float64),
+        "oppervlakte": np.array([land[2] for land in landen], dtype=np.float64),
+    }
+
+# -------------------------------------------- Gevectoriseerde berekeningen ------------------------------------------ #
+def bereken_energie(diameter_min, diameter_max, snelheid_kms, dichtheid=DICHTHEID_STEEN):
+    """
+    Berekent de impactenergie in joules voor alle asteroïden tegelijk.
+    Dezelfde formule als voorheen, alleen nu op arrays:
+    -E = ½ × m × v²
+    -m = massa = dichtheid × volume (volume = ⁴⁄₃ × π × (r³))
+    -v = snelheid in m/s
+    """
+    diameter = (np.asarray(diameter_min, dtype=np.float64) + np.asarray(diameter_max, dtype=np.float64)) / 2
+    straal = diameter / 2
+    volume = (4 / 3) * np.pi * straal ** 3
+    massa = volume * dichtheid
+    snelheid_ms = np.asarray(snelheid_kms, dtype=np.float64) * 1000
+    return 0.5 * massa * snelheid_ms ** 2
+
+def bereken_magnitude(joules):
+    """
+    Magnitude op de schaal van Richter uit de energie: E = 10^(4.8 + 1.5M) → M = (log10(E) - 4.8) / 1.5
+    """
+    with np.errstate(divide="ignore"):
+        return (np.log10(joules) - 4.8) / 1.5
+
+def bereken_slachtoffers(vernietigde_oppervlakte, populatie, oppervlakte):
+    """
+    Berekent per (asteroïde, land) het percentage van het land dat vernietigd wordt en het aantal slachtoffers.
+    Vernietigde oppervlakte heeft vorm (n_asteroiden,), populatie en oppervlakte vorm (n_landen,),
+    de uitkomsten hebben vorm (n_asteroiden, n_landen).
+
+    Is de vernietigde oppervlakte groter dan het land, dan sterft de hele bevolking plus de mensen op het
+    extra oppervlak, waarvoor de gemiddelde dichtheid van het bewoonbare aardoppervlak wordt aangenomen.
+    """
+    vernietigd = np.asarray(vernietigde_oppervlakte, dtype=np.float64)[:, None]
+    populatie = np.asarray(populatie, dtype=np.float64)[None, :]
+    oppervlakte = np.asarray(oppervlakte, dtype=np.float64)[None, :]
+
+    land_vernietigd = vernietigd > oppervlakte
+    # Landen zonder oppervlakte (komt voor in de REST Countries data) niet laten delen door nul
+    procent_land = np.divide(vernietigd * 100, oppervlakte,
+                             out=np.full(land_vernietigd.shape, 100.0), where=oppervlakte > 0)
+    procent_land = np.where(land_vernietigd, 100.0, procent_land)
+
+    extra_slachtoffers = (vernietigd - oppervlakte) / BEWOONBAAR_OPPERVLAK * WORLD_POP
+    slachtoffers = np.where(land_vernietigd, populatie + extra_slachtoffers, procent_land / 100 * populatie)
+    return procent_land, slachtoffers, land_vernietigd
+
+def bereken_impact_batch(asteroiden, landen, atmosfeer=False):
+    """
+    Rekent de impact uit voor alle asteroïden × alle landen in één keer.
+
+    :param asteroiden: Lijst met ruwe NASA-objecten (zoals in de cache) of de uitkomst van asteroiden_naar_arrays().
+    :param landen: Lijst uit haal_landen_op() of de uitkomst van landen_naar_arrays().
+    :param atmosfeer: True om ook de tocht door de atmosfeer te berekenen (zie atmosfeer.py): of en op welke hoogte
+                      de asteroïde explodeert en hoeveel energie de grond bereikt.
+    :return: Dict met per asteroïde (1D) de energie, megaton TNT, Hiroshima-equivalenten, magnitude,
+             verhouding met Chicxulub en vernietigde oppervlakte; en per paar (2D) het vernietigde percentage
+             van het land, de slachtoffers en of het land volledig vernietigd wordt.
+             Met atmosfeer=True ook de uitkomsten van atmosfeer.bereken_intrede() (1D).
+    """
+    if not isinstance(asteroiden, dict):
+        asteroiden = asteroiden_naar_arrays(asteroiden)
+    if not isinstance(landen, dict):
+        landen = landen_naar_arrays(landen)
+
+    joules = bereken_energie(asteroiden["diameter_min"], asteroiden["diameter_max"], asteroiden["snelheid_kms"])
+    vernietigde_oppervlakte = joules / HIROSHIMA_JOULES * HIROSHIMA_OPPERVLAK
+    procent_land, slachtoffers, land_vernietigd = bereken_slachtoffers(
+        vernietigde_oppervlakte, landen["populatie"], landen["oppervlakte"]
+    )
+
+    resultaat = {
+        "asteroide_id": asteroiden["id"],
+        "asteroide_naam": asteroiden["naam"],
+        "land_naam": landen["naam"],
+        "joules": joules,
+        "megaton_tnt": joules / MEGATON_TNT_JOULE,
+        "hiroshima": joules / HIROSHIMA_JOULES,
+        "ratio_chicxulub": joules / CHICXULUB_ENERGY,
+        "magnitude": bereken_magnitude(joules),
+        "vernietigde_oppervlakte": vernietigde_oppervlakte,
+        "percentage_aarde": vernietigde_oppervlakte / TOTAAL_OPPERVLAKTE_AARDE * 100,
+        "procent_land": procent_land,
+        "slachtoffers": slachtoffers,
+        "land_vernietigd": land_vernietigd,
+    }
+    if atmosfeer:
+        from atmosfeer import bereken_intrede
+        diameter = (np.asarray(asteroiden["diameter_min"]) + np.asarray(asteroiden["diameter_max"])) / 2
+        resultaat.update(bereken_intrede(diameter, asteroiden["snelheid_kms"]))
+    return resultaat
+
+def impact_van_paar(asteroid, land):
+    """
+    Eén rij uit de batch-berekening: de impact van één asteroïde op één land, als gewone Python-getallen.
+    Dit is wat de interactieve simulatie gebruikt, inclusief de tocht door de atmosfeer.
+    Hoogtes die er niet zijn (het object blijft heel of raakt de grond) worden None.
+    """
+    resultaat = bereken_impact_batch([asteroid], [land], atmosfeer=True)
+    hoogte_uiteenvallen = float(resultaat["hoogte_uiteenvallen_km"][0])
+    hoogte_airburst = float(resultaat["hoogte_airburst_km"][0])
+    return {
+        "joules": float(resultaat["joules"][0]),
+        "megaton_tnt": float(resultaat["megaton_tnt"][0]),
+        "hiroshima": float(resultaat["hiroshima"][0]),
+        "ratio_chicxulub": float(resultaat["ratio_chicxulub"][0]),
+        "magnitude": float(resultaat["magnitude"][0]),
+        "vernietigde_oppervlakte": float(resultaat["vernietigde_oppervlakte"][0]),
+        "percentage_aarde": float(resultaat["percentage_aarde"][0]),
+        "procent_land": float(resultaat["procent_land"][0, 0]),
+        "slachtoffers": float(resultaat["slachtoffers"][0, 0]),
+        "land_vernietigd": bool(resultaat["land_vernietigd"][0, 0]),
+        "airburst": bool(resultaat["airburst"][0]),
+        "hoogte_uiteenvallen_km": None if np.isnan(hoogte_uiteenvallen) else hoogte_uiteenvallen,
+        "hoogte_airburst_km": None if np.isnan(hoogte_airburst) else hoogte_airburst,
+        "joules_grond": float(resultaat["joules_grond"][0]),
+        "snelheid_grond_kms": float(resultaat["snelheid_grond_kms"][0]),
+    }
@@ -0,0 +1,130 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import atexit
+import functools
+import json
+import os
+import re
+import threading
+import time
+
+from bestandsslot import atomair_schrijven            # Een half geschreven rapport is nooit zichtbaar
+
+# Meetpunten (spans) en tellers rond de hot paths: API-calls, cache lezen/schrijven en tabellen renderen.
+# Standaard staat alles uit en kost een meetpunt alleen één if-check. Aanzetten kan met de omgevingsvariabele
+# ASTRO_METRICS=1 (dan worden bij het afsluiten files/metrics.json en files/metrics.prom geschreven).
+
+# ---------------------------------------------------- Toestand ------------------------------------------------------ #
+_actief = os.getenv("ASTRO_METRICS", "") not in ("", "0")
+_lock = threading.Lock()
+_spans = {}
+_tellers = {}
+
+def is_actief():
+    return _actief
+
+def reset():
+    """Wist alle metingen."""
+    with _lock:
+        _spans.clear()
+        _tellers.clear()
+
+# ---------------------------------------------------- Meetpunten ---------------------------------------------------- #
+def tel(naam, waarde=1):
+    """Verhoogt teller 'naam' met 'waarde' (bijv. cache-hits of gelezen bytes)."""
+    if not _actief:
+        return
+    with _lock:
+        _tellers[naam] = _tellers.get(naam, 0) + waarde
+
+def registreer_span(naam, duur):
+    """Voegt één gemeten duur (in seconden) toe aan span 'naam'."""
+    with _lock:
+        span = _spans.get(naam)
+        if span is None:
+            _spans[naam] = {"aantal": 1, "totaal_s": duur, "min_s": duur, "max_s": duur}
+        else:
+            span["aantal"] += 1
+            span["totaal_s"] += duur
+            span["min_s"] = min(span["min_s"], duur)
+            span["max_s"] = max(span["max_s"], duur)
+
+def gemeten(naam):
+    """
+    Decorator die elke aanroep van de functie als span 'naam' meet.
+    """
+    def decorator(functie):
+        @functools.wraps(functie)
+        def wrapper(*args, **kwargs):
+            if not _actief:
+                return functie(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return functie(*args, **kwargs)
+            finally:
+                registreer_span(naam, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+# ----------------------------------------------------- Export ------------------------------------------------------- #
+def rapport():
+    """Geeft alle spans en tellers als dict."""
+    with _lock:
+        return {
+            "spans": {naam: dict(waarden) for naam, waarden in _spans.items()},
+            "tellers": dict(_tellers),
+        }
+
+def exporteer_json(pad):
+    """Schrijft het rapport als JSON."""
+    with atomair_schrijven(pad) as file:
+        json.dump(rapport(), file, indent=4)
+
+def exporteer_prometheus(pad):
+    """
+    Schrijft het rapport in het tekstformaat van Prometheus (bijv. voor de textfile-collector van node_exporter).
+    """
+    data = rapport()
+    regels = [
+        "# HELP astro_span_seconds Wandkloktijd per meetpunt.",
+        "# TYPE astro_span_seconds summary",
+    ]
+    for naam, waarden in sorted(data["spans"].items()):
+        regels.append(f'astro_span_seconds_sum{{span="{naam}"}} {waarden["totaal_s"]:.9f}')
+        regels.append(f'astro_span_seconds_count{{span="{naam}"}} {waarden["aantal"]}')
+    regels.append("# HELP astro_span_seconds_max Langste meting per meetpunt.")
+    regels.append("# TYPE astro_span_seconds_max gauge")
+    for naam, waarden in sorted(data["spans"].items()):
+        regels.append(f'astro_span_seconds_max{{span="{naam}"}} {waarden["max_s"]:.9f}')
+    for naam, waarde in sorted(data["tellers"].items()):
+        metriek = prometheus_naam(naam)
+        regels.append(f"# HELP {metriek} Teller {naam}.")
+        regels.append(f"# TYPE {metriek} counter")
+        regels.append(f"{metriek} {waarde}")
+    with atomair_schrijven(pad) as file:
+        file.write("\n".join(regels) + "\n")
+
+def prometheus_naam(teller):
+    """
+    Geeft de Prometheus-naam van een teller: met de eenheid achteraan en _total, zoals Prometheus dat verwacht.
+    Bijv. nasa_bytes_ontvangen -> astro_nasa_ontvangen_bytes_total en nasa_gewacht_op_quotum_s ->
+    astro_nasa_gewacht_op_quotum_seconds_total.
+    """
+    delen = re.sub(r"[^a-zA-Z0-9_]", "_", teller).split("_")
+    eenheid = None
+    if "bytes" in delen:
+        delen.remove("bytes")
+        eenheid = "bytes"
+    elif delen[-1] == "s":
+        delen.pop()
+        eenheid = "seconds"
+    return "_".join(["astro", *delen, *([eenheid] if eenheid else []), "total"])
+
+def _exporteer_bij_afsluiten():
+    """Schrijft bij het afsluiten beide rapporten naar files/, als er iets gemeten is."""
+    if not _actief or not (_spans or _tellers):
+        return
+    os.makedirs("files", exist_ok=True)
+    exporteer_json(os.path.join("files", "metrics.json"))
+    exporteer_prometheus(os.path.join("files", "metrics.prom"))
+
+atexit.register(_exporteer_bij_afsluiten)
@@ -0,0 +1,205 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import json # voor de export naar het oude JSON-formaat
+import os
+
+import numpy as np # Kolommen als arrays die direct vanaf schijf gemapt kunnen worden
+
+from bestandsslot import atomair_schrijven
+
+# ---------------------------------------------- Formaat van de kolommen --------------------------------------------- #
+# Van een NASA-object bewaren we alleen wat build_table() en extract_asteroide_data() gebruiken.
+# Elke rij is één nadering van één asteroïde. De namen staan niet in de rij zelf maar in een aparte
+# "stringtabel": één blok UTF-8 bytes met per rij het begin en eind van de naam.
+# NASA NEO-id's zijn altijd numeriek, dus die passen in een int64.
+NEO_DTYPE = np.dtype([
+    ("id", "<i8"),
+    ("naam_start", "<i8"),
+    ("naam_eind", "<i8"),
+    ("diameter_min", "<f8"),
+    ("diameter_max", "<f8"),
+    ("snelheid_kmu", "<f8"),
+    ("snelheid_kms", "<f8"),
+    ("afstand_km", "<f8"),
+    ("datum", "<M8[D]"),
+    ("gevaarlijk", "?"),
+])
+
+class Stringtabel:
+    """
+    Lijst-achtige weergave van de namen in een stringtabel.
+    Een naam wordt pas gedecodeerd als hij opgevraagd wordt, zodat het laden van de kolommen bijna niets kost.
+    """
+    def __init__(self, blok, start, eind):
+        self.blok = blok
+        self.start = start
+        self.eind = eind
+
+    def __len__(self):
+        return len(self.start)
+
+    def __getitem__(self, index):
+        return bytes(self.blok[self.start[index]:self.eind[index]]).decode("utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+# ------------------------------------------------ Ingest en omzetten ------------------------------------------------ #
+def objecten_naar_kolommen(objecten):
+    """
+    Zet een lijst met NASA-objecten om naar kolommen: een record-array en een stringtabel met de namen.
+    """
+    records = np.zeros(len(objecten), dtype=NEO_DTYPE)
+    namen = [asteroid["name"].encode("utf-8") for asteroid in objecten]
+    lengtes = np.fromiter((len(naam) for naam in namen), dtype=np.int64, count=len(namen))
+    records["naam_eind"] = np.cumsum(lengtes)
+    records["naam_start"] = records["naam_eind"] - lengtes
+
+    diameters = [asteroid["estimated_diameter"]["meters"] for asteroid in objecten]
+    naderingen = [asteroid["close_approach_data"][0] for asteroid in objecten]
+    records["id"] = [int(asteroid["id"]) for asteroid in objecten]
+    records["diameter_min"] = [diameter["estimated_diameter_min"] for diameter in diameters]
+    records["diameter_max"] = [diameter["estimated_diameter_max"] for diameter in diameters]
+    records["snelheid_kmu"] = [float(nadering["relative_velocity"]["kilometers_per_hour"]) for nadering in naderingen]
+    records["snelheid_kms"] = [float(nadering["relative_velocity"]["kilometers_per_second"]) for nadering in naderingen]
+    records["afstand_km"] = [float(nadering["miss_distance"]["kilometers"]) for nadering in naderingen]
+    records["datum"] = [nadering["close_approach_date"] for nadering in naderingen]
+    records["gevaarlijk"] = [bool(asteroid["is_potentially_hazardous_asteroid"]) for asteroid in objecten]
+
+    return maak_kolommen(records, np.frombuffer(b"".join(namen), dtype=np.uint8))
+
+def maak_kolommen(records, namen_blok):
+    """
+    Geeft de kolommen als dict terug, met dezelfde sleutels die impact_berekening.asteroiden_naar_arrays() maakt.
+    Zo kan de batch-berekening de kolommen direct gebruiken.
+    """
+    return {
+        "records": records,
+        "id": records["id"],
+        "naam": Stringtabel(namen_blok, records["naam_start"], records["naam_eind"]),
+        "diameter_min": records["diameter_min"],
+        "diameter_max": records["diameter_max"],
+        "snelheid_kmu": records["snelheid_kmu"],
+        "snelheid_kms": records["snelheid_kms"],
+        "afstand_km": records["afstand_km"],
+        "datum": records["datum"],
+        "gevaarlijk": records["gevaarlijk"],
+    }
+
+def kolommen_naar_object(kolommen, index):
+    """
+    Bouwt één (uitgedund) NASA-object op uit rij 'index' van de kolommen, voor de bestaande functies die met
+    dicts werken zoals extract_asteroide_data() en de sessie.
+    """
+    rij = kolommen["records"][index]
+    return {
+        "id": str(int(rij["id"])),
+        "name": kolommen["naam"][index],
+        "estimated_diameter": {"meters": {
+            "estimated_diameter_min": float(rij["diameter_min"]),
+            "estimated_diameter_max": float(rij["diameter_max"]),
+        }},
+        "close_approach_data": [{
+            "close_approach_date": str(rij["datum"]),
+            "relative_velocity": {
+                "kilometers_per_hour": repr(float(rij["snelheid_kmu"])),
+                "kilometers_per_second": repr(float(rij["snelheid_kms"])),
+            },
+            "miss_distance": {"kilometers": repr(float(rij["afstand_km"]))},
+        }],
+        "is_potentially_hazardous_asteroid": bool(rij["gevaarlijk"]),
+    }
+
+def plak_kolommen(lijst_kolommen):
+    """
+    Plakt kolommen achter elkaar, met één gezamenlijke stringtabel.
+    """
+    lijst_kolommen = [kolommen for kolommen in lijst_kolommen if len(kolommen["records"])]
+    if not lijst_kolommen:
+        return objecten_naar_kolommen([])
+    if len(lijst_kolommen) == 1:
+        return lijst_kolommen[0]
+    delen = []
+    verschuiving = 0
+    for kolommen in lijst_kolommen:
+        deel = np.array(kolommen["records"])
+        deel["naam_start"] += verschuiving
+        deel["naam_eind"] += verschuiving
+        verschuiving += len(kolommen["naam"].blok)
+        delen.append(deel)
+    namen_blok = np.concatenate([np.asarray(kolommen["naam"].blok) for kolommen in lijst_kolommen])
+    return maak_kolommen(np.concatenate(delen), namen_blok)
+
+def voeg_kolommen_samen(lijst_kolommen):
+    """
+    Plakt de kolommen van meerdere dagen aan elkaar en houdt per NEO id alleen de eerste rij over
+    (de dagen komen op datum binnen, dus dat is de eerste nadering).
+    """
+    kolommen = plak_kolommen(lijst_kolommen)
+    records = kolommen["records"]
+    _, eerste = np.unique(records["id"], return_index=True)
+    if len(eerste) == len(records):
+        return kolommen
+    return maak_kolommen(records[np.sort(eerste)], kolommen["naam"].blok)
+
+class KolommenBouwer:
+    """
+    Bouwt de kolommen op uit objecten die één voor één binnenkomen (zie api_client.lees_feed()).
+    Per BLOK objecten worden ze omgezet naar een record-array, er staan dus nooit meer dan BLOK objecten als dicts
+    in het geheugen, hoe groot het antwoord ook is.
+    """
+    BLOK = 1024
+
+    def __init__(self):
+        self.objecten = []
+        self.blokken = []
+
+    def voeg_toe(self, asteroid):
+        self.objecten.append(asteroid)
+        if len(self.objecten) >= self.BLOK:
+            self.blokken.append(objecten_naar_kolommen(self.objecten))
+            self.objecten = []
+
+    def __len__(self):
+        return sum(len(blok["records"]) for blok in self.blokken) + len(self.objecten)
+
+    def kolommen(self):
+        """De kolommen van alle objecten tot nu toe, in volgorde van binnenkomst."""
+        if self.objecten:
+            self.blokken.append(objecten_naar_kolommen(self.objecten))
+            self.objecten = []
+        return plak_kolommen(self.blokken)
+
+# ------------------------------------------------- Lezen en schrijven ----------------------------------------------- #
+def schrijf_kolommen(pad, kolommen):
+    """
+    Schrijft de kolommen naar '<pad>.npy' (records) en '<pad>.namen' (stringtabel).
+    """
+    np.save(f"{pad}.npy", np.asarray(kolommen["records"]), allow_pickle=False)
+    with open(f"{pad}.namen", "wb") as file:
+        file.write(bytes(kolommen["naam"].blok))
+
+def lees_kolommen(pad):
+    """
+    Leest de kolommen die schrijf_kolommen() gemaakt heeft. Beide bestanden worden memory-mapped geopend,
+    dus er wordt pas iets van schijf gelezen als een waarde echt gebruikt wordt.
+
+    :return: De kolommen, of None als de bestanden niet bestaan.
+    """
+    if not (os.path.exists(f"{pad}.npy") and os.path.exists(f"{pad}.namen")):
+        return None
+    records = np.load(f"{pad}.npy", mmap_mode="r", allow_pickle=False)
+    if os.path.getsize(f"{pad}.namen"):
+        namen_blok = np.memmap(f"{pad}.namen", dtype=np.uint8, mode="r")
+    else:
+        # Een leeg bestand kan niet gemapt worden
+        namen_blok = np.zeros(0, dtype=np.uint8)
+    return maak_kolommen(records, namen_blok)
+
+def exporteer_json(pad, kolommen, timestamp=None):
+    """
+    Exporteert de kolommen naar het oude JSON-formaat ({"objecten": [...], "timestamp": ...}).
+    """
+    objecten = [kolommen_naar_object(kolommen, i) for i in range(len(kolommen["records"]))]
+    with atomair_schrijven(pad) as file:
+        json.dump({"objecten": objecten, "timestamp": timestamp}, file, indent=4)
@@ -0,0 +1,129 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import json # json bestanden uit api-points of eigen files kunnen bekijken
+import os
+import threading
+import time
+
+from cprint import cprint                                   # Printen in kleurtjes
+from bestandsslot import atomair_schrijven                  # Een lezer ziet nooit een half bestand
+from api_client import download_landen, parse_aliassen, parse_landen
+from instrumentatie import gemeten, tel                     # Cache-hits/misses tellen
+from zoekindex import Zoekindex                             # Snel zoeken op landnaam
+
+# ------------------------------------------------ Cache-instellingen ------------------------------------------------ #
+# Landgegevens veranderen bijna nooit, daarom standaard een week geldig.
+# Via de omgevingsvariabele LANDEN_CACHE_TTL (in seconden) is dit aan te passen.
+LANDEN_CACHE_TTL = int(os.getenv("LANDEN_CACHE_TTL", 7 * 24 * 60 * 60))
+
+# Cache in het geheugen voor de rest van het proces, zo wordt het bestand ook maar één keer ingelezen
+_landen_geheugen = {}
+# Zoekindex over de landnamen, hoort bij één specifieke landenlijst
+_landen_index = {}
+# De webservice vraagt de landen op vanuit meerdere threads: vullen en verversen gebeurt door één thread tegelijk
+_landen_lock = threading.Lock()
+
+# ------------------------------------- Functies voor cachebeheer en data-opslag ------------------------------------- #
+def get_landen_cache_path():
+    """
+    Geeft het volledige pad naar het cachebestand van de landen en zorgt dat de map bestaat
+    """
+    path = os.path.join("files", "landen.json")
+    os.makedirs("files", exist_ok=True)
+    return path
+
+def read_landen_cache():
+    """
+    Leest de landen-cache als die bestaat en geldig is, anders lege dict
+    """
+    try:
+        with open(get_landen_cache_path(), 'r') as file:
+            cache = json.load(file)
+            tel("landen_cache_bytes_gelezen", file.tell())
+            return cache
+    except (json.JSONDecodeError, FileNotFoundError):
+        return {}
+
+def write_landen_cache(cache_data):
+    """
+    Schrijft de landen, de ophaaltijd en de validatie-headers (ETag/Last-Modified) naar het cachebestand
+    """
+    with atomair_schrijven(get_landen_cache_path()) as file:
+        json.dump(cache_data, file)
+
+@gemeten("haal_landen_op")
+def haal_landen_op(ttl=None, verversen=False):
+    """
+    Geeft alle landen terug als [naam, populatie, oppervlakte, dichtheid], met zo min mogelijk netwerkverkeer:
+    - eerst uit het geheugen,
+    - dan uit files/landen.json,
+    - en pas als die ouder is dan de TTL via een conditionele request aan de REST Countries API.
+    Is de API niet bereikbaar, dan wordt de (verouderde) cache gebruikt.
+
+    :param ttl: Hoe lang de cache geldig is in seconden, standaard LANDEN_CACHE_TTL.
+    :param verversen: True om de TTL te negeren en altijd bij de API te controleren.
+    """
+    ttl = LANDEN_CACHE_TTL if ttl is None else ttl
+    cache = _landen_geheugen
+    if not verversen and is_geldig(cache, ttl):
+        tel("landen_cache_hits")
+        return cache["landen"]
+
+    with _landen_lock:
+        # Een andere thread kan de cache intussen gevuld of ververst hebben
+        if not cache:
+            cache.update(read_landen_cache())
+        if not verversen and is_geldig(cache, ttl):
+            tel("landen_cache_hits")
+            return cache["landen"]
+        return ververs_landen(cache)
+
+def is_geldig(cache, ttl):
+    """True als er landen in de cache staan die jonger zijn dan de TTL."""
+    return bool(cache.get("landen")) and time.time() - cache.get("opgehaald_op", 0) < ttl
+
+def ververs_landen(cache):
+    """
+    Vraagt de landen op bij de REST Countries API (conditioneel als er al landen zijn) en werkt de cache bij.
+    Wordt aangeroepen met _landen_lock vast.
+    """
+    nu = time.time()
+    tel("landen_cache_verlopen" if cache.get("landen") else "landen_cache_misses")
+
+    response = download_landen(cache.get("etag"), cache.get("last_modified"))
+    if response is None:
+        return cache.get("landen", [])
+
+    if response.status_code == 304 and cache.get("landen"):
+        # Niets veranderd: alleen de ophaaltijd bijwerken
+        tel("landen_cache_revalidaties")
+        cache["opgehaald_op"] = nu
+    elif response.ok:
+        ruwe_landen = response.json()
+        cache.update({
+            "landen": parse_landen(ruwe_landen),
+            "aliassen": parse_aliassen(ruwe_landen),
+            "opgehaald_op": nu,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        })
+    else:
+        cprint("Fout bij ophalen landdata:", response.status_code, c="rB")
+        return cache.get("landen", [])
+
+    write_landen_cache(cache)
+    return cache["landen"]
+
+def get_landen_index():
+    """
+    Geeft de landen met een zoekindex op naam, officiële naam en andere schrijfwijzen (zie zoekindex.py).
+    De index wordt alleen opnieuw opgebouwd als er een nieuwe landenlijst geladen is.
+
+    :return: (landen, zoekindex)
+    """
+    landen = haal_landen_op()
+    with _landen_lock:
+        if _landen_index.get("landen") is not landen:
+            aliassen = _landen_geheugen.get("aliassen", {})
+            index = Zoekindex([land[0] for land in landen], aliassen=[aliassen.get(land[0], []) for land in landen])
+            _landen_index.update({"landen": landen, "index": index})
+        return landen, _landen_index["index"]
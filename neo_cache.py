@@ -0,0 +1,440 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import json # json bestanden uit api-points of eigen files kunnen bekijken
+import os
+import threading # verversen van de cache op de achtergrond
+import time
+
+from cprint import cprint                                   # Printen in kleurtjes
+from bestandsslot import Bestandsslot, atomair_schrijven    # Veilig delen van 'files/' tussen processen
+from instrumentatie import gemeten, tel                     # Meetpunten (staan standaard uit)
+from api_client import haal_dagen_op, dagen_tussen, get_api_key, get_start_date
+from kolom_opslag import (                                  # Compacte kolommen-opslag van de cache
+    KolommenBouwer,
+    objecten_naar_kolommen,
+    kolommen_naar_object,
+    voeg_kolommen_samen,
+    schrijf_kolommen,
+    lees_kolommen,
+    exporteer_json,
+)
+from zoekindex import Zoekindex                             # Snel zoeken op ID en naam
+from neo_historie import get_historie                       # Alle naderingen over langere tijd (SQLite)
+
+# voor timestamps
+from datetime import datetime, date
+
+# -------------------------------------------------- Hulpfuncties ---------------------------------------------------- #
+def toon_bestand_error():
+    """Herbruikbare file error"""
+    cprint(f"Er is iets mis met het bestand: De cache kon niet correct worden ingelezen.", c="rB")
+
+# ------------------------------------------- Asteroïde-data uit de cache -------------------------------------------- #
+@gemeten("build_table")
+def build_table():
+    """
+    Laadt de asteroïde-data uit de lokale cache.
+    Is de cache verouderd, dan wordt de bestaande data direct getoond en worden de ontbrekende dagen op de
+    achtergrond aangevuld (zie ververs_cache()). Alleen als er nog helemaal niets in de cache staat wordt er gewacht.
+    De functie returned een lijst met asteroïde informatie voor tabelweergave.
+    """
+    ververs_cache()
+
+    # lees de cache als kolommen, dat is veel sneller dan alle losse objecten doorlopen
+    kolommen, _ = read_kolommen()
+    if kolommen is None:
+        toon_bestand_error()
+        return []
+
+    return kolommen_naar_tabel(kolommen)
+
+def build_historie_table(**filters):
+    """
+    Zoekt naderingen in de historie (zie neo_historie.py) voor de tabel, met dezelfde filters als NeoHistorie.zoek().
+    Eerst komen de dagen uit de cache erbij die nog niet in de historie staan.
+
+    :return: (kolommen, rijen) met per nadering de kolommen van build_table() plus de datum van de nadering.
+    """
+    vul_historie_aan()
+    kolommen = get_historie().zoek(**filters)
+    return kolommen, kolommen_naar_tabel(kolommen, met_datum=True)
+
+def kolommen_naar_tabel(kolommen, met_datum=False):
+    """Zet de kolommen om naar rijen voor de tabel, eventueel met de naderingsdatum als laatste kolom."""
+    rijen = [
+        [
+            str(neo_id),
+            naam,
+            round(min_d,0),
+            round(max_d,0),
+            round(snelheid,0),
+            round(afstand,0),
+            "Ja" if gevaar else "Nee"
+        ]
+        for neo_id, naam, min_d, max_d, snelheid, afstand, gevaar in zip(
+            kolommen["id"].tolist(),
+            kolommen["naam"],
+            kolommen["diameter_min"].tolist(),
+            kolommen["diameter_max"].tolist(),
+            kolommen["snelheid_kmu"].tolist(),
+            kolommen["afstand_km"].tolist(),
+            kolommen["gevaarlijk"].tolist(),
+        )
+    ]
+    if met_datum:
+        for rij, datum in zip(rijen, kolommen["datum"].tolist()):
+            rij.append(str(datum))
+    return rijen
+
+def extract_asteroide_data(asteroid):
+    """
+    Haalt de belangrijkste gegevens uit een asteroïde-object,
+    dit heb ik gedaan omdat ik deze info eigenlijk oorspronkelijk 2 keer extraheerde dat vond ik niet heel DRY.
+    Ook loste deze functie deze warning op: Unexpected type(s):(strPossible type(s):(SupportsIndex(slice)
+    - naam
+    - min/max diameter
+    - snelheid (km/u)
+    - snelheid (km/s)
+    - gevaar-indicatie (Ja/Nee)
+    """
+    naam = asteroid["name"]
+    diameter_min = asteroid["estimated_diameter"]["meters"]["estimated_diameter_min"]
+    diameter_max = asteroid["estimated_diameter"]["meters"]["estimated_diameter_max"]
+    snelheid_kmu = float(asteroid["close_approach_data"][0]["relative_velocity"]["kilometers_per_hour"])
+    snelheid_kms = float(asteroid["close_approach_data"][0]["relative_velocity"]["kilometers_per_second"])
+    gevaarlijk = "Ja" if asteroid["is_potentially_hazardous_asteroid"] else "Nee"
+    return naam, diameter_min, diameter_max, snelheid_kmu, snelheid_kms, gevaarlijk
+
+# ------------------------------------- Functies voor cachebeheer en data-opslag ------------------------------------- #
+# De cache bestaat uit één set bestanden per dag, net zoals de NASA-feed de data per dag groepeert. Zo hoeven bij een
+# verversing alleen de dagen opgehaald te worden die nog ontbreken of nog konden veranderen.
+# Per dag bewaren we alleen de velden die de app gebruikt, als kolommen (zie kolom_opslag.py):
+# files/neo/JJJJ-MM-DD.<versie>.npy en .namen. In files/neo/index.json staat per dag de ophaaltijd en de versie.
+# Een verversing schrijft altijd nieuwe bestanden en vervangt daarna in één keer de index. Wie de cache op dat moment
+# leest (of nog gemapt heeft) houdt zo de oude, complete versie; een half geschreven dag is nooit zichtbaar.
+CACHE_MAP = os.path.join("files", "neo")
+# Meerdere processen kunnen dezelfde cache gebruiken. Er ververst er maar één tegelijk (zie write_cache()),
+# de rest wacht op dat slot en vindt daarna de verse dagen in de index, zonder zelf NASA te vragen.
+# Wacht een proces langer dan VERVERS_SLOT_TIMEOUT_S, dan gebruikt het de bestaande cache.
+VERVERS_SLOT_TIMEOUT_S = 300
+
+# Beschermt het wisselen van de index tegen gelijktijdig lezen binnen dit proces (de verversing loopt in een thread)
+_cache_lock = threading.RLock()
+
+def get_cache_path(datum, versie=None):
+    """
+    Geeft het pad (zonder extensie) naar de cachebestanden van één dag en zorgt dat de map bestaat
+    """
+    os.makedirs(CACHE_MAP, exist_ok=True)
+    return os.path.join(CACHE_MAP, f"{datum}.{versie}" if versie else datum)
+
+def get_slot_path():
+    """
+    Geeft het pad naar het slotbestand van de verversing
+    """
+    os.makedirs(CACHE_MAP, exist_ok=True)
+    return os.path.join(CACHE_MAP, "verversing.lock")
+
+def get_index_path():
+    """
+    Geeft het pad naar de index met de ophaaltijd per dag
+    """
+    os.makedirs(CACHE_MAP, exist_ok=True)
+    return os.path.join(CACHE_MAP, "index.json")
+
+def read_index():
+    """
+    Leest de index {datum: {"opgehaald_op": ophaaltijd, "versie": versie}}, anders lege dict
+    """
+    try:
+        with open(get_index_path(), 'r') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError:
+        toon_bestand_error()
+        return {}
+
+def dag_versies(start_datum=None, eind_datum=None):
+    """
+    Geeft {datum: versie} van de dagen in het venster die in de cache staan.
+    Oudere caches hebben per dag alleen de ophaaltijd, die dient dan als versie.
+    """
+    with _cache_lock:
+        index = read_index()
+    return {
+        datum: index[datum] if isinstance(index[datum], str) else index[datum]["versie"]
+        for datum in get_cache_venster(start_datum, eind_datum) if datum in index
+    }
+
+def read_shard(datum, index=None):
+    """
+    Leest de (memory-mapped) kolommen van één dag, of None als die dag (nog) niet (goed) in de cache staat
+    """
+    index = read_index() if index is None else index
+    if datum not in index:
+        return None
+    regel = index[datum]
+    # Oudere caches hadden per dag alleen de ophaaltijd en bestanden zonder versie
+    if isinstance(regel, str):
+        regel = {"opgehaald_op": regel, "versie": None}
+    try:
+        kolommen = lees_kolommen(get_cache_path(datum, regel["versie"]))
+    except ValueError:
+        toon_bestand_error()
+        return None
+    if kolommen is None:
+        return None
+    tel("neo_cache_bytes_gemapt", kolommen["records"].nbytes + kolommen["naam"].blok.nbytes)
+    return {"datum": datum, "opgehaald_op": regel["opgehaald_op"], "kolommen": kolommen}
+
+def write_shards(per_dag, tijd):
+    """
+    Ingest-stap: schrijft per dag de kolommen (of een lijst objecten, die eerst omgezet wordt) weg als nieuwe versie.
+    Pas als alle dagen geschreven zijn wordt de index in één keer vervangen, daarna worden de oude versies opgeruimd.
+    """
+    versie = format(time.time_ns(), "x")
+    for datum, dag in per_dag.items():
+        kolommen = objecten_naar_kolommen(dag) if isinstance(dag, list) else dag
+        schrijf_kolommen(get_cache_path(datum, versie), kolommen)
+
+    with _cache_lock:
+        index = read_index()
+        for datum in per_dag:
+            index[datum] = {"opgehaald_op": tijd, "versie": versie}
+        with atomair_schrijven(get_index_path()) as file:
+            json.dump(index, file, indent=4)
+        ruim_oude_versies_op(per_dag, versie)
+    vul_historie_aan(index)
+
+def vul_historie_aan(index=None):
+    """
+    Zet de dagen uit de cache die nog niet (in deze versie) in de historie staan erbij (zie neo_historie.py).
+    Zo komt ook een cache van vóór de historie er in één keer in.
+    """
+    index = read_index() if index is None else index
+    historie = get_historie()
+    bekend = historie.versies()
+    for datum, regel in sorted(index.items()):
+        versie = None if isinstance(regel, str) else regel["versie"]
+        if datum in bekend and bekend[datum] == versie:
+            continue
+        shard = read_shard(datum, index)
+        if shard is not None:
+            historie.voeg_toe(datum, versie, shard["kolommen"], shard["opgehaald_op"])
+
+def ruim_oude_versies_op(dagen, versie):
+    """
+    Verwijdert de bestanden van eerdere versies van deze dagen.
+    Lukt dat niet (op Windows kan een gemapt bestand niet weg), dan gebeurt het bij een volgende verversing.
+    """
+    huidige = {f"{datum}.{versie}" for datum in dagen}
+    for bestand in os.listdir(CACHE_MAP):
+        stam, extensie = os.path.splitext(bestand)
+        if extensie in (".npy", ".namen") and stam.split(".")[0] in dagen and stam not in huidige:
+            try:
+                os.remove(os.path.join(CACHE_MAP, bestand))
+            except OSError:
+                pass
+
+def is_definitief(shard):
+    """
+    Een dag verandert niet meer als hij is opgehaald nadat die dag voorbij was.
+    """
+    opgehaald = datetime.fromisoformat(shard["opgehaald_op"]).date()
+    return opgehaald > date.fromisoformat(shard["datum"])
+
+def get_cache_venster(start_datum=None, eind_datum=None):
+    """
+    Alle dagen waar de cache over gaat, standaard de laatste 7 dagen.
+    """
+    return dagen_tussen(start_datum or get_start_date(), eind_datum or date.today().isoformat())
+
+def dagen_te_verversen(start_datum=None, eind_datum=None):
+    """
+    Geeft de dagen terug die (opnieuw) bij NASA opgehaald moeten worden:
+    dagen die ontbreken, en dagen die nog niet definitief zijn en niet vandaag al zijn opgehaald.
+    """
+    vandaag = date.today()
+    with _cache_lock:
+        index = read_index()
+        shards = {datum: read_shard(datum, index) for datum in get_cache_venster(start_datum, eind_datum)}
+    te_verversen = []
+    for datum, shard in shards.items():
+        if shard is None:
+            tel("neo_cache_misses")
+            te_verversen.append(datum)
+        elif not is_definitief(shard) and datetime.fromisoformat(shard["opgehaald_op"]).date() != vandaag:
+            tel("neo_cache_verlopen")
+            te_verversen.append(datum)
+        else:
+            tel("neo_cache_hits")
+    return te_verversen
+
+@gemeten("read_kolommen")
+def read_kolommen(start_datum=None, eind_datum=None):
+    """
+    Leest de dagen uit de cache als kolommen en voegt ze samen op NEO id.
+    Standaard de laatste 7 dagen, maar oudere dagen blijven bewaard en kunnen ook gelezen worden.
+
+    :return: (kolommen, timestamp van de laatste verversing), of (None, None) als er niets in de cache staat.
+    """
+    with _cache_lock:
+        index = read_index()
+        shards = [read_shard(datum, index) for datum in get_cache_venster(start_datum, eind_datum)]
+    shards = [shard for shard in shards if shard is not None]
+    if not shards:
+        return None, None
+    kolommen = voeg_kolommen_samen([shard["kolommen"] for shard in shards])
+    return kolommen, max(shard["opgehaald_op"] for shard in shards)
+
+@gemeten("read_cache")
+def read_cache(start_datum=None, eind_datum=None):
+    """
+    Leest de cache als lijst met (uitgedunde) NASA-objecten, anders lege dict.
+    Sneller is read_kolommen(), dit is er voor code die met losse objecten werkt en voor de JSON-export.
+    """
+    kolommen, timestamp = read_kolommen(start_datum, eind_datum)
+    if kolommen is None:
+        return {}
+    return {
+        "objecten": [kolommen_naar_object(kolommen, i) for i in range(len(kolommen["records"]))],
+        "timestamp": timestamp
+    }
+
+# Kolommen en zoekindex van de laatst geladen cache, zodat die maar één keer per verversing opgebouwd worden
+_geladen = {}
+
+def laad_neo_data(start_datum=None, eind_datum=None):
+    """
+    Geeft de kolommen uit de cache met een zoekindex op ID en naam (zie zoekindex.py).
+    Beide worden één keer per data-load opgebouwd en hergebruikt tot de cache (index.json) verandert.
+
+    :return: (kolommen, zoekindex), of (None, None) als er niets in de cache staat.
+    """
+    try:
+        versie = os.path.getmtime(get_index_path())
+    except FileNotFoundError:
+        return None, None
+    venster = get_cache_venster(start_datum, eind_datum)
+    sleutel = (venster[0], venster[-1], versie)
+    if _geladen.get("sleutel") != sleutel:
+        kolommen, _ = read_kolommen(start_datum, eind_datum)
+        index = None if kolommen is None else Zoekindex(kolommen["naam"], kolommen["id"].tolist())
+        _geladen.update({"sleutel": sleutel, "kolommen": kolommen, "index": index})
+    return _geladen["kolommen"], _geladen["index"]
+
+def export_cache(pad=os.path.join("files", "nabije_asteroid.json"), start_datum=None, eind_datum=None):
+    """
+    Exporteert de cache naar een JSON-bestand in het oude formaat ({"objecten": [...], "timestamp": ...}),
+    zoals read_cache() het geeft. Zie ook 'python astro_impact.py export'.
+
+    :return: Het aantal geëxporteerde asteroïden, of None als de cache (voor deze dagen) leeg is.
+    """
+    kolommen, timestamp = read_kolommen(start_datum, eind_datum)
+    if kolommen is None:
+        return None
+    exporteer_json(pad, kolommen, timestamp)
+    return len(kolommen["id"])
+
+@gemeten("write_cache")
+def write_cache(start_datum=None, eind_datum=None, stil=False):
+    """
+    Haalt verse data op voor de dagen die ontbreken of nog konden veranderen en schrijft die per dag weg.
+    Alleen het proces met het verversingsslot haalt op; een ander proces wacht en ziet daarna dat de dagen er al zijn.
+
+    :param stil: True om niets te printen, voor een verversing op de achtergrond terwijl het menu al in beeld is.
+    """
+    slot = Bestandsslot(get_slot_path())
+    if not slot.verkrijg(timeout=VERVERS_SLOT_TIMEOUT_S):
+        tel("neo_cache_slot_timeouts")
+        if not stil:
+            cprint("Een ander proces ververst de cache nog, de bestaande cache blijft in gebruik.", c="rB")
+        return
+    try:
+        # Had een ander proces het slot, dan heeft dat de dagen intussen misschien al opgehaald
+        dagen = dagen_te_verversen(start_datum, eind_datum)
+        if not dagen:
+            tel("neo_cache_al_actueel")
+            return
+        per_dag, tijd = refresh_data(dagen)
+        if per_dag is None:
+            if not stil:
+                cprint("De NASA-data kon niet worden opgehaald, de bestaande cache blijft in gebruik.", c="rB")
+            return
+        write_shards(per_dag, tijd)
+    finally:
+        slot.geef_vrij()
+    if not stil:
+        cprint(f"Cache is bijgewerkt op {datetime.fromisoformat(tijd)} ({len(per_dag)} dag(en) opgehaald)", c="g")
+
+# ---------------------------------------------- Verversen op de achtergrond ----------------------------------------- #
+# Stale-while-revalidate: de bestaande cache wordt meteen gebruikt en de verversing loopt in een thread.
+# Per datumvenster loopt er hooguit één verversing; wie er tijdens het ophalen nog een vraagt krijgt dezelfde thread.
+_verversingen = {}
+_verversingen_lock = threading.Lock()
+
+def start_verversing(start_datum=None, eind_datum=None, stil=True):
+    """
+    Start write_cache() in een achtergrondthread, of geeft de verversing terug die al loopt.
+
+    :return: De thread van de verversing.
+    """
+    sleutel = (start_datum, eind_datum)
+    with _verversingen_lock:
+        verversing = _verversingen.get(sleutel)
+        if verversing is not None and verversing.is_alive():
+            tel("neo_cache_verversing_hergebruikt")
+            return verversing
+        verversing = threading.Thread(target=write_cache, args=(start_datum, eind_datum, stil),
+                                      name="neo-verversing", daemon=True)
+        _verversingen[sleutel] = verversing
+        verversing.start()
+        tel("neo_cache_achtergrond_verversingen")
+        return verversing
+
+def ververs_cache(start_datum=None, eind_datum=None, achtergrond=True):
+    """
+    Zorgt dat de cache (op den duur) actueel is zonder de gebruiker te laten wachten:
+    - is alles actueel, dan gebeurt er niets,
+    - staat er al data in de cache, dan wordt die gebruikt en loopt de verversing op de achtergrond,
+    - is de cache nog leeg (of achtergrond=False), dan wordt er gewacht tot de data binnen is.
+
+    :return: De thread van de verversing, of None als de cache al actueel was.
+    """
+    if not dagen_te_verversen(start_datum, eind_datum):
+        return None
+    if achtergrond and read_kolommen(start_datum, eind_datum)[0] is not None:
+        return start_verversing(start_datum, eind_datum)
+    cprint("Je cache is niet compleet of ouder dan een dag, de ontbrekende dagen worden opgehaald", c="rB")
+    verversing = start_verversing(start_datum, eind_datum, stil=False)
+    verversing.join()
+    return verversing
+
+def refresh_data(dagen):
+    """
+    Haalt de nieuwste near-earth object data op uit de NASA API voor de opgegeven dagen en koppelt daar een
+    timestamp aan. De dagen worden in vensters van maximaal 7 dagen tegelijk opgehaald.
+    De feed wordt gestreamd: elke asteroïde gaat meteen de kolommen van zijn dag in (zie KolommenBouwer), zodat het
+    antwoord nooit als geheel (bytes, dicts én lijst) in het geheugen staat.
+
+    :return: ({datum: kolommen}, timestamp), of (None, timestamp) als het ophalen mislukte.
+    """
+    bouwers = {dag: KolommenBouwer() for dag in dagen}
+
+    def verwerk(datum, asteroid):
+        # Elk venster vult alleen zijn eigen dagen, de threads zitten elkaar dus niet in de weg
+        bouwer = bouwers.get(datum)
+        if bouwer is not None:
+            bouwer.voeg_toe(asteroid)
+
+    gelukt = haal_dagen_op(get_api_key(), dagen, verwerk=verwerk) is not None
+    tijd = time_stamp()
+    if not gelukt:
+        return None, tijd
+    return {datum: bouwer.kolommen() for datum, bouwer in bouwers.items()}, tijd
+
+def time_stamp():
+    """
+    Geeft een datum-timestamp terug voor controle van cache geldigheid.
+    """
+    return datetime.now().isoformat(timespec="minutes")
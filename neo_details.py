@@ -0,0 +1,183 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor          # Veel losse objecten tegelijk ophalen
+from datetime import date
+
+from cprint import cprint                                   # Printen in kleurtjes
+from bestandsslot import atomair_schrijven
+from instrumentatie import gemeten, tel
+from api_client import dun_neo_uit, get_api_key, haal_neo_op, MAX_LOOKUP_WORKERS
+from kolom_opslag import kolommen_naar_object, objecten_naar_kolommen
+
+# De feed geeft per asteroïde alleen de nadering binnen het gevraagde venster. De lookup-API (/neo/<id>) geeft alle
+# naderingen (ook ver in het verleden en de toekomst) en de baangegevens. Deze module laadt die details voor een hele
+# set objecten tegelijk, met hooguit MAX_LOOKUP_WORKERS verzoeken tegelijk.
+#
+# Elk object wordt los bewaard in files/neo_details/<id>.json, met zijn eigen ophaaltijd. Een object wordt pas
+# opnieuw opgehaald als zijn eigen kopie ouder is dan DETAILS_TTL_S, zodat bij een nieuwe selectie alleen de
+# objecten opgehaald worden die nog ontbreken. Lukt ophalen niet, dan wordt een oude kopie gewoon gebruikt.
+DETAILS_MAP = os.path.join("files", "neo_details")
+# Baangegevens en naderingen veranderen alleen bij een nieuwe baanbepaling, een week is ruim actueel genoeg
+DETAILS_TTL_S = 7 * 24 * 60 * 60
+
+# Van de baangegevens bewaren we alleen deze velden
+BAAN_VELDEN = (
+    "orbit_id",
+    "orbit_determination_date",
+    "eccentricity",
+    "semi_major_axis",
+    "inclination",
+    "perihelion_distance",
+    "aphelion_distance",
+    "orbital_period",
+)
+
+# Keuzes voor kies_nadering(): welke nadering van een object er voor de simulatie gebruikt wordt
+NADERINGEN = ("dichtstbij", "snelst", "volgende")
+
+# Details die dit proces al gelezen heeft: {id: (ophaaltijd, object)}
+_geheugen = {}
+_geheugen_lock = threading.Lock()
+
+# -------------------------------------------------- Opslag per object ----------------------------------------------- #
+def get_details_path(neo_id):
+    os.makedirs(DETAILS_MAP, exist_ok=True)
+    return os.path.join(DETAILS_MAP, f"{neo_id}.json")
+
+def dun_uit(neo):
+    """
+    Houdt van een lookup-antwoord alleen over wat de app gebruikt, in dezelfde vorm als de objecten uit de feed,
+    plus de baangegevens.
+    """
+    return {**dun_neo_uit(neo), "orbital_data": {veld: neo.get("orbital_data", {}).get(veld) for veld in BAAN_VELDEN}}
+
+def lees_details(neo_id):
+    """Leest de bewaarde details van één object: (ophaaltijd, object), of None."""
+    try:
+        with open(get_details_path(neo_id), 'r') as file:
+            opgeslagen = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return opgeslagen["opgehaald_op"], opgeslagen["object"]
+
+def schrijf_details(neo_id, opgehaald_op, neo):
+    """Schrijft de details van één object via een tijdelijk bestand, zodat een lezer nooit een half bestand ziet."""
+    with atomair_schrijven(get_details_path(neo_id)) as file:
+        json.dump({"opgehaald_op": opgehaald_op, "object": neo}, file)
+
+# ----------------------------------------------------- Laden -------------------------------------------------------- #
+def bewaarde_details(neo_id):
+    """De details uit het geheugen of van schijf: (ophaaltijd, object), of None."""
+    with _geheugen_lock:
+        item = _geheugen.get(neo_id)
+    if item is None:
+        item = lees_details(neo_id)
+        if item is not None:
+            with _geheugen_lock:
+                _geheugen[neo_id] = item
+    return item
+
+def haal_details_op(api_key, neo_id):
+    """Haalt de details van één object op bij NASA en bewaart ze. :return: Het object, of None."""
+    neo = haal_neo_op(api_key, neo_id)
+    if neo is None:
+        return None
+    item = (time.time(), dun_uit(neo))
+    schrijf_details(neo_id, *item)
+    with _geheugen_lock:
+        _geheugen[neo_id] = item
+    return item[1]
+
+@gemeten("laad_details")
+def laad_details(neo_ids, ttl_s=DETAILS_TTL_S, max_workers=MAX_LOOKUP_WORKERS, api_key=None):
+    """
+    Geeft de details (alle naderingen en de baan) van een set objecten.
+    Alleen objecten die nog niet bewaard zijn of waarvan de eigen kopie ouder is dan ttl_s worden opgehaald,
+    met hooguit max_workers verzoeken tegelijk.
+
+    :return: Dict {id: object}. Objecten die NASA niet kent of die niet opgehaald konden worden ontbreken.
+    """
+    neo_ids = list(dict.fromkeys(str(neo_id) for neo_id in neo_ids))
+    nu = time.time()
+    details = {}
+    ophalen = []
+    for neo_id in neo_ids:
+        item = bewaarde_details(neo_id)
+        if item is None:
+            tel("neo_details_misses")
+            ophalen.append(neo_id)
+            continue
+        # Ook een verlopen kopie gaat er alvast in, die blijft staan als ophalen mislukt
+        details[neo_id] = item[1]
+        if nu - item[0] > ttl_s:
+            tel("neo_details_verlopen")
+            ophalen.append(neo_id)
+        else:
+            tel("neo_details_hits")
+
+    if ophalen:
+        api_key = api_key or get_api_key()
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(ophalen))),
+                                thread_name_prefix="neo-details") as pool:
+            opgehaald = list(pool.map(lambda neo_id: haal_details_op(api_key, neo_id), ophalen))
+        mislukt = 0
+        for neo_id, neo in zip(ophalen, opgehaald):
+            if neo is not None:
+                details[neo_id] = neo
+            else:
+                mislukt += 1
+        if mislukt:
+            cprint(f"Van {mislukt} van de {len(ophalen)} asteroïden konden de details niet worden opgehaald.", c="y")
+    return details
+
+# --------------------------------------------------- Naderingen ----------------------------------------------------- #
+def kies_nadering(neo, criterium="dichtstbij", lichaam="Earth"):
+    """
+    Geeft een kopie van het object met de gekozen nadering van de aarde vooraan in close_approach_data,
+    zodat extract_asteroide_data() en de berekeningen die nadering gebruiken:
+    - "dichtstbij": de kleinste afstand,
+    - "snelst": de hoogste snelheid,
+    - "volgende": de eerste nadering vanaf vandaag (of de laatste als er geen meer komt).
+    Heeft het object geen naderingen van de aarde, dan blijft het ongewijzigd.
+    """
+    if criterium not in NADERINGEN:
+        raise ValueError(f"Kies een nadering uit: {', '.join(NADERINGEN)}")
+    naderingen = [nadering for nadering in neo["close_approach_data"] if nadering.get("orbiting_body") == lichaam]
+    if not naderingen:
+        return neo
+    if criterium == "dichtstbij":
+        gekozen = min(naderingen, key=lambda nadering: float(nadering["miss_distance"]["kilometers"]))
+    elif criterium == "snelst":
+        gekozen = max(naderingen,
+                      key=lambda nadering: float(nadering["relative_velocity"]["kilometers_per_second"]))
+    else:
+        vandaag = date.today().isoformat()
+        komend = [nadering for nadering in naderingen if nadering["close_approach_date"] >= vandaag]
+        gekozen = min(komend or naderingen[-1:], key=lambda nadering: nadering["close_approach_date"])
+    return {**neo, "close_approach_data": [gekozen] + [nadering for nadering in neo["close_approach_data"]
+                                                       if nadering is not gekozen]}
+
+def object_met_nadering(neo, criterium="dichtstbij", **kwargs):
+    """
+    Hetzelfde als kolommen_met_nadering(), maar voor één object (de simulatie in het menu en /simulatie).
+    Zonder details (NASA kent het object niet of ophalen lukt niet) blijft de nadering uit de feed staan.
+    """
+    if criterium not in NADERINGEN:
+        raise ValueError(f"Kies een nadering uit: {', '.join(NADERINGEN)}")
+    details = laad_details([neo["id"]], **kwargs)
+    return kies_nadering(details[neo["id"]], criterium) if neo["id"] in details else neo
+
+def kolommen_met_nadering(kolommen, rijen, criterium="dichtstbij", **kwargs):
+    """
+    Nieuwe kolommen voor de gekozen rijen, met per asteroïde de gekozen nadering uit de details in plaats van de
+    nadering uit de feed. Asteroïden zonder details houden hun nadering uit de feed.
+    Extra argumenten gaan naar laad_details().
+    """
+    objecten = [kolommen_naar_object(kolommen, rij) for rij in rijen]
+    details = laad_details([neo["id"] for neo in objecten], **kwargs)
+    return objecten_naar_kolommen([
+        kies_nadering(details[neo["id"]], criterium) if neo["id"] in details else neo for neo in objecten
+    ])
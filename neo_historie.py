@@ -0,0 +1,168 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import atexit
+import os
+import sqlite3 # Ingebouwde database met indexen, zonder extra packages
+import threading
+
+import numpy as np # Zoekresultaten als kolommen, net als de cache
+
+from instrumentatie import gemeten, tel
+from kolom_opslag import NEO_DTYPE, maak_kolommen
+
+# Geschiedenis van alle naderingen die ooit zijn opgehaald, in files/neo_historie.sqlite.
+# De cache in files/neo/ is er om de laatste dagen snel te tonen; deze database groeit met elke verversing mee, zodat
+# ook over maanden terug gezocht kan worden ("alle gevaarlijke objecten die dichterbij kwamen dan 1 miljoen km")
+# met indexen op id, datum, afstand, diameter en gevaar in plaats van de hele lijst door te lopen.
+# Per dag wordt bijgehouden welke versie van de cache erin staat, zo wordt elke dag precies één keer ingelezen.
+HISTORIE_PAD = os.path.join("files", "neo_historie.sqlite")
+
+# Kolommen waarop gesorteerd mag worden (de naam komt in de SQL, dus alleen deze)
+SORTEERBAAR = ("datum", "afstand_km", "diameter", "snelheid_kms", "neo_id")
+
+# ------------------------------------------------------ Opslag ------------------------------------------------------ #
+class NeoHistorie:
+    """
+    De historie-database. Veilig om vanuit meerdere threads te gebruiken (de verversing schrijft op de achtergrond).
+    """
+    def __init__(self, pad=HISTORIE_PAD):
+        os.makedirs(os.path.dirname(pad) or ".", exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(pad, check_same_thread=False, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS naderingen (
+                neo_id INTEGER NOT NULL,
+                datum TEXT NOT NULL,
+                naam TEXT NOT NULL,
+                diameter_min REAL NOT NULL,
+                diameter_max REAL NOT NULL,
+                diameter REAL NOT NULL,
+                snelheid_kmu REAL NOT NULL,
+                snelheid_kms REAL NOT NULL,
+                afstand_km REAL NOT NULL,
+                gevaarlijk INTEGER NOT NULL,
+                opgehaald_op TEXT NOT NULL,
+                PRIMARY KEY (neo_id, datum)
+            );
+            CREATE INDEX IF NOT EXISTS naderingen_datum ON naderingen (datum);
+            CREATE INDEX IF NOT EXISTS naderingen_afstand ON naderingen (afstand_km);
+            CREATE INDEX IF NOT EXISTS naderingen_diameter ON naderingen (diameter);
+            CREATE INDEX IF NOT EXISTS naderingen_gevaarlijk ON naderingen (gevaarlijk, datum);
+            CREATE TABLE IF NOT EXISTS dagen (
+                datum TEXT PRIMARY KEY,
+                versie TEXT
+            );
+        """)
+        self.db.commit()
+
+    def versies(self):
+        """Geeft {datum: versie} van de dagen die al in de historie staan."""
+        with self.lock:
+            return dict(self.db.execute("SELECT datum, versie FROM dagen"))
+
+    @gemeten("historie_voeg_toe")
+    def voeg_toe(self, datum, versie, kolommen, opgehaald_op):
+        """
+        Zet de kolommen van één dag (zie kolom_opslag.py) in de historie. Een nadering die er al in stond
+        (zelfde id en datum) wordt vervangen door de nieuwere.
+        """
+        rijen = list(zip(
+            kolommen["id"].tolist(),
+            [str(dag) for dag in kolommen["datum"]],
+            list(kolommen["naam"]),
+            kolommen["diameter_min"].tolist(),
+            kolommen["diameter_max"].tolist(),
+            ((kolommen["diameter_min"] + kolommen["diameter_max"]) / 2).tolist(),
+            kolommen["snelheid_kmu"].tolist(),
+            kolommen["snelheid_kms"].tolist(),
+            kolommen["afstand_km"].tolist(),
+            kolommen["gevaarlijk"].astype(int).tolist(),
+            [opgehaald_op] * len(kolommen["id"]),
+        ))
+        with self.lock:
+            with self.db:
+                self.db.executemany("INSERT OR REPLACE INTO naderingen VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                    rijen)
+                self.db.execute("INSERT OR REPLACE INTO dagen VALUES (?, ?)", (datum, versie))
+        tel("historie_naderingen_geschreven", len(rijen))
+
+    @gemeten("historie_zoek")
+    def zoek(self, van=None, tot=None, gevaarlijk=None, max_afstand_km=None, min_diameter=None, max_diameter=None,
+             neo_id=None, sorteer="datum", aflopend=False, limiet=None):
+        """
+        Zoekt naderingen in de historie. Alle filters zijn optioneel en worden gecombineerd.
+
+        :param van: Eerste datum (JJJJ-MM-DD), tot en met 'tot'.
+        :param gevaarlijk: True/False om alleen (niet) potentieel gevaarlijke objecten te krijgen.
+        :param min_diameter: Grenzen voor de gemiddelde diameter in meters.
+        :param sorteer: Eén van SORTEERBAAR.
+        :return: Kolommen in hetzelfde formaat als neo_cache.read_kolommen(), één rij per nadering.
+        """
+        if sorteer not in SORTEERBAAR:
+            raise ValueError(f"Sorteren kan alleen op {', '.join(SORTEERBAAR)}")
+        voorwaarden, waarden = [], []
+        for voorwaarde, waarde in (
+            ("datum >= ?", van),
+            ("datum <= ?", tot),
+            ("gevaarlijk = ?", None if gevaarlijk is None else int(gevaarlijk)),
+            ("afstand_km <= ?", max_afstand_km),
+            ("diameter >= ?", min_diameter),
+            ("diameter <= ?", max_diameter),
+            ("neo_id = ?", None if neo_id is None else int(neo_id)),
+        ):
+            if waarde is not None:
+                voorwaarden.append(voorwaarde)
+                waarden.append(waarde)
+        sql = ("SELECT neo_id, naam, diameter_min, diameter_max, snelheid_kmu, snelheid_kms, afstand_km, datum, "
+               "gevaarlijk FROM naderingen")
+        if voorwaarden:
+            sql += " WHERE " + " AND ".join(voorwaarden)
+        sql += f" ORDER BY {sorteer} {'DESC' if aflopend else 'ASC'}, neo_id"
+        if limiet is not None:
+            sql += " LIMIT ?"
+            waarden.append(int(limiet))
+        with self.lock:
+            rijen = self.db.execute(sql, waarden).fetchall()
+        tel("historie_naderingen_gelezen", len(rijen))
+        return rijen_naar_kolommen(rijen)
+
+    def aantal(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM naderingen").fetchone()[0]
+
+    def sluit(self):
+        with self.lock:
+            self.db.close()
+
+def rijen_naar_kolommen(rijen):
+    """Zet de rijen van NeoHistorie.zoek() om naar kolommen (zie kolom_opslag.py)."""
+    records = np.zeros(len(rijen), dtype=NEO_DTYPE)
+    if not rijen:
+        return maak_kolommen(records, np.zeros(0, dtype=np.uint8))
+    neo_ids, namen, diameter_min, diameter_max, snelheid_kmu, snelheid_kms, afstand, datums, gevaarlijk = zip(*rijen)
+    namen = [naam.encode("utf-8") for naam in namen]
+    lengtes = np.fromiter((len(naam) for naam in namen), dtype=np.int64, count=len(namen))
+    records["naam_eind"] = np.cumsum(lengtes)
+    records["naam_start"] = records["naam_eind"] - lengtes
+    records["id"] = neo_ids
+    records["diameter_min"] = diameter_min
+    records["diameter_max"] = diameter_max
+    records["snelheid_kmu"] = snelheid_kmu
+    records["snelheid_kms"] = snelheid_kms
+    records["afstand_km"] = afstand
+    records["datum"] = datums
+    records["gevaarlijk"] = gevaarlijk
+    return maak_kolommen(records, np.frombuffer(b"".join(namen), dtype=np.uint8))
+
+# Eén open database per pad (een andere werkmap betekent een andere 'files/' map)
+_historie = {}
+_historie_lock = threading.Lock()
+
+def get_historie(pad=HISTORIE_PAD):
+    """Geeft de gedeelde historie-database van dit proces (en maakt hem de eerste keer aan)."""
+    sleutel = os.path.abspath(pad)
+    with _historie_lock:
+        if sleutel not in _historie:
+            _historie[sleutel] = NeoHistorie(pad)
+            atexit.register(_historie[sleutel].sluit)
+        return _historie[sleutel]
@@ -0,0 +1,146 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import numpy as np # Trekkingen in grote batches in plaats van één voor één
+
+from impact_berekening import (                             # Dezelfde formules als de gewone berekening
+    asteroiden_naar_arrays,
+    landen_naar_arrays,
+    bereken_magnitude,
+    bereken_slachtoffers,
+    HIROSHIMA_JOULES,
+    HIROSHIMA_OPPERVLAK,
+)
+
+# ----------------------------------------- Aannames voor de verdelingen --------------------------------------------- #
+# Diameter: NASA geeft een min/max (afhankelijk van de onbekende albedo). We trekken log-uniform tussen die twee.
+# Dichtheid: log-normaal rond 2600 kg/m³ (tussen koolstofrijke en steenachtige asteroïden), begrensd op 1000–8000.
+DICHTHEID_MEDIAAN = 2600
+DICHTHEID_SIGMA = 0.35
+DICHTHEID_MIN = 1000
+DICHTHEID_MAX = 8000
+# Snelheid: normaal verdeeld rond de NASA-waarde met 5% spreiding
+SNELHEID_SPREIDING = 0.05
+
+# Standaard aantal trekkingen per asteroïde en hoeveel getallen er maximaal tegelijk in het geheugen staan
+AANTAL_TREKKINGEN = 1_000_000
+CHUNK_GROOTTE = 1_000_000
+
+# De energie wordt bijgehouden in een histogram over log10(joules), zo blijft het geheugen begrensd
+# ongeacht het aantal trekkingen. 0.005 dex per bak is ruim nauwkeurig genoeg.
+LOG_ENERGIE_MIN = 0.0
+LOG_ENERGIE_MAX = 32.0
+AANTAL_BAKKEN = 6400
+
+# -------------------------------------------------- Hulpfuncties ---------------------------------------------------- #
+def geldige_diameters(diameter_min, diameter_max):
+    """
+    Controleert de diameters voor de log-uniforme trekking: log(0) zou -inf geven en alle trekkingen bederven.
+    Een ontbrekende (0) minimale diameter geeft geen spreiding, dan wordt de maximale gebruikt.
+
+    :raises ValueError: Als een maximale diameter niet groter dan 0 is.
+    """
+    if np.any(~(diameter_max > 0)):
+        raise ValueError("de maximale diameter moet groter dan 0 zijn")
+    diameter_min = np.where(diameter_min > 0, diameter_min, diameter_max)
+    return diameter_min, diameter_max
+
+def trek_energie(rng, diameter_min, diameter_max, snelheid_kms, aantal):
+    """
+    Trekt 'aantal' impactenergieën (joules) per asteroïde, vorm (n_asteroiden, aantal).
+    Zelfde formule als impact_berekening.bereken_energie(), maar met onzekere diameter, dichtheid en snelheid.
+    """
+    n = len(diameter_min)
+    log_min = np.log(diameter_min)[:, None]
+    log_max = np.log(diameter_max)[:, None]
+    diameter = np.exp(log_min + (log_max - log_min) * rng.random((n, aantal)))
+    dichtheid = np.clip(DICHTHEID_MEDIAAN * np.exp(DICHTHEID_SIGMA * rng.standard_normal((n, aantal))),
+                        DICHTHEID_MIN, DICHTHEID_MAX)
+    snelheid_ms = snelheid_kms[:, None] * 1000 * (1 + SNELHEID_SPREIDING * rng.standard_normal((n, aantal)))
+
+    massa = (4 / 3) * np.pi * (diameter / 2) ** 3 * dichtheid
+    return 0.5 * massa * snelheid_ms ** 2
+
+def kwantielen_uit_histogram(histogram, kwantielen):
+    """
+    Leest kwantielen af uit de histogrammen (één rij per asteroïde) met lineaire interpolatie binnen een bak.
+
+    :return: log10(joules) per asteroïde per kwantiel, vorm (n_asteroiden, len(kwantielen)).
+    """
+    breedte = (LOG_ENERGIE_MAX - LOG_ENERGIE_MIN) / AANTAL_BAKKEN
+    cumulatief = np.cumsum(histogram, axis=1)
+    totaal = cumulatief[:, -1:]
+    uitkomst = np.empty((len(histogram), len(kwantielen)))
+    for k, kwantiel in enumerate(kwantielen):
+        doel = totaal[:, 0] * kwantiel / 100
+        bak = (cumulatief < doel[:, None]).sum(axis=1)
+        bak = np.minimum(bak, AANTAL_BAKKEN - 1)
+        rijen = np.arange(len(histogram))
+        voor = np.where(bak > 0, cumulatief[rijen, np.maximum(bak - 1, 0)], 0)
+        in_bak = np.maximum(histogram[rijen, bak], 1)
+        uitkomst[:, k] = LOG_ENERGIE_MIN + (bak + (doel - voor) / in_bak) * breedte
+    return uitkomst
+
+# ----------------------------------------------- Monte Carlo simulatie ---------------------------------------------- #
+def monte_carlo_impact(asteroiden, landen=None, aantal=AANTAL_TREKKINGEN, seed=None,
+                       kwantielen=(5, 50, 95), chunk_grootte=CHUNK_GROOTTE):
+    """
+    Monte Carlo-versie van de impactberekening: trekt per asteroïde 'aantal' combinaties van diameter, dichtheid en
+    snelheid en geeft de kwantielen (standaard P5/P50/P95) van energie, magnitude en eventueel slachtoffers.
+
+    De trekkingen gebeuren in chunks van maximaal chunk_grootte getallen, over alle asteroïden tegelijk. Van elke
+    chunk blijft alleen een histogram over, dus het geheugen hangt niet af van het aantal trekkingen.
+    Magnitude en slachtoffers stijgen allebei met de energie, dus hun kwantielen volgen direct uit die van de energie.
+
+    :param asteroiden: Lijst met NASA-objecten, of kolommen (zie kolom_opslag.py / asteroiden_naar_arrays()).
+    :param landen: Optioneel de landenlijst (of landen_naar_arrays()), dan worden ook slachtoffers berekend.
+    :param seed: Seed voor de random generator, zodat een uitkomst reproduceerbaar is.
+    :raises ValueError: Als een maximale diameter niet groter dan 0 is (zie geldige_diameters()).
+    :return: Dict met "kwantielen", "joules" en "magnitude" (n_asteroiden × kwantielen) en eventueel
+             "slachtoffers" (n_asteroiden × n_landen × kwantielen).
+    """
+    if not isinstance(asteroiden, dict):
+        asteroiden = asteroiden_naar_arrays(asteroiden)
+    diameter_min = np.asarray(asteroiden["diameter_min"], dtype=np.float64)
+    diameter_max = np.asarray(asteroiden["diameter_max"], dtype=np.float64)
+    diameter_min, diameter_max = geldige_diameters(diameter_min, diameter_max)
+    snelheid_kms = np.asarray(asteroiden["snelheid_kms"], dtype=np.float64)
+    n = len(diameter_min)
+
+    rng = np.random.default_rng(seed)
+    histogram = np.zeros((n, AANTAL_BAKKEN), dtype=np.int64)
+    breedte = (LOG_ENERGIE_MAX - LOG_ENERGIE_MIN) / AANTAL_BAKKEN
+
+    # Hoeveel asteroïden en trekkingen er per chunk passen
+    per_chunk = max(1, min(aantal, chunk_grootte))
+    asteroiden_per_chunk = max(1, chunk_grootte // per_chunk)
+    for start in range(0, n, asteroiden_per_chunk):
+        eind = min(start + asteroiden_per_chunk, n)
+        rijen = np.arange(eind - start)[:, None]
+        gedaan = 0
+        while gedaan < aantal:
+            stap = min(per_chunk, aantal - gedaan)
+            joules = trek_energie(rng, diameter_min[start:eind], diameter_max[start:eind],
+                                  snelheid_kms[start:eind], stap)
+            with np.errstate(divide="ignore"):
+                bak = ((np.log10(joules) - LOG_ENERGIE_MIN) / breedte).astype(np.int64)
+            bak = np.clip(bak, 0, AANTAL_BAKKEN - 1)
+            histogram[start:eind] += np.bincount((rijen * AANTAL_BAKKEN + bak).ravel(),
+                                                 minlength=(eind - start) * AANTAL_BAKKEN
+                                                 ).reshape(eind - start, AANTAL_BAKKEN)
+            gedaan += stap
+
+    joules = 10 ** kwantielen_uit_histogram(histogram, kwantielen)
+    resultaat = {
+        "kwantielen": list(kwantielen),
+        "joules": joules,
+        "magnitude": bereken_magnitude(joules),
+    }
+
+    if landen is not None:
+        if not isinstance(landen, dict):
+            landen = landen_naar_arrays(landen)
+        vernietigd = joules / HIROSHIMA_JOULES * HIROSHIMA_OPPERVLAK
+        _, slachtoffers, _ = bereken_slachtoffers(vernietigd.ravel(), landen["populatie"], landen["oppervlakte"])
+        # (n × k, landen) → (n, landen, k)
+        resultaat["slachtoffers"] = slachtoffers.reshape(n, len(kwantielen), -1).transpose(0, 2, 1)
+
+    return resultaat
@@ -0,0 +1,195 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor          # Het parameterraster over meerdere processen verdelen
+from multiprocessing import shared_memory                   # Invoer en uitkomsten één keer delen, niet per taak
+
+import numpy as np # Alle asteroïden (× landen) per combinatie in één keer
+
+from impact_berekening import (                             # Dezelfde formules als de gewone berekening
+    asteroiden_naar_arrays,
+    landen_naar_arrays,
+    bereken_energie,
+    bereken_magnitude,
+    bereken_slachtoffers,
+    DICHTHEID_STEEN,
+    HIROSHIMA_JOULES,
+    HIROSHIMA_OPPERVLAK,
+    WORLD_POP,
+)
+
+# Parameter-sweeps: "wat als de dichtheid 1500–8000 kg/m³ was, of de snelheid ±20%?"
+# Elke combinatie van dichtheid, snelheidsfactor, diameter-percentiel en inslagpunt wordt voor alle asteroïden
+# (en alle landen) doorgerekend en samengevat tot één rij met SAMENVATTING_VELDEN.
+# De NEO- en landarrays worden één keer in shared memory gezet. De processen krijgen per taak alleen een reeks
+# combinatie-nummers mee en schrijven hun samenvatting direct in een gedeelde uitkomst-array.
+SAMENVATTING_VELDEN = (
+    "joules_mediaan",
+    "joules_max",
+    "magnitude_max",
+    "slachtoffers_gemiddeld",      # Gemiddeld over alle (asteroïde, land) paren, of alle asteroïden bij inslagpunt
+    "slachtoffers_max",
+    "fractie_land_vernietigd",     # Deel van de paren waarbij het hele land verdwijnt (NaN bij een inslagpunt)
+)
+PARAMETER_VELDEN = ("dichtheid", "snelheid_factor", "diameter_percentiel", "breedte", "lengte")
+# Zoveel asteroïden tegelijk tegen alle landen, zo blijft het geheugen per proces begrensd
+ASTEROIDEN_PER_BLOK = 1024
+# Aantal taken per proces, iets meer dan één zodat snelle processen werk van trage overnemen
+TAKEN_PER_PROCES = 4
+
+# ------------------------------------------------- Shared memory ---------------------------------------------------- #
+def deel_arrays(arrays):
+    """
+    Zet float64-arrays achter elkaar in één blok shared memory.
+
+    :return: (SharedMemory, layout) met layout {naam: (offset, vorm)}, zo vindt een ander proces de arrays terug.
+    """
+    arrays = {naam: np.ascontiguousarray(array, dtype=np.float64) for naam, array in arrays.items()}
+    geheugen = shared_memory.SharedMemory(create=True, size=max(1, sum(array.nbytes for array in arrays.values())))
+    layout = {}
+    offset = 0
+    for naam, array in arrays.items():
+        np.ndarray(array.shape, dtype=np.float64, buffer=geheugen.buf, offset=offset)[...] = array
+        layout[naam] = (offset, array.shape)
+        offset += array.nbytes
+    return geheugen, layout
+
+def bekijk_arrays(geheugen, layout):
+    """Geeft de arrays in een blok shared memory terug als views, er wordt niets gekopieerd."""
+    return {naam: np.ndarray(vorm, dtype=np.float64, buffer=geheugen.buf, offset=offset)
+            for naam, (offset, vorm) in layout.items()}
+
+def koppel_geheugen(naam):
+    """
+    Opent een bestaand blok shared memory in een werkproces. Alleen het hoofdproces ruimt het blok op
+    (track=False bestaat pas vanaf Python 3.13; daarvoor delen de werkprocessen de resource tracker van het
+    hoofdproces, dus ook dan blijft het opruimen bij het hoofdproces).
+    """
+    try:
+        return shared_memory.SharedMemory(name=naam, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=naam)
+
+# De gekoppelde arrays per werkproces, gezet door start_werker()
+_werker = {}
+
+def start_werker(naam_invoer, layout_invoer, naam_uitvoer, aantal_combinaties):
+    """Initializer van elk werkproces: koppelt één keer de gedeelde invoer en uitvoer."""
+    _werker["geheugen"] = (koppel_geheugen(naam_invoer), koppel_geheugen(naam_uitvoer))
+    _werker["invoer"] = bekijk_arrays(_werker["geheugen"][0], layout_invoer)
+    _werker["uitvoer"] = np.ndarray((aantal_combinaties, len(SAMENVATTING_VELDEN)), dtype=np.float64,
+                                    buffer=_werker["geheugen"][1].buf)
+
+def werk_taak(bereik):
+    """Rekent een reeks combinaties door in een werkproces."""
+    reken_combinaties(_werker["invoer"], _werker["uitvoer"], *bereik)
+
+# --------------------------------------------------- Berekening ----------------------------------------------------- #
+def reken_combinaties(invoer, uitvoer, start, eind):
+    """
+    Rekent de combinaties start t/m eind-1 door en schrijft per combinatie de samenvatting in 'uitvoer'.
+    """
+    raster = None
+    for rij in range(start, eind):
+        dichtheid, snelheid_factor, percentiel, breedte, lengte = invoer["parameters"][rij]
+        # Diameter-percentiel: 0 = NASA-minimum, 100 = NASA-maximum, 50 = het gemiddelde dat de app standaard gebruikt
+        diameter = invoer["diameter_min"] + percentiel / 100 * (invoer["diameter_max"] - invoer["diameter_min"])
+        joules = bereken_energie(diameter, diameter, invoer["snelheid_kms"] * snelheid_factor, dichtheid)
+        vernietigd = joules / HIROSHIMA_JOULES * HIROSHIMA_OPPERVLAK
+
+        if np.isnan(breedte):
+            # Landenmodel, per blok asteroïden tegen alle landen
+            som = maximum = vernietigde_landen = 0.0
+            for blok in range(0, len(joules), ASTEROIDEN_PER_BLOK):
+                _, slachtoffers, land_vernietigd = bereken_slachtoffers(
+                    vernietigd[blok:blok + ASTEROIDEN_PER_BLOK], invoer["populatie"], invoer["oppervlakte"])
+                # Meer slachtoffers dan de wereldbevolking kan niet, net als in de simulatie in het menu
+                slachtoffers = np.minimum(slachtoffers, WORLD_POP)
+                som += slachtoffers.sum()
+                maximum = max(maximum, slachtoffers.max(initial=0.0))
+                vernietigde_landen += land_vernietigd.sum()
+            paren = max(1, len(joules) * len(invoer["populatie"]))
+            slachtoffers_gemiddeld, slachtoffers_max, fractie = som / paren, maximum, vernietigde_landen / paren
+        else:
+            # Inslagpunt: de mensen die echt binnen de vernietigde oppervlakte wonen (zie bevolkingsraster.py)
+            if raster is None:
+                from bevolkingsraster import laad_bevolkingsraster
+                raster = laad_bevolkingsraster()
+            slachtoffers = raster.slachtoffers(joules, breedte, lengte)
+            slachtoffers_gemiddeld, slachtoffers_max, fractie = slachtoffers.mean(), slachtoffers.max(), np.nan
+
+        uitvoer[rij] = (
+            np.median(joules),
+            joules.max(),
+            bereken_magnitude(joules.max()),
+            slachtoffers_gemiddeld,
+            slachtoffers_max,
+            fractie,
+        )
+
+def verdeel(aantal, delen):
+    """Verdeelt range(aantal) in hooguit 'delen' aaneengesloten (start, eind) stukken van bijna gelijke grootte."""
+    grenzen = np.linspace(0, aantal, min(delen, aantal) + 1).astype(int)
+    return [(int(start), int(eind)) for start, eind in zip(grenzen[:-1], grenzen[1:])]
+
+# ----------------------------------------------------- Sweep -------------------------------------------------------- #
+def sweep(asteroiden, landen, dichtheden=(DICHTHEID_STEEN,), snelheid_factoren=(1.0,), diameter_percentielen=(50,),
+          inslagpunten=(None,), processen=None):
+    """
+    Rekent alle combinaties van de opgegeven parameters door voor alle asteroïden en landen.
+
+    :param asteroiden: Lijst met NASA-objecten, of kolommen (zie kolom_opslag.py / asteroiden_naar_arrays()).
+    :param landen: De landenlijst (of landen_naar_arrays()).
+    :param inslagpunten: (breedte, lengte) tuples voor het bevolkingsraster, of None voor het landenmodel.
+    :param processen: Aantal werkprocessen, standaard het aantal cores. Met 1 wordt er in dit proces gerekend.
+    :return: Structured array met per combinatie de PARAMETER_VELDEN en SAMENVATTING_VELDEN.
+    """
+    if not isinstance(asteroiden, dict):
+        asteroiden = asteroiden_naar_arrays(asteroiden)
+    if not isinstance(landen, dict):
+        landen = landen_naar_arrays(landen)
+    if any(punt is not None for punt in inslagpunten):
+        from bevolkingsraster import laad_bevolkingsraster
+        if laad_bevolkingsraster() is None:
+            raise ValueError("Voor inslagpunten is een bevolkingsraster nodig (zie bevolkingsraster.py)")
+
+    parameters = np.array([
+        (dichtheid, factor, percentiel) + (punt if punt is not None else (np.nan, np.nan))
+        for dichtheid, factor, percentiel, punt in itertools.product(
+            dichtheden, snelheid_factoren, diameter_percentielen, inslagpunten)
+    ], dtype=np.float64).reshape(-1, len(PARAMETER_VELDEN))
+    invoer = {
+        "diameter_min": asteroiden["diameter_min"],
+        "diameter_max": asteroiden["diameter_max"],
+        "snelheid_kms": asteroiden["snelheid_kms"],
+        "populatie": landen["populatie"],
+        "oppervlakte": landen["oppervlakte"],
+        "parameters": parameters,
+    }
+    aantal = len(parameters)
+    processen = max(1, min(processen or os.cpu_count() or 1, aantal))
+
+    if processen == 1:
+        samenvatting = np.empty((aantal, len(SAMENVATTING_VELDEN)))
+        reken_combinaties({naam: np.asarray(array, dtype=np.float64) for naam, array in invoer.items()},
+                          samenvatting, 0, aantal)
+    else:
+        geheugen_invoer, layout = deel_arrays(invoer)
+        geheugen_uitvoer = shared_memory.SharedMemory(create=True, size=max(1, aantal * len(SAMENVATTING_VELDEN) * 8))
+        try:
+            with ProcessPoolExecutor(max_workers=processen, initializer=start_werker,
+                                     initargs=(geheugen_invoer.name, layout, geheugen_uitvoer.name, aantal)) as pool:
+                list(pool.map(werk_taak, verdeel(aantal, processen * TAKEN_PER_PROCES)))
+            samenvatting = np.ndarray((aantal, len(SAMENVATTING_VELDEN)), dtype=np.float64,
+                                      buffer=geheugen_uitvoer.buf).copy()
+        finally:
+            for geheugen in (geheugen_invoer, geheugen_uitvoer):
+                geheugen.close()
+                geheugen.unlink()
+
+    resultaat = np.empty(aantal, dtype=[(veld, np.float64) for veld in PARAMETER_VELDEN + SAMENVATTING_VELDEN])
+    for k, veld in enumerate(PARAMETER_VELDEN):
+        resultaat[veld] = parameters[:, k]
+    for k, veld in enumerate(SAMENVATTING_VELDEN):
+        resultaat[veld] = samenvatting[:, k]
+    return resultaat
@@ -0,0 +1,152 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import atexit
+import hashlib
+import json
+import os
+import sqlite3 # Schijflaag: één bestand, met index op de sleutel, zonder extra packages
+import threading
+import time
+from collections import OrderedDict
+
+from impact_berekening import impact_van_paar
+from instrumentatie import tel
+
+# Cache voor uitkomsten van de simulatie per (asteroïde, land), zodat een scenario dat al eens berekend is direct
+# terugkomt. Er zijn twee lagen: een LRU in het geheugen en een SQLite-bestand in files/ dat bewaard blijft.
+#
+# De sleutel is (NEO id, datum van de nadering, landnaam, MODEL_VERSIE). Bij elke uitkomst wordt ook een
+# vingerafdruk van de invoer bewaard (diameter, snelheid, populatie, oppervlakte). Verandert de NEO-cache of de
+# landdata, dan klopt de vingerafdruk niet meer en wordt de uitkomst opnieuw berekend en overschreven.
+RESULTATEN_PAD = os.path.join("files", "resultaten.sqlite")
+# Ophogen als de formules in impact_berekening.py veranderen, dan tellen oude uitkomsten niet meer mee
+MODEL_VERSIE = 2
+MAX_IN_GEHEUGEN = 4096
+MAX_OP_SCHIJF = 100_000
+
+# -------------------------------------------------- Hulpfuncties ---------------------------------------------------- #
+def sleutel_en_vingerafdruk(asteroid, land):
+    """
+    Geeft de cachesleutel en de vingerafdruk van de invoer voor een asteroïde (NASA-object) en een land
+    ([naam, populatie, oppervlakte, dichtheid]).
+    """
+    nadering = asteroid["close_approach_data"][0]
+    diameter = asteroid["estimated_diameter"]["meters"]
+    sleutel = f'{asteroid["id"]}|{nadering["close_approach_date"]}|{land[0]}|{MODEL_VERSIE}'
+    invoer = (diameter["estimated_diameter_min"], diameter["estimated_diameter_max"],
+              nadering["relative_velocity"]["kilometers_per_second"], land[1], land[2])
+    vingerafdruk = hashlib.sha1(repr(invoer).encode("utf-8")).hexdigest()[:16]
+    return sleutel, vingerafdruk
+
+# ------------------------------------------------ Resultatencache --------------------------------------------------- #
+class Resultatencache:
+    """
+    Twee-laags cache voor impact_van_paar(): eerst het geheugen, dan het SQLite-bestand, pas dan rekenen.
+    Veilig om vanuit meerdere threads te gebruiken (bijv. de webservice).
+    """
+    def __init__(self, pad=RESULTATEN_PAD, max_in_geheugen=MAX_IN_GEHEUGEN, max_op_schijf=MAX_OP_SCHIJF):
+        self.max_in_geheugen = max_in_geheugen
+        self.max_op_schijf = max_op_schijf
+        self.geheugen = OrderedDict()
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(pad) or ".", exist_ok=True)
+        self.db = sqlite3.connect(pad, check_same_thread=False, timeout=30)
+        # WAL: lezers blokkeren niet tijdens het schrijven, ook niet vanuit andere processen
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS resultaten (
+                sleutel TEXT PRIMARY KEY,
+                vingerafdruk TEXT NOT NULL,
+                resultaat TEXT NOT NULL,
+                gebruikt_op REAL NOT NULL
+            )""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS resultaten_gebruikt_op ON resultaten (gebruikt_op)")
+        self.db.commit()
+        # Eén keer tellen bij het openen, daarna bijhouden bij elke nieuwe en verwijderde uitkomst
+        self.aantal_op_schijf = self.db.execute("SELECT COUNT(*) FROM resultaten").fetchone()[0]
+
+    def haal_op(self, asteroid, land, bereken=impact_van_paar):
+        """
+        Geeft de uitkomst van bereken(asteroid, land) uit de cache, of berekent en bewaart hem.
+        """
+        sleutel, vingerafdruk = sleutel_en_vingerafdruk(asteroid, land)
+        with self.lock:
+            item = self.geheugen.get(sleutel)
+            if item is not None and item[0] == vingerafdruk:
+                self.geheugen.move_to_end(sleutel)
+                tel("resultaten_cache_hits_geheugen")
+                return item[1]
+
+            rij = self.db.execute("SELECT vingerafdruk, resultaat FROM resultaten WHERE sleutel = ?",
+                                  (sleutel,)).fetchone()
+            if rij is not None and rij[0] == vingerafdruk:
+                resultaat = json.loads(rij[1])
+                self.db.execute("UPDATE resultaten SET gebruikt_op = ? WHERE sleutel = ?", (time.time(), sleutel))
+                self.db.commit()
+                self.in_geheugen(sleutel, vingerafdruk, resultaat)
+                tel("resultaten_cache_hits_schijf")
+                return resultaat
+
+        # Rekenen buiten de lock, andere threads kunnen intussen gewoon uit de cache lezen
+        tel("resultaten_cache_verlopen" if rij is not None or item is not None else "resultaten_cache_misses")
+        resultaat = bereken(asteroid, land)
+        with self.lock:
+            self.in_geheugen(sleutel, vingerafdruk, resultaat)
+            self.db.execute("INSERT OR REPLACE INTO resultaten VALUES (?, ?, ?, ?)",
+                            (sleutel, vingerafdruk, json.dumps(resultaat), time.time()))
+            if rij is None:
+                self.aantal_op_schijf += 1
+            self.ruim_schijf_op()
+            self.db.commit()
+        return resultaat
+
+    def in_geheugen(self, sleutel, vingerafdruk, resultaat):
+        """Zet een uitkomst in de geheugenlaag, de langst niet gebruikte valt eruit als die vol is."""
+        self.geheugen[sleutel] = (vingerafdruk, resultaat)
+        self.geheugen.move_to_end(sleutel)
+        if len(self.geheugen) > self.max_in_geheugen:
+            self.geheugen.popitem(last=False)
+
+    def ruim_schijf_op(self):
+        """
+        Verwijdert de langst niet gebruikte uitkomsten als er meer dan max_op_schijf op schijf staan.
+        De teller kent alleen de uitkomsten van deze instantie; pas als hij over de grens gaat wordt er echt geteld,
+        dan tellen ook die van andere processen mee.
+        """
+        if self.aantal_op_schijf <= self.max_op_schijf:
+            return
+        self.aantal_op_schijf = self.db.execute("SELECT COUNT(*) FROM resultaten").fetchone()[0]
+        teveel = self.aantal_op_schijf - self.max_op_schijf
+        if teveel > 0:
+            # Meteen wat extra ruimte maken, zodat dit niet bij elke nieuwe uitkomst opnieuw gebeurt
+            teveel += self.max_op_schijf // 10
+            verwijderd = self.db.execute("DELETE FROM resultaten WHERE sleutel IN "
+                                         "(SELECT sleutel FROM resultaten ORDER BY gebruikt_op LIMIT ?)", (teveel,))
+            self.aantal_op_schijf -= verwijderd.rowcount
+
+    def leeg(self):
+        """Verwijdert alle bewaarde uitkomsten."""
+        with self.lock:
+            self.geheugen.clear()
+            self.db.execute("DELETE FROM resultaten")
+            self.db.commit()
+            self.aantal_op_schijf = 0
+
+    def sluit(self):
+        with self.lock:
+            self.db.close()
+
+# De gedeelde cache van dit proces, wordt pas bij het eerste gebruik geopend
+_cache = {}
+_cache_lock = threading.Lock()
+
+def get_resultaten_cache():
+    """Geeft de gedeelde resultatencache (en opent files/resultaten.sqlite de eerste keer)."""
+    with _cache_lock:
+        if "cache" not in _cache:
+            _cache["cache"] = Resultatencache()
+            atexit.register(_cache["cache"].sluit)
+        return _cache["cache"]
+
+def impact_van_paar_gecachet(asteroid, land):
+    """impact_van_paar() met de resultatencache ervoor."""
+    return get_resultaten_cache().haal_op(asteroid, land)
@@ -0,0 +1,113 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import random
+from datetime import date, timedelta
+
+# Synthetische NASA NeoWs- en REST Countries-antwoorden van een instelbare grootte, in dezelfde vorm (en met dezelfde
+# overbodige velden) als de echte API's. De data hangt alleen af van de datum, het id en de seed, dus hetzelfde
+# verzoek geeft altijd hetzelfde antwoord. Gebruikt door de stand-in server van de benchmarks en door de
+# synthetische modus van http_cassette.py.
+
+# ------------------------------------------------- Synthetische data ------------------------------------------------ #
+def maak_neo(neo_id, datum, rng):
+    """
+    Eén synthetisch NASA-object in dezelfde vorm (en met dezelfde overbodige velden) als de echte feed.
+    """
+    d_min = rng.uniform(3, 3000)
+    d_max = d_min * 2.2361
+    snelheid_kms = rng.uniform(2, 45)
+    afstand_km = rng.uniform(1e4, 7.5e7)
+    return {
+        "links": {"self": f"http://api.nasa.gov/neo/rest/v1/neo/{neo_id}?api_key=DEMO_KEY"},
+        "id": str(neo_id),
+        "neo_reference_id": str(neo_id),
+        "name": f"({2000 + neo_id % 26} {chr(65 + neo_id % 26)}{chr(65 + neo_id // 26 % 26)}{neo_id % 1000})",
+        "nasa_jpl_url": f"https://ssd.jpl.nasa.gov/tools/sbdb_lookup.html#/?sstr={neo_id}",
+        "absolute_magnitude_h": rng.uniform(15, 30),
+        "estimated_diameter": {
+            "kilometers": {"estimated_diameter_min": d_min / 1000, "estimated_diameter_max": d_max / 1000},
+            "meters": {"estimated_diameter_min": d_min, "estimated_diameter_max": d_max},
+            "miles": {"estimated_diameter_min": d_min / 1609.344, "estimated_diameter_max": d_max / 1609.344},
+            "feet": {"estimated_diameter_min": d_min * 3.2808, "estimated_diameter_max": d_max * 3.2808},
+        },
+        "is_potentially_hazardous_asteroid": rng.random() < 0.1,
+        "close_approach_data": [{
+            "close_approach_date": datum,
+            "close_approach_date_full": f"{datum} 12:00",
+            "epoch_date_close_approach": 0,
+            "relative_velocity": {
+                "kilometers_per_second": repr(snelheid_kms),
+                "kilometers_per_hour": repr(snelheid_kms * 3600),
+                "miles_per_hour": repr(snelheid_kms * 2236.94),
+            },
+            "miss_distance": {
+                "astronomical": repr(afstand_km / 149597870.7),
+                "lunar": repr(afstand_km / 384400),
+                "kilometers": repr(afstand_km),
+                "miles": repr(afstand_km / 1.609344),
+            },
+            "orbiting_body": "Earth",
+        }],
+        "is_sentry_object": False,
+    }
+
+def maak_feed(start_datum, eind_datum, neo_per_dag, seed=0):
+    """
+    Een synthetisch feed-antwoord voor start t/m eind met neo_per_dag objecten per dag.
+    De data hangt alleen af van de datum en de seed, dus dezelfde dag geeft altijd dezelfde objecten.
+    """
+    start = date.fromisoformat(start_datum)
+    eind = date.fromisoformat(eind_datum)
+    per_dag = {}
+    dag = start
+    while dag <= eind:
+        rng = random.Random(f"{seed}-{dag.isoformat()}")
+        basis = 2_000_000 + dag.toordinal() % 10_000 * 100_000
+        per_dag[dag.isoformat()] = [maak_neo(basis + i, dag.isoformat(), rng) for i in range(neo_per_dag)]
+        dag += timedelta(days=1)
+    return {
+        "links": {},
+        "element_count": sum(len(lijst) for lijst in per_dag.values()),
+        "near_earth_objects": per_dag,
+    }
+
+def maak_neo_details(neo_id, aantal_naderingen=40):
+    """
+    Een synthetisch antwoord van de lookup-API (/neo/<id>): hetzelfde object met naderingen over ruim twee eeuwen
+    (van de aarde, Mars en Venus) en baangegevens.
+    """
+    rng = random.Random(f"details-{neo_id}")
+    neo = maak_neo(neo_id, "1900-01-01", rng)
+    naderingen = []
+    for i in range(aantal_naderingen):
+        datum = date(1900 + i * 250 // aantal_naderingen, rng.randint(1, 12), rng.randint(1, 28)).isoformat()
+        nadering = maak_neo(neo_id, datum, rng)["close_approach_data"][0]
+        nadering["orbiting_body"] = rng.choice(("Earth", "Earth", "Mars", "Venus"))
+        naderingen.append(nadering)
+    neo["close_approach_data"] = naderingen
+    neo["orbital_data"] = {
+        "orbit_id": str(rng.randint(1, 300)),
+        "orbit_determination_date": "2024-06-01 06:00:00",
+        "eccentricity": repr(rng.uniform(0, 0.9)),
+        "semi_major_axis": repr(rng.uniform(0.6, 4)),
+        "inclination": repr(rng.uniform(0, 40)),
+        "perihelion_distance": repr(rng.uniform(0.1, 1.3)),
+        "aphelion_distance": repr(rng.uniform(1, 6)),
+        "orbital_period": repr(rng.uniform(150, 3000)),
+        "orbit_class": {"orbit_class_type": "APO"},
+    }
+    return neo
+
+def maak_landen(aantal=250, seed=0):
+    """
+    Synthetische REST Countries-data (velden name, population, area en altSpellings).
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            "name": {"common": f"Land {i}", "official": f"Republiek Land {i}", "nativeName": {}},
+            "population": rng.randint(800, 1_400_000_000),
+            "area": rng.uniform(0.5, 17_100_000),
+            "altSpellings": [f"L{i}"],
+        }
+        for i in range(aantal)
+    ]
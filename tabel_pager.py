@@ -0,0 +1,67 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+from instrumentatie import gemeten                          # Meetpunt rond het renderen
+
+# ---------------------------------------------------- Tabel pager --------------------------------------------------- #
+class Pager:
+    """
+    Houdt de rijen van een tabel bij en rendert alleen de zichtbare pagina.
+
+    PrettyTable sorteert en formatteert bij elke get_string(start, end) de hele tabel opnieuw, ook als je maar
+    een paar rijen wilt zien. Hier wordt elke kolom maar één keer gesorteerd; die volgorde (een permutatie van
+    de rij-nummers) wordt bewaard, zodat wisselen van sorteerkolom of -richting daarna direct gaat. Aflopend
+    wordt de pagina van achteren uit dezelfde volgorde gelezen, dus een pagina kost alleen het aantal rijen erop.
+    """
+    def __init__(self, data, kolommen):
+        self.data = data
+        self.kolommen = list(kolommen)
+        self.sorteer_kolom = None
+        self.omgekeerd = False
+        self._volgordes = {}
+
+    def __len__(self):
+        return len(self.data)
+
+    def sorteer(self, kolom_naam, omgekeerd=False):
+        """Stelt de sorteerkolom en -richting in, de volgorde wordt bij het eerste gebruik berekend."""
+        self.sorteer_kolom = kolom_naam
+        self.omgekeerd = omgekeerd
+
+    def volgorde(self):
+        """
+        Geeft de rij-nummers oplopend gesorteerd op de sorteerkolom (of None als er niet gesorteerd wordt).
+        De richting wordt pas in pagina() toegepast.
+        """
+        if self.sorteer_kolom is None:
+            return None
+        if self.sorteer_kolom not in self._volgordes:
+            kolom = self.kolommen.index(self.sorteer_kolom)
+            self._volgordes[self.sorteer_kolom] = sorted(range(len(self.data)), key=lambda i: self.data[i][kolom])
+        return self._volgordes[self.sorteer_kolom]
+
+    def pagina(self, start, eind):
+        """Geeft alleen de rijen van start tot eind in de huidige sorteervolgorde."""
+        volgorde = self.volgorde()
+        if volgorde is None:
+            return self.data[start:eind]
+        if not self.omgekeerd:
+            return [self.data[i] for i in volgorde[start:eind]]
+        # Aflopend: rij start t/m eind van achteren geteld, alleen dat stuk wordt omgedraaid
+        aantal = len(volgorde)
+        start = min(max(start, 0), aantal)
+        eind = min(max(eind, start), aantal)
+        return [self.data[i] for i in reversed(volgorde[aantal - eind:aantal - start])]
+
+    @gemeten("tabel_render")
+    def render(self, table, start, eind):
+        """
+        Zet alleen de rijen van de zichtbare pagina in de (gedeelde) PrettyTable en geeft de tekst terug.
+        Het thema en de instellingen van de tabel blijven behouden.
+        """
+        table.clear_rows()
+        # Kolomnamen alleen zetten als ze veranderd zijn, anders reset PrettyTable de uitlijning
+        if table.field_names != self.kolommen:
+            table.field_names = self.kolommen
+        table.sortby = None
+        table.reversesort = False
+        table.add_rows(self.pagina(start, eind))
+        return table.get_string()
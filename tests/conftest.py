@@ -0,0 +1,19 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import pytest
+
+from benchmarks.conftest import offline  # noqa: F401 (dezelfde offline-omgeving als de benchmarks)
+from benchmarks.standin_server import StandinServer
+
+# Correctheidstests per onderdeel; de metingen staan in benchmarks/. Draaien met: python -m pytest tests -q
+
+# ----------------------------------------------------- Fixtures ----------------------------------------------------- #
+@pytest.fixture(scope="module")
+def standin():
+    """
+    Eén kleine stand-in voor NASA en REST Countries (100 NEO's per dag, 250 landen): voor correctheid is de
+    grootte van de feed niet belangrijk.
+    """
+    server = StandinServer(neo_per_dag=100, aantal_landen=250).start()
+    server.aantal_neo = 700
+    yield server
+    server.stop()
@@ -0,0 +1,115 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import json
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import api_client
+import synthetische_data
+from kolom_opslag import KolommenBouwer
+
+# --------------------------------------------- Herhalen en samenvoegen ---------------------------------------------- #
+def test_herhalen_na_serverfout(offline, monkeypatch):
+    monkeypatch.setattr(api_client, "BACKOFF_BASIS_S", 0.001)
+    offline.storingen = 2
+    dagen = set()
+    assert api_client.stroom_venster("DEMO_KEY", "2024-01-01", "2024-01-07", lambda datum, _: dagen.add(datum))
+    assert len(dagen) == 7
+
+def test_identieke_verzoeken_samenvoegen(offline, monkeypatch):
+    monkeypatch.setattr(offline, "vertraging_s", 0.2)
+    verzoeken = offline.lookup_verzoeken
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        objecten = list(pool.map(lambda _: api_client.haal_neo_op("DEMO_KEY", 2000433), range(8)))
+    assert all(neo is not None and neo["id"] == "2000433" for neo in objecten)
+    assert offline.lookup_verzoeken - verzoeken == 1
+
+def test_identieke_vensters_samenvoegen(offline, monkeypatch):
+    """Threads die tegelijk hetzelfde venster vragen delen één verzoek en krijgen allemaal alle objecten."""
+    monkeypatch.setattr(offline, "vertraging_s", 0.2)
+    verzoeken = offline.feed_verzoeken
+
+    def venster(_):
+        objecten = []
+        gelukt = api_client.stroom_venster("DEMO_KEY", "2024-01-01", "2024-01-07",
+                                           lambda datum, neo: objecten.append((datum, neo["id"])))
+        return gelukt, objecten
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        resultaten = list(pool.map(venster, range(6)))
+    assert offline.feed_verzoeken - verzoeken == 1
+    assert all(gelukt for gelukt, _ in resultaten)
+    assert len(resultaten[0][1]) == 7 * 100
+    assert all(objecten == resultaten[0][1] for _, objecten in resultaten)
+
+# -------------------------------------------------- Feed streamen --------------------------------------------------- #
+def test_feed_in_chunks():
+    """Incrementeel lezen geeft dezelfde objecten als json.loads, ook met chunks die midden in een teken eindigen."""
+    feed = synthetische_data.maak_feed("2024-01-01", "2024-01-07", 100)
+    feed["near_earth_objects"]["2024-01-01"][0]["name"] = "(2024 Ĳsselmeer ☄)"
+    body = json.dumps(feed).encode("utf-8")
+    verwacht = [(datum, api_client.dun_neo_uit(neo))
+                for datum, objecten in feed["near_earth_objects"].items() for neo in objecten]
+
+    # Ook met chunks die midden in een getal of een UTF-8-teken eindigen
+    chunks = [body[i:i + 7] for i in range(0, len(body), 7)]
+    assert list(api_client.lees_feed(chunks)) == verwacht
+
+def test_feed_streamen_met_kleine_geheugenpiek():
+    """Incrementeel in kolommen lezen gebruikt veel minder geheugen dan de hele feed met json.loads."""
+    feed = synthetische_data.maak_feed("2024-01-01", "2024-01-07", 2000)
+    body = json.dumps(feed).encode("utf-8")
+    ids = [int(neo["id"]) for objecten in feed["near_earth_objects"].values() for neo in objecten]
+    del feed
+
+    def streamen():
+        bouwer = KolommenBouwer()
+        chunks = (body[i:i + api_client.FEED_CHUNK_BYTES] for i in range(0, len(body), api_client.FEED_CHUNK_BYTES))
+        for _, neo in api_client.lees_feed(chunks):
+            bouwer.voeg_toe(neo)
+        return bouwer.kolommen()
+
+    tracemalloc.start()
+    try:
+        kolommen = streamen()
+        piek_stroom = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        json.loads(body)
+        piek_geheel = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert kolommen["id"].tolist() == ids
+    assert piek_stroom < piek_geheel / 4
+
+# --------------------------------------------------- Datumbereik ---------------------------------------------------- #
+def test_bereik_in_vensters_zonder_dubbele_objecten(offline):
+    verzoeken = offline.feed_verzoeken
+    objecten = api_client.haal_feed_op("DEMO_KEY", "2024-01-01", "2024-01-10")
+    # Twee vensters (7 + 3 dagen) met elk 100 andere objecten per dag
+    assert offline.feed_verzoeken - verzoeken == 2
+    assert len(objecten) == len({neo["id"] for neo in objecten}) == 10 * 100
+
+def test_dezelfde_asteroide_op_meerdere_dagen():
+    def neo(neo_id, *datums):
+        return {"id": neo_id, "close_approach_data": [{"close_approach_date": datum} for datum in datums]}
+
+    per_dag = {
+        "2024-01-03": [neo("1", "2024-01-03"), neo("2", "2024-01-03")],
+        "2024-01-01": [neo("1", "2024-01-01")],
+        "2024-01-09": [neo("1", "2024-01-09", "2024-01-01")],
+    }
+    objecten = api_client.voeg_objecten_samen([{"near_earth_objects": per_dag}])
+    assert [neo["id"] for neo in objecten] == ["1", "2"]
+    # Elke nadering één keer, de eerste vooraan
+    datums = [nadering["close_approach_date"] for nadering in objecten[0]["close_approach_data"]]
+    assert datums == ["2024-01-01", "2024-01-03", "2024-01-09"]
+
+# ------------------------------------------------------ Quotum ------------------------------------------------------ #
+def test_quotum_verspreiden(monkeypatch):
+    """Bij weinig resterend quotum krijgt elk verzoek een eigen tijdslot van uur / limiet."""
+    monkeypatch.setattr(api_client, "RATELIMIT_VENSTER_S", 1)
+    monkeypatch.setattr(api_client, "_quotum", {"limiet": 10, "resterend": 1, "volgende": 0.0})
+    start = time.perf_counter()
+    for _ in range(3):
+        api_client.wacht_op_quotum()
+    assert time.perf_counter() - start >= 0.2
@@ -0,0 +1,30 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import builtins
+
+import astro_impact
+import neo_cache
+
+def invoer(monkeypatch, *antwoorden):
+    antwoorden = iter(antwoorden)
+    monkeypatch.setattr(builtins, "input", lambda _vraag="": next(antwoorden))
+    monkeypatch.setattr(astro_impact, "clear_screen", lambda: None)
+
+# ----------------------------------------------- Historie in het menu ----------------------------------------------- #
+def test_asteroide_kiezen_uit_de_historie(offline, monkeypatch, capsys):
+    neo_cache.write_cache(stil=True)
+    kolommen, rijen = neo_cache.build_historie_table(gevaarlijk=True, sorteer="datum", aflopend=True)
+    neo_id, datum = rijen[0][0], rijen[0][-1]
+    monkeypatch.setitem(astro_impact.sessie_data, "asteroide", None)
+    # Geen periode, alleen gevaarlijke, 5 rijen per pagina, [K]iezen en dan het ID van de nieuwste nadering
+    invoer(monkeypatch, "", "", "j", "5", "k", neo_id)
+    astro_impact.show_historie()
+    assert "Historie van naderingen" in capsys.readouterr().out
+    asteroid = astro_impact.sessie_data["asteroide"]
+    assert asteroid["id"] == neo_id and asteroid["is_potentially_hazardous_asteroid"]
+    assert asteroid["close_approach_data"][0]["close_approach_date"] == datum
+    astro_impact.get_table().clear()
+
+def test_ongeldige_datum(offline, monkeypatch, capsys):
+    invoer(monkeypatch, "31-01-2025")
+    astro_impact.show_historie()
+    assert "Ongeldige datum" in capsys.readouterr().out
@@ -0,0 +1,24 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import numpy as np
+
+import atmosfeer
+import impact_berekening
+
+# ----------------------------------------------------- Intrede ------------------------------------------------------ #
+def test_energie_blijft_behouden():
+    rng = np.random.default_rng(0)
+    diameter_min = 10 ** rng.uniform(0, 3.5, 500)
+    diameter_max = diameter_min * 2.2
+    snelheid = rng.uniform(11, 40, 500)
+    intrede = atmosfeer.bereken_intrede((diameter_min + diameter_max) / 2, snelheid)
+    joules = impact_berekening.bereken_energie(diameter_min, diameter_max, snelheid)
+    assert np.allclose(intrede["joules_intrede"], joules)
+    assert np.allclose(intrede["joules_lucht"] + intrede["joules_grond"], joules)
+    assert np.all(intrede["joules_grond"][intrede["airburst"]] == 0)
+
+def test_ijkpunten():
+    # Chelyabinsk (19 m, 19 km/s, 18°) explodeert hoog in de lucht, een object van 1 km raakt de grond
+    ijkpunten = atmosfeer.bereken_intrede([19, 1000], [19, 19], 3300, [18, 45])
+    assert ijkpunten["airburst"].tolist() == [True, False]
+    assert 20 < ijkpunten["hoogte_airburst_km"][0] < 50
+    assert ijkpunten["joules_grond"][1] > 0.9 * ijkpunten["joules_intrede"][1]
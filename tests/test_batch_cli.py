@@ -0,0 +1,101 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import json
+
+import numpy as np
+import pytest
+
+import atmosfeer
+import batch_cli
+import landen_cache
+import neo_cache
+import neo_details
+from impact_berekening import bereken_energie, impact_van_paar
+from kolom_opslag import kolommen_naar_object
+
+# ------------------------------------------------------ Export ------------------------------------------------------ #
+def test_export_terug_te_lezen(offline):
+    """De export is precies wat read_cache() geeft, ook voor een deel van de dagen."""
+    neo_cache.write_cache(stil=True)
+    assert batch_cli.main(["export", "-o", "export.json", "--geen-verversing"]) == 0
+    with open("export.json", encoding="utf-8") as file:
+        assert json.load(file) == neo_cache.read_cache()
+
+    dag = min(neo_cache.dag_versies())
+    assert batch_cli.main(["export", "-o", "dag.json", "--van", dag, "--tot", dag, "--geen-verversing"]) == 0
+    with open("dag.json", encoding="utf-8") as file:
+        export = json.load(file)
+    assert export == neo_cache.read_cache(dag, dag)
+    assert 0 < len(export["objecten"]) < len(neo_cache.read_cache()["objecten"])
+
+def test_export_zonder_cache(offline):
+    assert batch_cli.main(["export", "-o", "export.json", "--geen-verversing"]) == 1
+    assert batch_cli.main(["export", "--van", "gisteren"]) == 2
+
+# ------------------------------------------------- Zonder NEO-cache ------------------------------------------------- #
+def test_landen_en_historie_zonder_neo_cache(offline, capsys):
+    """Voor 'landen' en 'historie' is de NEO-cache niet nodig, voor de asteroïden wel."""
+    feed_verzoeken = offline.feed_verzoeken
+    assert batch_cli.main(["landen"]) == 0
+    landen = [json.loads(regel) for regel in capsys.readouterr().out.splitlines()]
+    assert len(landen) == 250 and offline.feed_verzoeken == feed_verzoeken
+    assert batch_cli.main(["historie", "--geen-verversing"]) == 0
+    assert capsys.readouterr().out == ""
+    assert batch_cli.main(["asteroiden", "--geen-verversing"]) == 1
+
+# ------------------------------------------------ Simulatie-records ------------------------------------------------- #
+def test_records_met_atmosfeer_per_blok(offline, monkeypatch):
+    """Dezelfde uitkomsten als impact_van_paar() in het menu, met één berekening van de intrede per blok."""
+    neo_cache.write_cache(stil=True)
+    kolommen, _ = neo_cache.laad_neo_data()
+    landen = landen_cache.haal_landen_op()
+    # Van klein naar groot, zodat er zowel airbursts als inslagen op de grond tussen zitten
+    rijen = np.argsort(kolommen["diameter_max"])[np.linspace(0, len(kolommen["id"]) - 1, 10).astype(int)].tolist()
+    aanroepen = []
+    bereken_intrede = atmosfeer.bereken_intrede
+    monkeypatch.setattr(atmosfeer, "bereken_intrede", lambda *args: aanroepen.append(1) or bereken_intrede(*args))
+
+    records = list(batch_cli.simulatie_records(kolommen, landen, rijen, [0, 7], blok=4))
+    assert len(aanroepen) == 3 and len(records) == 20
+    for record in records:
+        rij = rijen[[str(kolommen["id"][rij]) for rij in rijen].index(record["asteroide_id"])]
+        land = landen[0] if record["land"] == landen[0][0] else landen[7]
+        verwacht = impact_van_paar(kolommen_naar_object(kolommen, rij), land)
+        for veld in ("airburst", "hoogte_airburst_km", "joules_grond", "slachtoffers", "magnitude"):
+            assert record[veld] == pytest.approx(verwacht[veld]), veld
+    assert {record["airburst"] for record in records} == {True, False}
+
+# ------------------------------------------------------ JSONL ------------------------------------------------------- #
+def test_jsonl_zonder_oneindig(tmp_path):
+    """Een magnitude van -inf (0 joule) of NaN wordt null, zodat elke regel geldige JSON is."""
+    records = [{"naam": "A", "magnitude": float("-inf"), "joules": 0.0},
+               {"naam": "B", "magnitude": float("nan"), "joules": 1.0},
+               {"naam": "C", "magnitude": 4.2, "joules": 2.0}]
+    pad = tmp_path / "uit.jsonl"
+    with open(pad, "w", encoding="utf-8") as uitvoer:
+        assert batch_cli.schrijf_jsonl(records, uitvoer) == 3
+
+    def weiger(waarde):
+        raise ValueError(f"geen geldige JSON: {waarde}")
+
+    regels = [json.loads(regel, parse_constant=weiger) for regel in pad.read_text().splitlines()]
+    assert [regel["magnitude"] for regel in regels] == [None, None, 4.2]
+    assert [regel["joules"] for regel in regels] == [0.0, 1.0, 2.0]
+
+# --------------------------------------------- Nadering uit de details ---------------------------------------------- #
+def test_simuleer_en_sweep_met_nadering(offline, monkeypatch):
+    """--nadering rekent bij simuleer en sweep met de gekozen nadering uit de details in plaats van de feed."""
+    monkeypatch.setattr(neo_details, "_geheugen", {})
+    neo_cache.write_cache(stil=True)
+    kolommen, _ = neo_cache.read_kolommen()
+    ids = [str(neo_id) for neo_id in kolommen["id"][:3].tolist()]
+    snelst = neo_details.kolommen_met_nadering(kolommen, [0, 1, 2], "snelst")
+    verwacht = bereken_energie(snelst["diameter_min"], snelst["diameter_max"], snelst["snelheid_kms"]).tolist()
+
+    argumenten = ["--asteroiden", ",".join(ids), "--landen", "Land 1", "--geen-verversing"]
+    assert batch_cli.main(["simuleer", *argumenten, "--nadering", "snelst", "-o", "snelst.jsonl"]) == 0
+    with open("snelst.jsonl", encoding="utf-8") as file:
+        assert [json.loads(regel)["joules"] for regel in file] == pytest.approx(verwacht)
+
+    assert batch_cli.main(["sweep", *argumenten, "--nadering", "snelst", "--processen", "1", "-o", "sweep.jsonl"]) == 0
+    with open("sweep.jsonl", encoding="utf-8") as file:
+        assert json.loads(file.readline())["joules_max"] == pytest.approx(max(verwacht))
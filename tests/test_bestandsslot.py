@@ -0,0 +1,68 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import os
+import stat
+
+import pytest
+
+import bestandsslot
+
+# ------------------------------------------------ Atomair schrijven ------------------------------------------------- #
+def test_atomair_schrijven(tmp_path):
+    pad = str(tmp_path / "data.json")
+    with bestandsslot.atomair_schrijven(pad) as file:
+        file.write("oud")
+    try:
+        with bestandsslot.atomair_schrijven(pad) as file:
+            file.write("half")
+            raise RuntimeError("gestopt tijdens het schrijven")
+    except RuntimeError:
+        pass
+    assert open(pad).read() == "oud"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["data.json"]
+
+# ------------------------------------------------- Rechten en fsync ------------------------------------------------- #
+@pytest.mark.skipif(os.name == "nt", reason="Windows heeft geen Unix-rechten")
+def test_zelfde_rechten_als_open(tmp_path):
+    """mkstemp() maakt het tijdelijke bestand met 0o600, het resultaat hoort de rechten van open() te krijgen."""
+    with open(tmp_path / "gewoon.json", "w") as file:
+        file.write("{}")
+    with bestandsslot.atomair_schrijven(str(tmp_path / "atomair.json")) as file:
+        file.write("{}")
+    gewoon = stat.S_IMODE(os.stat(tmp_path / "gewoon.json").st_mode)
+    assert stat.S_IMODE(os.stat(tmp_path / "atomair.json").st_mode) == gewoon == bestandsslot.standaard_modus()
+
+@pytest.mark.skipif(os.name == "nt", reason="Windows heeft geen Unix-rechten")
+def test_umask_zonder_proc(tmp_path, monkeypatch):
+    """Zonder /proc wordt de umask even gezet en daarna hersteld; een gewijzigde umask telt direct mee."""
+    echte_open = open
+
+    def open_zonder_proc(pad, *args, **kwargs):
+        if pad == "/proc/self/status":
+            raise FileNotFoundError(pad)
+        return echte_open(pad, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", open_zonder_proc)
+    oud = os.umask(0o027)
+    try:
+        assert bestandsslot.standaard_modus() == 0o640
+        assert os.umask(0o027) == 0o027
+    finally:
+        os.umask(oud)
+
+def test_fsync_voor_hernoemen(tmp_path, monkeypatch):
+    stappen = []
+    fsync, replace = os.fsync, os.replace
+    monkeypatch.setattr(os, "fsync", lambda fd: (stappen.append("fsync"), fsync(fd)))
+    monkeypatch.setattr(os, "replace", lambda *paden: (stappen.append("replace"), replace(*paden)))
+    with bestandsslot.atomair_schrijven(str(tmp_path / "data.bin"), "wb") as file:
+        file.write(b"\x00" * 100_000)
+    assert stappen == ["fsync", "replace"]
+    assert os.path.getsize(tmp_path / "data.bin") == 100_000
+
+# --------------------------------------------------- Bestandsslot --------------------------------------------------- #
+def test_bestandsslot(tmp_path):
+    slot = bestandsslot.Bestandsslot(str(tmp_path / "slot"))
+    with bestandsslot.Bestandsslot(str(tmp_path / "slot")):
+        assert not slot.verkrijg(timeout=0)
+    assert slot.verkrijg(timeout=0)
+    slot.geef_vrij()
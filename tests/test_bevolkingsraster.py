@@ -0,0 +1,93 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import json
+
+import numpy as np
+import pytest
+
+import bevolkingsraster
+
+RASTER = np.array([[1, 2, 3, 4], [5, -9999, 7, 8], [9, 10, 11, 12]], dtype=np.float32)
+
+def schrijf_asc(pad, kop):
+    regels = kop + [" ".join(f"{waarde:g}" for waarde in rij) for rij in RASTER]
+    pad.write_text("\n".join(regels) + "\n")
+
+def brute_force(raster, breedte, lengte, straal_km):
+    """
+    Dezelfde benadering als bevolking_binnen_straal() (een vierkant met de oppervlakte van de cirkel), maar zonder
+    summed-area table: per cel het deel dat binnen het vierkant valt, met het vierkant ook 360° verschoven.
+    """
+    rijen, kolommen = raster.shape
+    cel = 360.0 / kolommen
+    half_breedte = straal_km * np.sqrt(np.pi) / 2 / bevolkingsraster.KM_PER_GRAAD
+    half_lengte = min(half_breedte / max(np.cos(np.radians(breedte)), 1e-6), 180.0)
+    boven = -90.0 + rijen * cel - np.arange(rijen) * cel
+    links = -180.0 + np.arange(kolommen) * cel
+    fy = np.clip(np.minimum(boven, breedte + half_breedte) - np.maximum(boven - cel, breedte - half_breedte), 0, cel)
+    fx = sum(np.clip(np.minimum(links + cel + verschuiving, lengte + half_lengte)
+                     - np.maximum(links + verschuiving, lengte - half_lengte), 0, cel)
+             for verschuiving in (-360.0, 0.0, 360.0))
+    return fy / cel @ raster.astype(np.float64) @ (fx / cel)
+
+# ---------------------------------------------------- ASCII-grid ---------------------------------------------------- #
+def test_ascii_grid_zonder_nodata_regel(tmp_path):
+    """NODATA_value is optioneel: met een kop van 5 regels begint het raster op regel 6."""
+    asc = tmp_path / "raster.asc"
+    schrijf_asc(asc, ["ncols 4", "nrows 3", "xllcenter -179.5", "yllcenter -89.5", "cellsize 1"])
+    pad = str(tmp_path / "bevolking.npy")
+    bevolkingsraster.converteer_ascii_grid(str(asc), pad)
+    raster = np.load(pad)
+    assert raster.shape == (3, 4)
+    assert np.array_equal(raster[0], RASTER[0]) and np.array_equal(raster[2], RASTER[2])
+    # Zonder NODATA_value geldt de standaard -9999
+    assert raster[1, 1] == 0
+    assert json.loads((tmp_path / "bevolking.json").read_text()) == {"west": -180.0, "zuid": -90.0, "celgrootte": 1.0}
+
+def test_ascii_grid_met_nodata_regel(tmp_path):
+    asc = tmp_path / "raster.asc"
+    schrijf_asc(asc, ["NCOLS 4", "NROWS 3", "XLLCORNER 0", "YLLCORNER 50", "CELLSIZE 0.5", "NODATA_value 7"])
+    pad = str(tmp_path / "bevolking.npy")
+    bevolkingsraster.converteer_ascii_grid(str(asc), pad)
+    raster = np.load(pad)
+    assert raster[1, 2] == 0 and raster[1, 1] == -9999
+    assert raster[2, 3] == 12
+    assert bevolkingsraster.lees_metadata(pad) == {"west": 0.0, "zuid": 50.0, "celgrootte": 0.5}
+
+def test_ascii_grid_zonder_kop(tmp_path):
+    asc = tmp_path / "raster.asc"
+    schrijf_asc(asc, ["ncols 4", "nrows 3", "cellsize 1"])
+    with pytest.raises(ValueError):
+        bevolkingsraster.converteer_ascii_grid(str(asc), str(tmp_path / "bevolking.npy"))
+
+# ------------------------------------------------ Summed-area table ------------------------------------------------- #
+def test_totaal_en_rechthoek(tmp_path):
+    raster = np.random.default_rng(1).random((72, 144)).astype(np.float32) * 1000
+    pad = str(tmp_path / "bevolking.npy")
+    np.save(pad, raster)
+    model = bevolkingsraster.Bevolkingsraster(pad)
+    assert np.isclose(model.totaal, raster.sum(dtype=np.float64))
+    assert np.isclose(model.rechthoek(10, 20, 30, 50), raster[10:30, 20:50].sum(dtype=np.float64))
+    assert model.rechthoek(5, 5, 5, 9) == 0
+
+# ----------------------------------------------- Datumgrens en polen ------------------------------------------------ #
+@pytest.fixture(scope="module")
+def wereld(tmp_path_factory):
+    """Een raster van de hele aarde met cellen van 1°, zonder metadata (dus rondom)."""
+    raster = np.random.default_rng(0).random((180, 360)).astype(np.float32) * 1000
+    pad = str(tmp_path_factory.mktemp("raster") / "bevolking.npy")
+    np.save(pad, raster)
+    return raster, bevolkingsraster.Bevolkingsraster(pad)
+
+@pytest.mark.parametrize("breedte, lengte, straal_km", [
+    (10.0, 179.3, 300.0),     # over de datumgrens naar het oosten
+    (-35.0, -179.8, 450.0),   # over de datumgrens naar het westen
+    (88.0, 20.0, 500.0),      # voorbij de noordpool, afgekapt
+    (-89.2, -60.0, 150.0),    # voorbij de zuidpool, afgekapt
+    (45.3, 5.7, 80.0),        # gewoon binnen het raster
+])
+def test_gelijk_aan_brute_force(wereld, breedte, lengte, straal_km):
+    raster, model = wereld
+    assert model.rondom
+    verwacht = brute_force(raster, breedte, lengte, straal_km)
+    assert verwacht > 0
+    assert np.isclose(float(model.bevolking_binnen_straal(breedte, lengte, straal_km)), verwacht, rtol=1e-9)
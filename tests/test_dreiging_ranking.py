@@ -0,0 +1,178 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import numpy as np
+import pytest
+
+import dreiging_ranking
+import landen_cache
+import neo_cache
+from impact_berekening import bereken_energie
+
+LAND = ["Land A", 17_000_000, 41_850, 406]
+
+def maak_dag(datum, ids, seed):
+    """Kolommen van één dag met weinig verschillende waarden, zodat er veel gelijke sleutels zijn."""
+    rng = np.random.default_rng(seed)
+    aantal = len(ids)
+    diameter_min = rng.choice([10.0, 20.0, 40.0], aantal)
+    return {
+        "id": np.array(ids, dtype=np.int64),
+        "naam": [f"({neo_id})" for neo_id in ids],
+        "datum": np.array([datum] * aantal),
+        "diameter_min": diameter_min,
+        "diameter_max": diameter_min * 2,
+        "snelheid_kms": rng.choice([10.0, 20.0], aantal),
+        "afstand_km": rng.choice([1e6, 2e6, 3e6], aantal),
+        "gevaarlijk": rng.random(aantal) < 0.3,
+    }
+
+def brute_force(dagen, k, maat, alleen_gevaarlijk):
+    """
+    Alle naderingen gesorteerd (bij gelijke sleutels in de volgorde waarin ze erbij kwamen), per asteroïde de eerste,
+    daarvan de eerste k. 'dagen' is {datum: kolommen} in de volgorde waarin de dagen toegevoegd zijn.
+    """
+    naderingen = []
+    for kolommen in dagen.values():
+        joules = bereken_energie(kolommen["diameter_min"], kolommen["diameter_max"], kolommen["snelheid_kms"])
+        sleutels = {"joules": -joules, "diameter": -(kolommen["diameter_min"] + kolommen["diameter_max"]) / 2,
+                    "afstand": kolommen["afstand_km"]}[maat]
+        for rij, sleutel in enumerate(sleutels):
+            if kolommen["gevaarlijk"][rij] or not alleen_gevaarlijk:
+                naderingen.append((sleutel, len(naderingen), str(kolommen["id"][rij]), str(kolommen["datum"][rij])))
+    uitkomst, gezien = [], set()
+    for _, _, neo_id, datum in sorted(naderingen):
+        if neo_id not in gezien:
+            gezien.add(neo_id)
+            uitkomst.append((neo_id, datum))
+    return uitkomst[:k]
+
+def vergelijk(ranking, dagen):
+    for maat in dreiging_ranking.MATEN:
+        for alleen_gevaarlijk in (False, True):
+            for k in (1, 5, 25, 1000):
+                verwacht = brute_force(dagen, k, maat, alleen_gevaarlijk)
+                gevonden = [(rij["id"], rij["datum"]) for rij in ranking.top(k, maat, alleen_gevaarlijk)]
+                assert gevonden == verwacht, (maat, alleen_gevaarlijk, k)
+
+def nieuwe_ranking(dagen):
+    ranking = dreiging_ranking.Dreigingsranking()
+    for datum, kolommen in dagen.items():
+        ranking.voeg_dag_toe(datum, "v1", kolommen)
+    return ranking
+
+# ------------------------------------------------ Tegen brute force ------------------------------------------------- #
+def test_lege_ranglijst():
+    ranking = dreiging_ranking.Dreigingsranking()
+    for maat in dreiging_ranking.MATEN:
+        assert ranking.top(10, maat) == [] and ranking.top(10, maat, True) == []
+    assert ranking.top_voor_land(LAND, 10) == []
+    with pytest.raises(ValueError):
+        ranking.top(10, "slachtoffers")
+
+def test_gelijk_aan_brute_force_met_gelijke_sleutels():
+    # Dezelfde asteroïden komen op meerdere dagen langs: elke asteroïde één keer, met zijn beste nadering
+    dagen = {f"2024-01-0{dag}": maak_dag(f"2024-01-0{dag}", list(range(dag * 10, dag * 10 + 40)), dag)
+             for dag in range(1, 6)}
+    ranking = nieuwe_ranking(dagen)
+    vergelijk(ranking, dagen)
+    ids = [rij["id"] for rij in ranking.top(1000)]
+    assert len(ids) == len(set(ids)) == len({neo_id for kolommen in dagen.values() for neo_id in kolommen["id"]})
+
+def test_alleen_gevaarlijke_heaps():
+    dagen = {"2024-01-01": maak_dag("2024-01-01", list(range(50)), 0)}
+    ranking = nieuwe_ranking(dagen)
+    for maat in dreiging_ranking.MATEN:
+        heap = ranking.heaps[maat, True]
+        assert len(heap) == int(dagen["2024-01-01"]["gevaarlijk"].sum())
+        assert all(rij["gevaarlijk"] for _, _, rij in heap)
+        assert all(rij["gevaarlijk"] for rij in ranking.top(1000, maat, True))
+
+# ------------------------------------------------ Bijwerken per dag ------------------------------------------------- #
+def test_verouderde_rijen_overslaan():
+    dagen = {f"2024-01-0{dag}": maak_dag(f"2024-01-0{dag}", list(range(dag * 100, dag * 100 + 30)), dag)
+             for dag in range(1, 5)}
+    ranking = nieuwe_ranking(dagen)
+    # Een nieuwe versie van één dag: de oude rijen blijven in de heaps staan, maar tellen niet meer mee
+    del dagen["2024-01-02"]
+    dagen["2024-01-02"] = maak_dag("2024-01-02", list(range(200, 230)), 99)
+    ranking.voeg_dag_toe("2024-01-02", "v2", dagen["2024-01-02"])
+    assert ranking.verouderd == 30
+    assert len(ranking.heaps["joules", False]) == len(ranking.rijen) + 30
+    vergelijk(ranking, dagen)
+
+def test_herbouwen_bij_meer_verouderde_dan_actuele_rijen():
+    dagen = {f"2024-01-0{dag}": maak_dag(f"2024-01-0{dag}", list(range(dag * 100, dag * 100 + 30)), dag)
+             for dag in range(1, 5)}
+    ranking = nieuwe_ranking(dagen)
+    ranking.verwijder_dag("2024-01-01")
+    del dagen["2024-01-01"]
+    assert ranking.verouderd == 30
+    ranking.verwijder_dag("2024-01-02")
+    del dagen["2024-01-02"]
+    # 60 verouderd tegen 60 actueel: nog niet herbouwd
+    assert ranking.verouderd == 60
+    ranking.verwijder_dag("2024-01-03")
+    del dagen["2024-01-03"]
+    assert ranking.verouderd == 0
+    assert all(len(ranking.heaps[maat, False]) == len(ranking.rijen) == 30 for maat in dreiging_ranking.MATEN)
+    vergelijk(ranking, dagen)
+
+def test_synchroniseren_leest_alleen_veranderde_dagen():
+    dagen = {f"2024-01-0{dag}": maak_dag(f"2024-01-0{dag}", list(range(dag * 100, dag * 100 + 20)), dag)
+             for dag in range(1, 4)}
+    gelezen = []
+
+    def lees_dag(datum):
+        gelezen.append(datum)
+        return dagen.get(datum)
+
+    ranking = dreiging_ranking.Dreigingsranking()
+    ranking.synchroniseer({datum: "v1" for datum in dagen}, lees_dag)
+    assert sorted(gelezen) == sorted(dagen)
+    vergelijk(ranking, dagen)
+
+    # Dag 1 valt uit het venster, dag 3 heeft een nieuwe versie en dag 4 komt erbij
+    gelezen.clear()
+    del dagen["2024-01-01"]
+    del dagen["2024-01-03"]
+    dagen["2024-01-03"] = maak_dag("2024-01-03", list(range(300, 320)), 33)
+    dagen["2024-01-04"] = maak_dag("2024-01-04", list(range(400, 420)), 4)
+    ranking.synchroniseer({"2024-01-02": "v1", "2024-01-03": "v2", "2024-01-04": "v1"}, lees_dag)
+    assert gelezen == ["2024-01-03", "2024-01-04"]
+    assert sorted(ranking.dagen) == sorted(dagen)
+    vergelijk(ranking, dagen)
+
+# -------------------------------------------------- Over de cache --------------------------------------------------- #
+def test_top_gelijk_aan_sorteren(offline):
+    neo_cache.write_cache(stil=True)
+    kolommen, _ = neo_cache.read_kolommen()
+    ranking = dreiging_ranking.get_ranking()
+    joules = bereken_energie(kolommen["diameter_min"], kolommen["diameter_max"], kolommen["snelheid_kms"])
+    diameter = (kolommen["diameter_min"] + kolommen["diameter_max"]) / 2
+    for maat, sleutel in (("joules", -joules), ("diameter", -diameter), ("afstand", kolommen["afstand_km"])):
+        for alleen_gevaarlijk in (False, True):
+            rijen = np.flatnonzero(kolommen["gevaarlijk"]) if alleen_gevaarlijk else np.arange(len(sleutel))
+            verwacht = [str(kolommen["id"][rij]) for rij in rijen[np.argsort(sleutel[rijen], kind="stable")][:10]]
+            assert [rij["id"] for rij in ranking.top(10, maat, alleen_gevaarlijk)] == verwacht
+
+def test_top_voor_land(offline):
+    """Voor elk land is de top op slachtoffers de top op energie."""
+    neo_cache.write_cache(stil=True)
+    ranking = dreiging_ranking.get_ranking()
+    per_land = ranking.top_voor_land(landen_cache.haal_landen_op()[0], 10)
+    assert [rij["id"] for rij in per_land] == [rij["id"] for rij in ranking.top(10, "joules")]
+    assert [rij["slachtoffers"] for rij in per_land] == sorted((rij["slachtoffers"] for rij in per_land), reverse=True)
+
+def test_nieuwe_versie_van_een_dag(offline, monkeypatch):
+    """Een nieuwe versie van één dag: alleen die dag wordt opnieuw gelezen."""
+    neo_cache.write_cache(stil=True)
+    ranking = dreiging_ranking.get_ranking()
+    gelezen = []
+    monkeypatch.setattr(dreiging_ranking, "lees_dag", lambda datum: gelezen.append(datum) or
+                        neo_cache.read_shard(datum)["kolommen"])
+    datum = max(neo_cache.dag_versies())
+    objecten = [neo_cache.kolommen_naar_object(neo_cache.read_shard(datum)["kolommen"], 0)]
+    objecten[0]["estimated_diameter"]["meters"]["estimated_diameter_max"] = 1e6
+    neo_cache.write_shards({datum: objecten}, neo_cache.time_stamp())
+    assert ranking is dreiging_ranking.get_ranking()
+    assert gelezen == [datum]
+    assert ranking.top(1, "diameter")[0]["id"] == objecten[0]["id"]
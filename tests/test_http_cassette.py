@@ -0,0 +1,48 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import gzip
+import os
+import shutil
+
+import http_cassette
+import landen_cache
+import neo_cache
+
+# ----------------------------------------------- Opnemen en afspelen ------------------------------------------------ #
+def test_cassette_opnemen_en_afspelen(offline, monkeypatch):
+    """Een opgenomen run speelt af zonder één verzoek aan de server, met dezelfde uitkomst en zonder API-key."""
+    monkeypatch.setenv("API_KEY", "geheime-key")
+    monkeypatch.setattr(http_cassette, "_instellingen", {**http_cassette._instellingen, "pad": "cassette.jsonl.gz"})
+    http_cassette.configureer(modus="opnemen")
+    try:
+        neo_cache.write_cache()
+        ids = neo_cache.read_kolommen()[0]["id"].tolist()
+        landen = landen_cache.haal_landen_op()
+        assert b"geheime-key" not in gzip.open("cassette.jsonl.gz").read()
+
+        http_cassette.configureer(modus="afspelen")
+        verzoeken = offline.aantal_verzoeken
+        landen_cache._landen_geheugen.clear()
+        os.remove(landen_cache.get_landen_cache_path())
+        shutil.rmtree(neo_cache.CACHE_MAP)
+        neo_cache.write_cache()
+        assert neo_cache.read_kolommen()[0]["id"].tolist() == ids
+        assert landen_cache.haal_landen_op() == landen
+        assert offline.aantal_verzoeken == verzoeken
+    finally:
+        http_cassette.configureer(modus="live")
+
+# --------------------------------------------------- Synthetisch ---------------------------------------------------- #
+def test_synthetische_http(offline, monkeypatch):
+    """De synthetische modus gaat door dezelfde parse- en cachecode, zonder server en zo groot als gewenst."""
+    monkeypatch.setattr(http_cassette, "_instellingen", {**http_cassette._instellingen, "neo_per_dag": 500})
+    http_cassette.configureer(modus="synthetisch")
+    try:
+        verzoeken = offline.aantal_verzoeken
+        neo_cache.write_cache()
+        assert len(neo_cache.read_kolommen()[0]["id"]) >= 500 * 7
+        assert len(landen_cache.haal_landen_op()) == 250
+        # Revalideren krijgt net als bij REST Countries een 304
+        assert len(landen_cache.haal_landen_op(verversen=True)) == 250
+        assert offline.aantal_verzoeken == verzoeken
+    finally:
+        http_cassette.configureer(modus="live")
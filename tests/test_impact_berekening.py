@@ -0,0 +1,82 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import math
+
+import pytest
+
+import astro_impact
+from impact_berekening import (BEWOONBAAR_OPPERVLAK, HIROSHIMA_JOULES, TOTAAL_OPPERVLAKTE_AARDE, WORLD_POP,
+                               bereken_impact_batch, impact_van_paar)
+
+# Diameter min/max (m) en snelheid (km/s): van een steen die in de lucht opbrandt tot een object dat elk land wegvaagt
+ASTEROIDEN = [(5.0, 12.0, 17.3), (120.0, 270.0, 21.8), (900.0, 2000.0, 30.1), (40_000.0, 60_000.0, 25.0)]
+# [naam, populatie, oppervlakte, dichtheid]: een groot land, een klein land en een stadstaat
+LANDEN = [["Groot land", 330_000_000, 9_372_610, 35], ["Klein land", 17_000_000, 41_850, 406],
+          ["Stadstaat", 39_000, 2.02, 19_300]]
+
+def maak_asteroide(diameter_min, diameter_max, snelheid_kms):
+    return {
+        "id": "1", "name": "(2024 AB1)", "is_potentially_hazardous_asteroid": False,
+        "estimated_diameter": {"meters": {"estimated_diameter_min": diameter_min,
+                                          "estimated_diameter_max": diameter_max}},
+        "close_approach_data": [{"close_approach_date": "2024-01-01",
+                                 "relative_velocity": {"kilometers_per_second": str(snelheid_kms),
+                                                       "kilometers_per_hour": str(snelheid_kms * 3600)},
+                                 "miss_distance": {"kilometers": "1000000"}, "orbiting_body": "Earth"}],
+    }
+
+def energie_scalair(diameter_min, diameter_max, snelheid_kms):
+    """De oorspronkelijke impactenergie_asteroide(), met math en één asteroïde per keer."""
+    straal = (diameter_min + diameter_max) / 2 / 2
+    massa = (4 / 3) * math.pi * (straal ** 3) * 3000
+    return 0.5 * massa * (snelheid_kms * 1000) ** 2
+
+def slachtoffers_scalair(joules, populatie, oppervlakte_land):
+    """De oorspronkelijke slachtofferberekening uit impact_simulatie(): (procent van het land, slachtoffers)."""
+    vernietigde_oppervlakte = (joules / HIROSHIMA_JOULES) * 13
+    if vernietigde_oppervlakte > oppervlakte_land:
+        extra_oppervlak = vernietigde_oppervlakte - oppervlakte_land
+        return 100.0, populatie + (extra_oppervlak / BEWOONBAAR_OPPERVLAK) * WORLD_POP
+    procent_land = (vernietigde_oppervlakte / oppervlakte_land) * 100
+    return procent_land, (procent_land / 100) * populatie
+
+# -------------------------------------------- Tegen de scalaire formules -------------------------------------------- #
+def test_batch_gelijk_aan_scalair():
+    resultaat = bereken_impact_batch([maak_asteroide(*asteroide) for asteroide in ASTEROIDEN], LANDEN)
+    for i, asteroide in enumerate(ASTEROIDEN):
+        joules = energie_scalair(*asteroide)
+        assert resultaat["joules"][i] == pytest.approx(joules, rel=1e-12)
+        assert resultaat["magnitude"][i] == pytest.approx((math.log10(joules) - 4.8) / 1.5, rel=1e-12)
+        vernietigd = joules / HIROSHIMA_JOULES * 13
+        assert resultaat["percentage_aarde"][i] == pytest.approx(vernietigd / TOTAAL_OPPERVLAKTE_AARDE * 100)
+        for j, (_, populatie, oppervlakte, _) in enumerate(LANDEN):
+            procent_land, slachtoffers = slachtoffers_scalair(joules, populatie, oppervlakte)
+            assert resultaat["procent_land"][i, j] == pytest.approx(procent_land, rel=1e-12)
+            assert resultaat["slachtoffers"][i, j] == pytest.approx(slachtoffers, rel=1e-12)
+            assert resultaat["land_vernietigd"][i, j] == (vernietigd > oppervlakte)
+
+def test_beide_takken_komen_voor():
+    resultaat = bereken_impact_batch([maak_asteroide(*asteroide) for asteroide in ASTEROIDEN], LANDEN)
+    # De kleinste asteroïde vernietigt alleen de stadstaat helemaal, de grootste elk land
+    assert resultaat["land_vernietigd"][0].tolist() == [False, False, True]
+    assert resultaat["land_vernietigd"][-1].all()
+    # Volledig vernietigd: de hele bevolking plus de mensen op het extra oppervlak, meer dan de populatie zelf
+    assert (resultaat["slachtoffers"][-1] > [land[1] for land in LANDEN]).all()
+
+def test_menu_en_paar_gelijk_aan_scalair(monkeypatch):
+    """impactenergie_asteroide() in het menu en impact_van_paar() rekenen met dezelfde formules."""
+    for asteroide in ASTEROIDEN:
+        neo = maak_asteroide(*asteroide)
+        monkeypatch.setitem(astro_impact.sessie_data, "asteroide", neo)
+        joules = energie_scalair(*asteroide)
+        assert astro_impact.impactenergie_asteroide() == pytest.approx(joules, rel=1e-12)
+        for land in LANDEN:
+            paar = impact_van_paar(neo, land)
+            procent_land, slachtoffers = slachtoffers_scalair(joules, land[1], land[2])
+            assert paar["joules"] == pytest.approx(joules, rel=1e-12)
+            assert paar["procent_land"] == pytest.approx(procent_land, rel=1e-12)
+            assert paar["slachtoffers"] == pytest.approx(slachtoffers, rel=1e-12)
+
+def test_land_zonder_oppervlakte():
+    """Een land zonder oppervlakte (komt voor in de REST Countries data) is bij elke inslag volledig vernietigd."""
+    resultaat = bereken_impact_batch([maak_asteroide(*ASTEROIDEN[0])], [["Leeg", 0, 0, 0]])
+    assert resultaat["land_vernietigd"][0, 0] and resultaat["procent_land"][0, 0] == 100.0
@@ -0,0 +1,82 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import json
+import re
+
+import pytest
+
+import bestandsslot
+import instrumentatie
+import neo_cache
+
+@pytest.fixture
+def metingen(monkeypatch):
+    monkeypatch.setattr(instrumentatie, "_actief", True)
+    instrumentatie.reset()
+    instrumentatie.tel("nasa_verzoeken", 3)
+    instrumentatie.tel("nasa_bytes_ontvangen", 2048)
+    instrumentatie.tel("nasa_gewacht_op_quotum_s", 1.5)
+    instrumentatie.registreer_span("nasa_feed_stroom", 0.25)
+    yield
+    instrumentatie.reset()
+
+# ---------------------------------------------------- Prometheus ---------------------------------------------------- #
+def test_prometheus_naam():
+    assert instrumentatie.prometheus_naam("neo_cache_hits") == "astro_neo_cache_hits_total"
+    assert instrumentatie.prometheus_naam("nasa_bytes_ontvangen") == "astro_nasa_ontvangen_bytes_total"
+    assert instrumentatie.prometheus_naam("nasa_gewacht_op_quotum_s") == "astro_nasa_gewacht_op_quotum_seconds_total"
+
+def test_een_metriek_per_teller(tmp_path, metingen):
+    pad = tmp_path / "metrics.prom"
+    instrumentatie.exporteer_prometheus(str(pad))
+    regels = pad.read_text().splitlines()
+    assert "astro_nasa_verzoeken_total 3" in regels
+    assert "astro_nasa_ontvangen_bytes_total 2048" in regels
+    assert "astro_nasa_gewacht_op_quotum_seconds_total 1.5" in regels
+    assert "# TYPE astro_nasa_ontvangen_bytes_total counter" in regels
+    assert 'astro_span_seconds_count{span="nasa_feed_stroom"} 1' in regels
+    # Elke regel is een commentaar of een geldige naam met een waarde
+    for regel in regels:
+        assert regel.startswith("# ") or re.fullmatch(r'[a-zA-Z_:][a-zA-Z0-9_:]*(\{[^}]*\})? \S+', regel), regel
+
+# ------------------------------------------------ Atomair exporteren ------------------------------------------------ #
+def test_export_is_atomair(tmp_path, metingen, monkeypatch):
+    json_pad = tmp_path / "metrics.json"
+    prom_pad = tmp_path / "metrics.prom"
+    instrumentatie.exporteer_json(str(json_pad))
+    instrumentatie.exporteer_prometheus(str(prom_pad))
+    assert json.loads(json_pad.read_text())["tellers"]["nasa_verzoeken"] == 3
+
+    # Gaat het schrijven halverwege mis, dan blijft het vorige rapport heel en staan er geen tijdelijke bestanden
+    def kapotte_dump(data, file, **_kwargs):
+        file.write('{"spans": {')
+        raise OSError("schijf vol")
+
+    oud = json_pad.read_text()
+    monkeypatch.setattr(instrumentatie.json, "dump", kapotte_dump)
+    with pytest.raises(OSError):
+        instrumentatie.exporteer_json(str(json_pad))
+    assert json_pad.read_text() == oud
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["metrics.json", "metrics.prom"]
+    assert instrumentatie.atomair_schrijven is bestandsslot.atomair_schrijven
+
+# ---------------------------------------------- Meetpunten in de cache ---------------------------------------------- #
+def test_uitgeschakeld_niets_bijhouden(offline, monkeypatch):
+    monkeypatch.setattr(instrumentatie, "_actief", False)
+    instrumentatie.reset()
+    neo_cache.write_cache(stil=True)
+    neo_cache.read_kolommen()
+    assert instrumentatie.rapport() == {"spans": {}, "tellers": {}}
+
+def test_spans_en_tellers_van_de_cache(offline, monkeypatch):
+    monkeypatch.setattr(instrumentatie, "_actief", True)
+    instrumentatie.reset()
+    neo_cache.write_cache(stil=True)
+    for _ in range(5):
+        neo_cache.read_kolommen()
+    neo_cache.dagen_te_verversen()
+    rapport = instrumentatie.rapport()
+    instrumentatie.reset()
+    assert rapport["spans"]["read_kolommen"]["aantal"] == 5
+    # Bij het verversen ontbreken alle 7 dagen, daarna zijn ze er allemaal
+    assert rapport["tellers"]["neo_cache_misses"] == 7
+    assert rapport["tellers"]["neo_cache_hits"] >= 7
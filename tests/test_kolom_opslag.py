@@ -0,0 +1,88 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import numpy as np
+import pytest
+
+import kolom_opslag
+import synthetische_data
+from api_client import dun_neo_uit
+
+def maak_objecten(start="2024-01-01", eind="2024-01-03", neo_per_dag=20):
+    feed = synthetische_data.maak_feed(start, eind, neo_per_dag)
+    feed["near_earth_objects"][start][0]["name"] = "(2024 Ĳsselmeer ☄)"
+    return [dun_neo_uit(neo) for objecten in feed["near_earth_objects"].values() for neo in objecten]
+
+def velden(neo):
+    """De velden die de kolommen bewaren, als getallen (de feed geeft ze als strings)."""
+    nadering = neo["close_approach_data"][0]
+    diameter = neo["estimated_diameter"]["meters"]
+    return (neo["id"], neo["name"], diameter["estimated_diameter_min"], diameter["estimated_diameter_max"],
+            float(nadering["relative_velocity"]["kilometers_per_hour"]),
+            float(nadering["relative_velocity"]["kilometers_per_second"]),
+            float(nadering["miss_distance"]["kilometers"]), nadering["close_approach_date"],
+            neo["is_potentially_hazardous_asteroid"])
+
+# -------------------------------------------------- Heen en terug --------------------------------------------------- #
+def test_via_schijf_terug_naar_objecten(tmp_path):
+    objecten = maak_objecten()
+    pad = str(tmp_path / "2024-01-01")
+    kolom_opslag.schrijf_kolommen(pad, kolom_opslag.objecten_naar_kolommen(objecten))
+    kolommen = kolom_opslag.lees_kolommen(pad)
+    # Memory-mapped gelezen, niet in het geheugen gekopieerd
+    assert isinstance(kolommen["records"], np.memmap)
+    terug = [kolom_opslag.kolommen_naar_object(kolommen, i) for i in range(len(kolommen["id"]))]
+    assert [velden(neo) for neo in terug] == [velden(neo) for neo in objecten]
+    assert list(kolommen["naam"]) == [neo["name"] for neo in objecten]
+
+def test_lege_dag_en_ontbrekende_bestanden(tmp_path):
+    pad = str(tmp_path / "leeg")
+    assert kolom_opslag.lees_kolommen(pad) is None
+    kolom_opslag.schrijf_kolommen(pad, kolom_opslag.objecten_naar_kolommen([]))
+    kolommen = kolom_opslag.lees_kolommen(pad)
+    assert len(kolommen["id"]) == 0 and list(kolommen["naam"]) == []
+
+# ------------------------------------------------ Dagen samenvoegen ------------------------------------------------- #
+def test_eerste_nadering_blijft(tmp_path):
+    objecten = maak_objecten(neo_per_dag=5)
+    eerste, tweede = objecten[:5], objecten[5:10]
+    # Dezelfde asteroïde komt op de tweede dag terug, met een andere nadering
+    terug = dun_neo_uit({**tweede[0], "id": eerste[2]["id"], "name": eerste[2]["name"]})
+    tweede = [tweede[1], terug, tweede[2]]
+    kolommen = kolom_opslag.voeg_kolommen_samen([kolom_opslag.objecten_naar_kolommen(eerste),
+                                                 kolom_opslag.objecten_naar_kolommen(tweede)])
+    verwacht = eerste + [tweede[0], tweede[2]]
+    assert kolommen["id"].tolist() == [int(neo["id"]) for neo in verwacht]
+    terug_objecten = [kolom_opslag.kolommen_naar_object(kolommen, i) for i in range(len(verwacht))]
+    assert [velden(neo) for neo in terug_objecten] == [velden(neo) for neo in verwacht]
+    assert str(kolommen["datum"][2]) == eerste[2]["close_approach_data"][0]["close_approach_date"]
+
+def test_zonder_dubbele_ids_ongewijzigd():
+    objecten = maak_objecten(neo_per_dag=5)
+    kolommen = kolom_opslag.objecten_naar_kolommen(objecten)
+    assert kolom_opslag.voeg_kolommen_samen([kolommen]) is kolommen
+    samen = kolom_opslag.voeg_kolommen_samen([kolom_opslag.objecten_naar_kolommen(objecten[:7]),
+                                              kolom_opslag.objecten_naar_kolommen([]),
+                                              kolom_opslag.objecten_naar_kolommen(objecten[7:])])
+    assert list(samen["naam"]) == [neo["name"] for neo in objecten]
+
+# ------------------------------------------------ Kolommen per blok ------------------------------------------------- #
+@pytest.mark.parametrize("extra", [-1, 0, 1])
+def test_blokgrenzen(extra):
+    """Precies BLOK objecten is één volledig blok, met één meer begint er een tweede."""
+    blok = kolom_opslag.KolommenBouwer.BLOK
+    objecten = maak_objecten("2024-01-01", "2024-01-02", (blok + extra + 1) // 2)[:blok + extra]
+    bouwer = kolom_opslag.KolommenBouwer()
+    for neo in objecten:
+        bouwer.voeg_toe(neo)
+    assert len(bouwer) == blok + extra
+    # Volle blokken zijn al omgezet naar records, de rest staat nog als dicts klaar
+    assert len(bouwer.blokken) == (blok + extra) // blok
+    assert len(bouwer.objecten) == (blok + extra) % blok
+    kolommen = bouwer.kolommen()
+    assert not bouwer.objecten and len(bouwer.blokken) == (2 if extra > 0 else 1)
+    verwacht = kolom_opslag.objecten_naar_kolommen(objecten)
+    assert np.array_equal(kolommen["records"], verwacht["records"])
+    assert list(kolommen["naam"]) == list(verwacht["naam"])
+
+def test_lege_bouwer():
+    kolommen = kolom_opslag.KolommenBouwer().kolommen()
+    assert len(kolommen["id"]) == 0
@@ -0,0 +1,48 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import landen_cache
+
+# ------------------------------------------------ Geheugen en schijf ------------------------------------------------ #
+def test_uit_geheugen(offline):
+    landen = landen_cache.haal_landen_op()
+    verzoeken = offline.aantal_verzoeken
+    assert landen_cache.haal_landen_op() is landen
+    assert offline.aantal_verzoeken == verzoeken
+
+def test_uit_bestand(offline):
+    landen = landen_cache.haal_landen_op()
+    verzoeken = offline.aantal_verzoeken
+    # Een nieuw proces: het geheugen is leeg, het bestand is nog geldig
+    landen_cache._landen_geheugen.clear()
+    assert landen_cache.haal_landen_op() == landen
+    assert offline.aantal_verzoeken == verzoeken
+
+# --------------------------------------------------- Revalidatie ---------------------------------------------------- #
+def test_revalidatie_met_304(offline):
+    landen = landen_cache.haal_landen_op()
+    opgehaald_op = landen_cache._landen_geheugen["opgehaald_op"]
+    verzoeken = offline.aantal_verzoeken
+
+    # Verlopen: één conditionele request, de server antwoordt 304 en de landen blijven dezelfde
+    assert landen_cache.haal_landen_op(ttl=0) is landen
+    assert offline.aantal_verzoeken == verzoeken + 1
+    assert landen_cache._landen_geheugen["opgehaald_op"] > opgehaald_op
+    with open(landen_cache.get_landen_cache_path()) as file:
+        assert json.load(file)["opgehaald_op"] == landen_cache._landen_geheugen["opgehaald_op"]
+
+def test_nieuwe_download_zonder_etag(offline):
+    landen = landen_cache.haal_landen_op()
+    landen_cache._landen_geheugen["etag"] = None
+    assert landen_cache.haal_landen_op(verversen=True) == landen
+    assert landen_cache._landen_geheugen["etag"] == '"landen"'
+
+# ----------------------------------------------------- Threads ------------------------------------------------------ #
+def test_gelijktijdig_vullen(offline):
+    """Veel threads tegelijk op een lege cache: één download, en iedereen krijgt dezelfde lijst."""
+    verzoeken = offline.aantal_verzoeken
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        resultaten = list(pool.map(lambda _: landen_cache.haal_landen_op(), range(64)))
+    assert offline.aantal_verzoeken == verzoeken + 1
+    assert all(landen is resultaten[0] for landen in resultaten)
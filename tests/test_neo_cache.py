@@ -0,0 +1,71 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import json
+import multiprocessing
+import shutil
+from datetime import date, timedelta
+
+import api_client
+import neo_cache
+
+# ---------------------------------------------------- Verversen ----------------------------------------------------- #
+def _ververs_in_proces():
+    # Elk proces een eigen sessie, niet de verbindingen van het hoofdproces
+    api_client._sessie = None
+    neo_cache.write_cache(stil=True)
+
+def test_verversen_over_processen(offline, monkeypatch):
+    """Vier processen die tegelijk verversen doen samen maar één NASA-verzoek per venster."""
+    monkeypatch.setattr(offline, "vertraging_s", 0.3)
+    shutil.rmtree(neo_cache.CACHE_MAP, ignore_errors=True)
+    verzoeken = offline.feed_verzoeken
+    context = multiprocessing.get_context("fork")
+    processen = [context.Process(target=_ververs_in_proces) for _ in range(4)]
+    for proces in processen:
+        proces.start()
+    for proces in processen:
+        proces.join()
+    assert all(proces.exitcode == 0 for proces in processen)
+    assert offline.feed_verzoeken - verzoeken == 1
+    assert not neo_cache.dagen_te_verversen()
+
+# --------------------------------------------- Alleen ontbrekende dagen --------------------------------------------- #
+def test_alleen_ontbrekende_en_verlopen_dagen_ophalen(offline, monkeypatch):
+    neo_cache.write_cache(stil=True)
+    versies = neo_cache.dag_versies()
+    dagen = sorted(versies)
+    # Twee dagen ontbreken, en vandaag is gisteren voor het laatst opgehaald (dus nog niet definitief)
+    index = neo_cache.read_index()
+    del index[dagen[1]], index[dagen[3]]
+    index[dagen[-1]]["opgehaald_op"] = (date.today() - timedelta(days=1)).isoformat() + "T12:00"
+    with open(neo_cache.get_index_path(), "w") as file:
+        json.dump(index, file)
+    assert neo_cache.dagen_te_verversen() == [dagen[1], dagen[3], dagen[-1]]
+
+    gevraagd = []
+    haal_dagen_op = neo_cache.haal_dagen_op
+    monkeypatch.setattr(neo_cache, "haal_dagen_op", lambda api_key, op_te_halen, **kwargs:
+                        gevraagd.extend(op_te_halen) or haal_dagen_op(api_key, op_te_halen, **kwargs))
+    verzoeken = offline.feed_verzoeken
+    neo_cache.write_cache(stil=True)
+    assert sorted(gevraagd) == [dagen[1], dagen[3], dagen[-1]]
+    # Drie losse dagen zijn drie vensters
+    assert offline.feed_verzoeken - verzoeken == 3
+    assert not neo_cache.dagen_te_verversen()
+    # De andere dagen zijn niet opnieuw geschreven
+    nieuw = neo_cache.dag_versies()
+    assert all(nieuw[dag] == versies[dag] for dag in dagen if dag not in gevraagd)
+    assert all(nieuw[dag] != versies[dag] for dag in gevraagd)
+
+# ----------------------------------------------------- Historie ----------------------------------------------------- #
+def test_historie_tabel(offline):
+    """De historie-tabel heeft de kolommen van build_table() plus de naderingsdatum, en volgt de filters."""
+    neo_cache.write_cache(stil=True)
+    kolommen, rijen = neo_cache.build_historie_table(sorteer="datum", aflopend=True)
+    assert len(rijen) == len(kolommen["id"]) == len(neo_cache.build_table())
+    datums = [rij[-1] for rij in rijen]
+    assert datums == sorted(datums, reverse=True)
+    assert [rij[:-1] for rij in rijen] == neo_cache.kolommen_naar_tabel(kolommen)
+
+    dag = min(neo_cache.dag_versies())
+    _, gevaarlijk = neo_cache.build_historie_table(van=dag, tot=dag, gevaarlijk=True)
+    assert gevaarlijk and all(rij[-1] == dag and rij[6] == "Ja" for rij in gevaarlijk)
@@ -0,0 +1,131 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+import neo_cache
+import neo_details
+from kolom_opslag import kolommen_naar_object
+
+@pytest.fixture
+def details(offline, monkeypatch):
+    """Lege details-cache in het geheugen (op schijf is de 'files/' map van offline nog leeg) en een gevulde feed."""
+    monkeypatch.setattr(neo_details, "_geheugen", {})
+    neo_cache.write_cache(stil=True)
+    kolommen, _ = neo_cache.read_kolommen()
+    return offline, kolommen, [str(neo_id) for neo_id in kolommen["id"][:5].tolist()]
+
+def nadering(datum, afstand_km, snelheid_kms, lichaam="Earth"):
+    return {
+        "close_approach_date": datum,
+        "relative_velocity": {"kilometers_per_hour": repr(snelheid_kms * 3600),
+                              "kilometers_per_second": repr(snelheid_kms)},
+        "miss_distance": {"kilometers": repr(afstand_km)},
+        "orbiting_body": lichaam,
+    }
+
+def maak_object(*naderingen):
+    return {"id": "1", "name": "(2024 AB1)", "close_approach_data": list(naderingen),
+            "estimated_diameter": {"meters": {"estimated_diameter_min": 10.0, "estimated_diameter_max": 20.0}},
+            "is_potentially_hazardous_asteroid": False}
+
+def dag(dagen):
+    return (date.today() + timedelta(days=dagen)).isoformat()
+
+# -------------------------------------------------- TTL per object -------------------------------------------------- #
+def test_alleen_ontbrekende_en_verlopen_objecten_ophalen(details, monkeypatch):
+    server, _, ids = details
+    verzoeken = server.lookup_verzoeken
+    opgehaald = neo_details.laad_details(ids)
+    assert sorted(opgehaald) == sorted(ids)
+    assert server.lookup_verzoeken - verzoeken == len(ids)
+
+    # Binnen de TTL komt alles uit de eigen cache, ook na een herstart (alleen nog op schijf)
+    assert neo_details.laad_details(ids) == opgehaald
+    monkeypatch.setattr(neo_details, "_geheugen", {})
+    assert neo_details.laad_details(ids) == opgehaald
+    assert server.lookup_verzoeken - verzoeken == len(ids)
+
+    # Elk object heeft zijn eigen ophaaltijd: alleen het verlopen object wordt opnieuw opgehaald
+    neo_details._geheugen[ids[0]] = (0, opgehaald[ids[0]])
+    assert neo_details.laad_details(ids) == opgehaald
+    assert server.lookup_verzoeken - verzoeken == len(ids) + 1
+    neo_details.laad_details(ids, ttl_s=0)
+    assert server.lookup_verzoeken - verzoeken == 2 * len(ids) + 1
+
+def test_tegelijk_ophalen(details, monkeypatch):
+    server, kolommen, _ = details
+    monkeypatch.setattr(server, "vertraging_s", 0.05)
+    ids = [str(neo_id) for neo_id in kolommen["id"][:100].tolist()]
+    verzoeken = server.lookup_verzoeken
+    start = time.perf_counter()
+    opgehaald = neo_details.laad_details(ids)
+    # Met 0,05 s per verzoek zou één voor één minstens 5 s duren
+    assert time.perf_counter() - start < 2
+    assert server.lookup_verzoeken - verzoeken == len(ids) == len(opgehaald)
+
+def test_oude_kopie_als_ophalen_mislukt(details, monkeypatch):
+    _, _, ids = details
+    oud = neo_details.laad_details(ids[:2])
+    monkeypatch.setattr(neo_details, "haal_neo_op", lambda api_key, neo_id: None)
+    # Verlopen maar niet op te halen: de oude kopie blijft in gebruik, een nieuw object ontbreekt
+    opgehaald = neo_details.laad_details(ids[:3], ttl_s=0)
+    assert opgehaald == oud
+    assert neo_details.lees_details(ids[0])[1] == oud[ids[0]]
+
+# ------------------------------------------------ Naderingen kiezen ------------------------------------------------- #
+def test_dichtstbij_en_snelst():
+    neo = maak_object(nadering("1950-03-01", 5e6, 12.0), nadering("2001-07-09", 2e6, 30.0),
+                      nadering("2030-01-01", 9e6, 41.0), nadering("2012-05-05", 1e5, 50.0, lichaam="Mars"))
+    # Naderingen van andere hemellichamen tellen niet mee
+    assert neo_details.kies_nadering(neo, "dichtstbij")["close_approach_data"][0]["close_approach_date"] == "2001-07-09"
+    assert neo_details.kies_nadering(neo, "snelst")["close_approach_data"][0]["close_approach_date"] == "2030-01-01"
+    # Alleen de volgorde verandert, er gaat geen nadering verloren en het origineel blijft gelijk
+    gekozen = neo_details.kies_nadering(neo, "snelst")
+    assert sorted(map(str, gekozen["close_approach_data"])) == sorted(map(str, neo["close_approach_data"]))
+    assert neo["close_approach_data"][0]["close_approach_date"] == "1950-03-01"
+
+def test_volgende_nadering():
+    neo = maak_object(nadering(dag(-400), 5e6, 12.0), nadering(dag(30), 2e6, 30.0), nadering(dag(900), 1e6, 41.0))
+    assert neo_details.kies_nadering(neo, "volgende")["close_approach_data"][0]["close_approach_date"] == dag(30)
+    # Komt er geen nadering meer, dan de laatste
+    verleden = maak_object(nadering(dag(-900), 5e6, 12.0), nadering(dag(-10), 2e6, 30.0))
+    assert neo_details.kies_nadering(verleden, "volgende")["close_approach_data"][0]["close_approach_date"] == dag(-10)
+
+def test_zonder_naderingen_van_de_aarde():
+    neo = maak_object(nadering("2001-07-09", 2e6, 30.0, lichaam="Venus"))
+    assert neo_details.kies_nadering(neo, "dichtstbij") is neo
+    with pytest.raises(ValueError):
+        neo_details.kies_nadering(neo, "grootst")
+
+# ------------------------------------------------- In de simulatie -------------------------------------------------- #
+def test_kolommen_met_nadering(details):
+    _, kolommen, ids = details
+    rijen = list(range(len(ids)))
+    opgehaald = neo_details.laad_details(ids)
+    for criterium, maat, kies in (("dichtstbij", "afstand_km", min), ("snelst", "snelheid_kms", max)):
+        gekozen = neo_details.kolommen_met_nadering(kolommen, rijen, criterium)
+        veld = {"afstand_km": ("miss_distance", "kilometers"),
+                "snelheid_kms": ("relative_velocity", "kilometers_per_second")}[maat]
+        verwacht = [kies(float(nadering[veld[0]][veld[1]]) for nadering in opgehaald[neo_id]["close_approach_data"]
+                         if nadering["orbiting_body"] == "Earth") for neo_id in ids]
+        assert np.allclose(gekozen[maat], verwacht)
+        assert gekozen["id"].tolist() == kolommen["id"][rijen].tolist()
+
+def test_object_met_nadering(details, monkeypatch):
+    _, kolommen, ids = details
+    neo = kolommen_naar_object(kolommen, 0)
+    dichtstbij = neo_details.object_met_nadering(neo, "dichtstbij")
+    afstanden = [float(nadering["miss_distance"]["kilometers"])
+                 for nadering in neo_details.laad_details([ids[0]])[ids[0]]["close_approach_data"]
+                 if nadering["orbiting_body"] == "Earth"]
+    assert float(dichtstbij["close_approach_data"][0]["miss_distance"]["kilometers"]) == min(afstanden)
+    with pytest.raises(ValueError):
+        neo_details.object_met_nadering(neo, "feed")
+    # Zonder details blijft de nadering uit de feed
+    monkeypatch.setattr(neo_details, "_geheugen", {})
+    monkeypatch.setattr(neo_details, "lees_details", lambda neo_id: None)
+    monkeypatch.setattr(neo_details, "haal_neo_op", lambda api_key, neo_id: None)
+    assert neo_details.object_met_nadering(neo, "snelst") is neo
@@ -0,0 +1,26 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import numpy as np
+
+import neo_cache
+import neo_historie
+
+# ------------------------------------------------------ Zoeken ------------------------------------------------------ #
+def test_zoeken_gelijk_aan_een_volledige_scan(offline):
+    neo_cache.write_cache(stil=True)
+    kolommen, _ = neo_cache.read_kolommen()
+    historie = neo_historie.get_historie()
+    assert historie.aantal() == len(kolommen["id"])
+
+    # Dezelfde selectie als een volledige scan over de kolommen, maar via de indexen
+    grens = float(np.median(kolommen["afstand_km"]))
+    verwacht = kolommen["gevaarlijk"] & (kolommen["afstand_km"] <= grens)
+    gevonden = historie.zoek(gevaarlijk=True, max_afstand_km=grens, sorteer="afstand_km")
+    assert sorted(gevonden["id"].tolist()) == sorted(kolommen["id"][verwacht].tolist())
+    assert np.all(np.diff(gevonden["afstand_km"]) >= 0)
+
+def test_verversen_voegt_niets_dubbel_toe(offline):
+    neo_cache.write_cache(stil=True)
+    historie = neo_historie.get_historie()
+    aantal = historie.aantal()
+    neo_cache.vul_historie_aan()
+    assert historie.aantal() == aantal == len(historie.zoek()["id"])
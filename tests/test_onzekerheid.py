@@ -0,0 +1,61 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import warnings
+
+import numpy as np
+import pytest
+
+import onzekerheid
+
+ASTEROIDEN = {"diameter_min": [20.0, 150.0, 900.0], "diameter_max": [45.0, 330.0, 2000.0],
+              "snelheid_kms": [12.0, 19.5, 31.0]}
+LANDEN = [["Land A", 17_000_000, 41_850, 406], ["Land B", 330_000_000, 9_372_610, 35]]
+
+# ---------------------------------------------------- Kwantielen ---------------------------------------------------- #
+def test_kwantielen_gelijk_aan_percentile():
+    """De kwantielen uit het histogram liggen binnen één bak (0,005 dex) van np.percentile over dezelfde trekkingen."""
+    aantal = 200_000
+    kwantielen = (1, 5, 25, 50, 75, 95, 99)
+    uitkomst = onzekerheid.monte_carlo_impact(ASTEROIDEN, aantal=aantal, seed=7, kwantielen=kwantielen)
+
+    # Dezelfde trekkingen als de simulatie: alle asteroïden en trekkingen passen in één chunk
+    joules = onzekerheid.trek_energie(np.random.default_rng(7), *(np.asarray(ASTEROIDEN[veld]) for veld in (
+        "diameter_min", "diameter_max", "snelheid_kms")), aantal)
+    verwacht = np.percentile(np.log10(joules), kwantielen, axis=1).T
+    breedte = (onzekerheid.LOG_ENERGIE_MAX - onzekerheid.LOG_ENERGIE_MIN) / onzekerheid.AANTAL_BAKKEN
+    assert np.all(np.abs(np.log10(uitkomst["joules"]) - verwacht) < breedte)
+
+def test_slachtoffers_per_land():
+    uitkomst = onzekerheid.monte_carlo_impact(ASTEROIDEN, LANDEN, aantal=10_000, seed=1)
+    assert uitkomst["slachtoffers"].shape == (3, 2, 3)
+    assert np.all(np.diff(uitkomst["slachtoffers"], axis=2) >= 0)
+
+# ------------------------------------------------- Reproduceerbaar -------------------------------------------------- #
+def test_zelfde_seed_zelfde_uitkomst():
+    eerste = onzekerheid.monte_carlo_impact(ASTEROIDEN, LANDEN, aantal=50_000, seed=2000433)
+    tweede = onzekerheid.monte_carlo_impact(ASTEROIDEN, LANDEN, aantal=50_000, seed=2000433)
+    ander = onzekerheid.monte_carlo_impact(ASTEROIDEN, LANDEN, aantal=50_000, seed=3542519)
+    for sleutel in ("joules", "magnitude", "slachtoffers"):
+        assert np.array_equal(eerste[sleutel], tweede[sleutel])
+    assert not np.array_equal(eerste["joules"], ander["joules"])
+
+def test_chunks_veranderen_de_verdeling_niet():
+    """Met kleinere chunks zijn de trekkingen anders verdeeld over de generator, maar de kwantielen blijven gelijk."""
+    groot = onzekerheid.monte_carlo_impact(ASTEROIDEN, aantal=200_000, seed=3)
+    klein = onzekerheid.monte_carlo_impact(ASTEROIDEN, aantal=200_000, seed=3, chunk_grootte=30_000)
+    assert np.allclose(np.log10(groot["joules"]), np.log10(klein["joules"]), atol=0.02)
+
+# ------------------------------------------------------ Invoer ------------------------------------------------------ #
+def test_minimale_diameter_nul():
+    asteroiden = {"diameter_min": [0.0, 20.0], "diameter_max": [45.0, 45.0], "snelheid_kms": [12.0, 12.0]}
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        uitkomst = onzekerheid.monte_carlo_impact(asteroiden, LANDEN, aantal=10_000, seed=1)
+    assert np.all(np.isfinite(uitkomst["joules"])) and np.all(uitkomst["joules"] > 0)
+    # Zonder minimale diameter is er geen spreiding in de diameter, dus een smallere marge
+    marge = np.log10(uitkomst["joules"][:, 2] / uitkomst["joules"][:, 0])
+    assert marge[0] < marge[1]
+
+def test_maximale_diameter_nul():
+    asteroiden = {"diameter_min": [0.0], "diameter_max": [0.0], "snelheid_kms": [12.0]}
+    with pytest.raises(ValueError):
+        onzekerheid.monte_carlo_impact(asteroiden, aantal=100, seed=1)
@@ -0,0 +1,30 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import numpy as np
+
+import parameter_sweep
+from impact_berekening import WORLD_POP
+
+ASTEROIDEN = {"diameter_min": [20.0, 40_000.0], "diameter_max": [45.0, 60_000.0], "snelheid_kms": [12.0, 25.0]}
+LANDEN = [["Land A", 17_000_000, 41_850, 406], ["Land B", 330_000_000, 9_372_610, 35]]
+
+# --------------------------------------------------- Landenmodel ---------------------------------------------------- #
+def test_slachtoffers_niet_meer_dan_de_wereldbevolking():
+    """Per (asteroïde, land) paar kan het aantal slachtoffers niet boven de wereldbevolking uitkomen."""
+    resultaat = parameter_sweep.sweep(ASTEROIDEN, LANDEN, dichtheden=(3000.0, 8000.0), processen=1)
+    assert np.all(resultaat["slachtoffers_max"] == WORLD_POP)
+    # Twee van de vier paren zijn de hele wereldbevolking, de kleine asteroïde doet in beide landen bijna niets
+    assert np.allclose(resultaat["slachtoffers_gemiddeld"], WORLD_POP / 2, rtol=0.01)
+
+def test_kleine_asteroiden_ongewijzigd():
+    klein = {veld: waarden[:1] for veld, waarden in ASTEROIDEN.items()}
+    resultaat = parameter_sweep.sweep(klein, LANDEN, processen=1)
+    assert 0 < resultaat["slachtoffers_max"][0] < LANDEN[0][1]
+
+# ---------------------------------------------------- Procespool ---------------------------------------------------- #
+def test_pool_gelijk_aan_een_proces():
+    raster = dict(dichtheden=(1500.0, 3000.0, 8000.0), snelheid_factoren=(0.8, 1.2), diameter_percentielen=(0, 100))
+    met_pool = parameter_sweep.sweep(ASTEROIDEN, LANDEN, processen=2, **raster)
+    zonder_pool = parameter_sweep.sweep(ASTEROIDEN, LANDEN, processen=1, **raster)
+    assert len(met_pool) == 3 * 2 * 2
+    for veld in met_pool.dtype.names:
+        assert np.allclose(met_pool[veld], zonder_pool[veld], equal_nan=True)
@@ -0,0 +1,125 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import copy
+
+import pytest
+
+import resultaten_cache
+from impact_berekening import impact_van_paar
+
+LAND = ["Land A", 17_000_000, 41_850, 406]
+
+def maak_asteroide(neo_id="2000433", diameter_max=45.0):
+    return {
+        "id": neo_id, "name": f"({neo_id})", "is_potentially_hazardous_asteroid": False,
+        "estimated_diameter": {"meters": {"estimated_diameter_min": 20.0, "estimated_diameter_max": diameter_max}},
+        "close_approach_data": [{"close_approach_date": "2024-01-01",
+                                 "relative_velocity": {"kilometers_per_second": "12.5",
+                                                       "kilometers_per_hour": "45000"},
+                                 "miss_distance": {"kilometers": "1000000"}, "orbiting_body": "Earth"}],
+    }
+
+@pytest.fixture
+def berekeningen():
+    """Houdt bij welke paren echt berekend zijn (en niet uit de cache kwamen)."""
+    paren = []
+
+    def bereken(asteroid, land):
+        paren.append((asteroid["id"], land[0]))
+        return impact_van_paar(asteroid, land)
+
+    return paren, bereken
+
+# ------------------------------------------------ Geheugen en schijf ------------------------------------------------ #
+def test_treffer_en_schijf_over_processen(tmp_path, berekeningen):
+    paren, bereken = berekeningen
+    pad = str(tmp_path / "resultaten.sqlite")
+    cache = resultaten_cache.Resultatencache(pad)
+    verwacht = cache.haal_op(maak_asteroide(), LAND, bereken)
+    assert cache.haal_op(maak_asteroide(), LAND, bereken) == verwacht
+    assert len(paren) == 1
+    cache.sluit()
+
+    # Een nieuw proces vindt de uitkomst op schijf
+    cache = resultaten_cache.Resultatencache(pad)
+    assert not cache.geheugen
+    assert cache.haal_op(maak_asteroide(), LAND, bereken) == verwacht
+    assert len(paren) == 1
+    cache.sluit()
+
+# --------------------------------------------------- Invalidatie ---------------------------------------------------- #
+def test_andere_landdata_opnieuw_berekenen(tmp_path, berekeningen):
+    paren, bereken = berekeningen
+    cache = resultaten_cache.Resultatencache(str(tmp_path / "resultaten.sqlite"))
+    verwacht = cache.haal_op(maak_asteroide(), LAND, bereken)
+    ander_land = copy.copy(LAND)
+    ander_land[1] *= 2
+    assert cache.haal_op(maak_asteroide(), ander_land, bereken)["slachtoffers"] != verwacht["slachtoffers"]
+    assert len(paren) == 2
+    cache.sluit()
+
+def test_andere_neo_data_opnieuw_berekenen(tmp_path, berekeningen):
+    """Een nieuwe versie van de NEO-cache met een andere diameter of snelheid geeft een andere vingerafdruk."""
+    paren, bereken = berekeningen
+    cache = resultaten_cache.Resultatencache(str(tmp_path / "resultaten.sqlite"))
+    verwacht = cache.haal_op(maak_asteroide(), LAND, bereken)
+    groter = cache.haal_op(maak_asteroide(diameter_max=90.0), LAND, bereken)
+    assert groter["joules"] > verwacht["joules"] and len(paren) == 2
+    sneller = maak_asteroide()
+    sneller["close_approach_data"][0]["relative_velocity"]["kilometers_per_second"] = "30.0"
+    cache.haal_op(sneller, LAND, bereken)
+    assert len(paren) == 3
+    # De nieuwe uitkomst vervangt de oude, ook op schijf
+    assert cache.aantal_op_schijf == 1
+    cache.sluit()
+
+def test_nieuwe_modelversie(tmp_path, berekeningen, monkeypatch):
+    paren, bereken = berekeningen
+    pad = str(tmp_path / "resultaten.sqlite")
+    cache = resultaten_cache.Resultatencache(pad)
+    cache.haal_op(maak_asteroide(), LAND, bereken)
+    cache.sluit()
+    monkeypatch.setattr(resultaten_cache, "MODEL_VERSIE", resultaten_cache.MODEL_VERSIE + 1)
+    cache = resultaten_cache.Resultatencache(pad)
+    cache.haal_op(maak_asteroide(), LAND, bereken)
+    assert len(paren) == 2
+    cache.sluit()
+
+# ----------------------------------------------------- Opruimen ----------------------------------------------------- #
+def test_lru_in_het_geheugen(tmp_path, berekeningen):
+    paren, bereken = berekeningen
+    cache = resultaten_cache.Resultatencache(str(tmp_path / "resultaten.sqlite"), max_in_geheugen=2)
+    for neo_id in ("1", "2", "1", "3"):
+        cache.haal_op(maak_asteroide(neo_id), LAND, bereken)
+    # "1" is recenter gebruikt dan "2", dus "2" valt eruit
+    assert [sleutel.split("|")[0] for sleutel in cache.geheugen] == ["1", "3"]
+    # Van schijf terug in het geheugen, zonder te rekenen
+    cache.haal_op(maak_asteroide("2"), LAND, bereken)
+    assert [sleutel.split("|")[0] for sleutel in cache.geheugen] == ["3", "2"]
+    assert len(paren) == 3
+    cache.sluit()
+
+def test_lru_op_schijf_zonder_tellen_per_uitkomst(tmp_path, berekeningen):
+    paren, bereken = berekeningen
+    pad = str(tmp_path / "resultaten.sqlite")
+    cache = resultaten_cache.Resultatencache(pad, max_in_geheugen=1, max_op_schijf=10)
+    opdrachten = []
+    cache.db.set_trace_callback(opdrachten.append)
+    for i in range(10):
+        cache.haal_op(maak_asteroide(str(i)), LAND, bereken)
+    cache.haal_op(maak_asteroide("0"), LAND, bereken)
+    assert not [opdracht for opdracht in opdrachten if "COUNT" in opdracht]
+
+    # Over de grens: één keer tellen en de langst niet gebruikte (plus 10% extra ruimte) verwijderen
+    cache.haal_op(maak_asteroide("10"), LAND, bereken)
+    assert len([opdracht for opdracht in opdrachten if "COUNT" in opdracht]) == 1
+    bewaard = {sleutel.split("|")[0] for sleutel, in cache.db.execute("SELECT sleutel FROM resultaten")}
+    assert bewaard == {"0", "3", "4", "5", "6", "7", "8", "9", "10"}
+    assert cache.aantal_op_schijf == 9
+    cache.sluit()
+
+    # Een nieuwe instantie telt bij het openen
+    cache = resultaten_cache.Resultatencache(pad)
+    assert cache.aantal_op_schijf == 9
+    cache.leeg()
+    assert cache.aantal_op_schijf == 0
+    cache.sluit()
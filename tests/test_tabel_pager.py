@@ -0,0 +1,74 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import random
+
+from prettytable import PrettyTable
+
+from tabel_pager import Pager
+
+KOLOMMEN = ["Naam", "Diameter", "Snelheid"]
+
+def maak_data(aantal=53, seed=0):
+    rng = random.Random(seed)
+    return [[f"NEO {i}", rng.uniform(1, 1000), rng.randint(5, 30)] for i in range(aantal)]
+
+def alle_paginas(pager, grootte):
+    return [rij for start in range(0, len(pager), grootte) for rij in pager.pagina(start, start + grootte)]
+
+# ----------------------------------------------------- Pagina's ----------------------------------------------------- #
+def test_paginas_zonder_sorteren():
+    data = maak_data()
+    pager = Pager(data, KOLOMMEN)
+    assert pager.pagina(0, 10) == data[:10]
+    assert alle_paginas(pager, 10) == data
+
+def test_randen():
+    data = maak_data()
+    pager = Pager(data, KOLOMMEN)
+    for omgekeerd in (False, True):
+        pager.sorteer("Diameter", omgekeerd)
+        verwacht = sorted(data, key=lambda rij: rij[1], reverse=omgekeerd)
+        # De laatste pagina is niet vol, voorbij het eind is er niets meer
+        assert pager.pagina(50, 60) == verwacht[50:53]
+        assert pager.pagina(53, 63) == []
+        assert pager.pagina(100, 110) == []
+        assert pager.pagina(0, 1000) == verwacht
+        assert pager.pagina(5, 5) == []
+    assert Pager([], KOLOMMEN).pagina(0, 10) == []
+
+# ----------------------------------------------------- Sorteren ----------------------------------------------------- #
+def test_oplopend_en_aflopend():
+    data = maak_data()
+    pager = Pager(data, KOLOMMEN)
+    pager.sorteer("Diameter")
+    assert alle_paginas(pager, 10) == sorted(data, key=lambda rij: rij[1])
+    pager.sorteer("Diameter", omgekeerd=True)
+    assert alle_paginas(pager, 10) == sorted(data, key=lambda rij: rij[1], reverse=True)
+    pager.sorteer("Naam", omgekeerd=True)
+    assert pager.pagina(0, 3) == sorted(data, key=lambda rij: rij[0], reverse=True)[:3]
+
+def test_gelijke_waarden():
+    data = maak_data()
+    pager = Pager(data, KOLOMMEN)
+    pager.sorteer("Snelheid", omgekeerd=True)
+    snelheden = [rij[2] for rij in alle_paginas(pager, 7)]
+    assert snelheden == sorted((rij[2] for rij in data), reverse=True)
+    assert sorted(map(tuple, alle_paginas(pager, 7))) == sorted(map(tuple, data))
+
+def test_elke_kolom_een_keer_gesorteerd():
+    pager = Pager(maak_data(), KOLOMMEN)
+    pager.sorteer("Diameter")
+    volgorde = pager.volgorde()
+    pager.sorteer("Diameter", omgekeerd=True)
+    pager.pagina(0, 10)
+    assert pager.volgorde() is volgorde
+
+# ----------------------------------------------------- Renderen ----------------------------------------------------- #
+def test_render_alleen_zichtbare_pagina():
+    data = maak_data()
+    pager = Pager(data, KOLOMMEN)
+    pager.sorteer("Diameter", omgekeerd=True)
+    table = PrettyTable()
+    tekst = pager.render(table, 0, 10)
+    assert len(table.rows) == 10
+    grootste = max(data, key=lambda rij: rij[1])
+    assert grootste[0] in tekst
@@ -0,0 +1,151 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import asyncio
+import json
+
+import neo_cache
+import neo_details
+import webservice
+from landen_cache import get_landen_index
+
+def service_met_data():
+    neo_cache.write_cache(stil=True)
+    service = webservice.Webservice(max_threads=2)
+    service.kolommen, service.neo_index = neo_cache.laad_neo_data()
+    service.landen, service.landen_index = get_landen_index()
+    return service
+
+async def vraag(poort, *paden):
+    """Stuurt de verzoeken na elkaar over één keep-alive verbinding en geeft (status, body) per verzoek."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", poort)
+    antwoorden = []
+    for pad in paden:
+        writer.write(f"GET {pad} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode("latin-1"))
+        kop = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        lengte = next(int(regel.split(":")[1]) for regel in kop if regel.lower().startswith("content-length"))
+        antwoorden.append((int(kop[0].split(" ")[1]), json.loads(await reader.readexactly(lengte))))
+    writer.close()
+    return antwoorden
+
+# -------------------------------------------------- Interne fouten -------------------------------------------------- #
+def test_fout_geeft_500_en_verbinding_blijft_open(offline):
+    service = service_met_data()
+    beantwoord = service.beantwoord
+
+    async def kapot_bij_top(pad, query):
+        if pad == "/top":
+            raise RuntimeError("kapotte ranking")
+        return await beantwoord(pad, query)
+
+    service.beantwoord = kapot_bij_top
+
+    async def hoofd():
+        server = await asyncio.start_server(service.verbinding, "127.0.0.1", 0)
+        try:
+            return await vraag(server.sockets[0].getsockname()[1], "/top", "/landen?limiet=2")
+        finally:
+            await service.stop(server)
+
+    (status_fout, body_fout), (status, body) = asyncio.run(hoofd())
+    assert status_fout == 500 and body_fout == {"fout": "interne fout"}
+    assert status == 200 and len(body) == 2
+
+# ----------------------------------------------- Ongeldige parameters ----------------------------------------------- #
+def test_negatieve_start_limiet_en_k(offline):
+    service = service_met_data()
+
+    async def hoofd():
+        return [await service.beantwoord(pad, query) for pad, query in (
+            ("/asteroiden", {"start": "-5"}), ("/landen", {"limiet": "-1"}), ("/top", {"k": "-3"}),
+            ("/landen", {"start": "2", "limiet": "0"}), ("/top", {"k": "0"}))]
+
+    antwoorden = asyncio.run(hoofd())
+    service.pool.shutdown()
+    assert [status for status, _ in antwoorden] == [400, 400, 400, 200, 200]
+    assert json.loads(antwoorden[3][1]) == json.loads(antwoorden[4][1]) == []
+
+# ----------------------------------------- Nieuwe data tijdens een verzoek ------------------------------------------ #
+def test_simulatie_rekent_met_de_data_van_het_verzoek(offline):
+    """Laadt laad() nieuwe data terwijl een simulatie in de pool wacht, dan rekent die met de oude data."""
+    service = service_met_data()
+    kolommen, landen = service.kolommen, service.landen
+    neo_id = str(kolommen["id"][3])
+
+    async def in_pool_met_wissel(functie, *args):
+        service.kolommen, service.landen = None, []
+        return functie(*args)
+
+    service.in_pool = in_pool_met_wissel
+    status, body = asyncio.run(service.beantwoord("/simulatie", {"asteroide": neo_id, "land": landen[5][0]}))
+    assert status == 200
+    assert body == webservice.Webservice.simulatie(kolommen, landen, 3, 5)
+    assert json.loads(body)["asteroide"]["id"] == neo_id
+    # Het antwoord hoort bij de oude data en komt dus niet in de cache
+    assert not service.antwoorden
+    service.pool.shutdown()
+
+# ----------------------------------------------- Verversen en stoppen ----------------------------------------------- #
+def test_verversing_overleeft_fouten_en_stopt_netjes(offline, monkeypatch):
+    pogingen = []
+
+    def ververs_cache():
+        pogingen.append(1)
+        if len(pogingen) == 1:
+            raise OSError("kapot cachebestand")
+
+    monkeypatch.setattr(webservice, "ververs_cache", ververs_cache)
+    service = service_met_data()
+
+    async def hoofd():
+        server = await asyncio.start_server(service.verbinding, "127.0.0.1", 0)
+        service.verversing = asyncio.create_task(service.ververs_periodiek(interval=0))
+        while len(pogingen) < 3:
+            await asyncio.sleep(0.01)
+        taak = service.verversing
+        await service.stop(server)
+        return taak
+
+    taak = asyncio.run(hoofd())
+    assert taak.cancelled() and service.verversing is None
+    assert service.pool._shutdown
+
+# ----------------------------------------------------- Nadering ----------------------------------------------------- #
+def test_simulatie_met_nadering(offline, monkeypatch):
+    monkeypatch.setattr(neo_details, "_geheugen", {})
+    service = service_met_data()
+    neo_id = str(service.kolommen["id"][0])
+    land = service.landen[2][0]
+    vragen = {"asteroide": neo_id, "land": land}
+
+    async def hoofd():
+        feed = await service.beantwoord("/simulatie", vragen)
+        dichtstbij = await service.beantwoord("/simulatie", {**vragen, "nadering": "dichtstbij"})
+        fout = await service.beantwoord("/simulatie", {**vragen, "nadering": "grootst"})
+        return feed, dichtstbij, fout
+
+    (status_feed, feed), (status, dichtstbij), (status_fout, _) = asyncio.run(hoofd())
+    service.pool.shutdown()
+    assert status_feed == status == 200 and status_fout == 400
+    verwacht = neo_details.kies_nadering(neo_details.laad_details([neo_id])[neo_id], "dichtstbij")
+    assert json.loads(dichtstbij)["asteroide"]["nadering"] == verwacht["close_approach_data"][0]["close_approach_date"]
+    # Feed en dichtstbij zijn elk een eigen antwoord in de cache
+    assert len(service.antwoorden) == 2
+
+# ------------------------------------------------------ Top-K ------------------------------------------------------- #
+def test_top_hoort_bij_de_geladen_data(offline):
+    """Staat er al een nieuwe versie van een dag op schijf die nog niet geladen is, dan rangschikt /top de oude data."""
+    service = service_met_data()
+    datum = max(neo_cache.dag_versies())
+    objecten = [neo_cache.kolommen_naar_object(neo_cache.read_shard(datum)["kolommen"], 0)]
+    objecten[0]["estimated_diameter"]["meters"]["estimated_diameter_max"] = 1e6
+    neo_cache.write_shards({datum: objecten}, neo_cache.time_stamp())
+
+    async def hoofd():
+        oud = await service.beantwoord("/top", {"maat": "diameter", "k": "3"})
+        await service.laad()
+        nieuw = await service.beantwoord("/top", {"maat": "diameter", "k": "3"})
+        return oud, nieuw
+
+    (_, oud), (_, nieuw) = asyncio.run(hoofd())
+    service.pool.shutdown()
+    assert objecten[0]["id"] not in [rij["id"] for rij in json.loads(oud)]
+    assert json.loads(nieuw)[0]["id"] == objecten[0]["id"]
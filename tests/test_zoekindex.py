@@ -0,0 +1,76 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import api_client
+import landen_cache
+from zoekindex import Zoekindex
+
+# Een stukje van het echte antwoord van REST Countries (name, population, area, altSpellings)
+RUWE_LANDEN = [
+    {"name": {"common": "United States", "official": "United States of America"}, "population": 329484123,
+     "area": 9372610.0, "altSpellings": ["US", "USA", "United States of America"]},
+    {"name": {"common": "United Kingdom", "official": "United Kingdom of Great Britain and Northern Ireland"},
+     "population": 67215293, "area": 242900.0, "altSpellings": ["GB", "UK", "Great Britain"]},
+    {"name": {"common": "Netherlands", "official": "Kingdom of the Netherlands"}, "population": 16655799,
+     "area": 41850.0, "altSpellings": ["NL", "Holland", "Nederland", "The Netherlands"]},
+    {"name": {"common": "Curaçao", "official": "Country of Curaçao"}, "population": 155014, "area": 444.0,
+     "altSpellings": ["CW", "Curacao", "Kòrsou"]},
+    {"name": {"common": "Niger", "official": "Republic of Niger"}, "population": 24206636, "area": 1267000.0,
+     "altSpellings": ["NE", "Nijar"]},
+    {"name": {"common": "Nigeria", "official": "Federal Republic of Nigeria"}, "population": 206139587,
+     "area": 923768.0, "altSpellings": ["NG", "Nijeriya", "Naíjíríà"]},
+]
+
+def maak_index():
+    namen = [land[0] for land in api_client.parse_landen(RUWE_LANDEN)]
+    aliassen = api_client.parse_aliassen(RUWE_LANDEN)
+    return namen, Zoekindex(namen, aliassen=[aliassen[naam] for naam in namen])
+
+# ------------------------------------------------------ Exact ------------------------------------------------------- #
+def test_exact_op_sleutel_en_naam():
+    index = Zoekindex(["(2024 AB1)", "433 Eros (A898 PA)"], sleutels=[3542519, 2000433])
+    assert index.zoek_exact("2000433") == 1
+    assert index.zoek_exact(" 3542519 ") == 0
+    # Hoofdletters, haakjes en dubbele spaties maken niet uit
+    assert index.zoek_exact("2024  ab1") == 0
+    assert index.zoek_exact("433 eros a898 pa") == 1
+    assert index.zoek_exact("2024 AB") is None
+
+def test_exact_zonder_accenten():
+    namen, index = maak_index()
+    assert index.zoek_exact("curacao") == namen.index("Curaçao")
+    assert index.zoek_exact("NETHERLANDS") == namen.index("Netherlands")
+
+# ------------------------------------------------------ Prefix ------------------------------------------------------ #
+def test_prefix_via_trie():
+    namen, index = maak_index()
+    assert sorted(namen[positie] for positie in index.zoek_prefix("united")) == ["United Kingdom", "United States"]
+    assert sorted(namen[positie] for positie in index.zoek_prefix("Nig")) == ["Niger", "Nigeria"]
+    assert index.zoek_prefix("nig", limiet=1) == [namen.index("Niger")]
+    assert index.zoek_prefix("xyz") == []
+
+# ---------------------------------------------------- Suggesties ---------------------------------------------------- #
+def test_suggesties_bij_typfout():
+    namen, index = maak_index()
+    positie, score = index.suggesties("Netherlnds")[0]
+    assert namen[positie] == "Netherlands"
+    scores = [score for _, score in index.suggesties("nigeria")]
+    assert scores == sorted(scores, reverse=True)
+    assert namen[index.suggesties("nigeria")[0][0]] == "Nigeria"
+    assert index.suggesties("") == []
+
+# --------------------------------------------------- Andere namen --------------------------------------------------- #
+def test_varianten_van_de_verenigde_staten():
+    """"USA" en "United States of America" zijn geen suggestie maar een exacte treffer voor "United States"."""
+    namen, index = maak_index()
+    for invoer in ("United States", "USA", "usa", "US", "United States of America"):
+        assert index.zoek_exact(invoer) == namen.index("United States"), invoer
+    assert index.zoek_exact("UK") == namen.index("United Kingdom")
+    assert index.zoek_exact("Holland") == namen.index("Netherlands")
+
+def test_alias_verdringt_geen_echte_naam():
+    index = Zoekindex(["Niger", "Nigeria"], aliassen=[["Nigeria"], []])
+    assert index.zoek_exact("Nigeria") == 1
+
+def test_aliassen_uit_landen_cache(offline):
+    landen, index = landen_cache.get_landen_index()
+    assert landen[index.zoek_exact("L7")][0] == "Land 7"
+    assert landen[index.zoek_exact("Republiek Land 12")][0] == "Land 12"
@@ -0,0 +1,321 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import asyncio # één event loop voor alle verbindingen
+import contextlib
+import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor          # Blokkerend werk (cache lezen, rekenen) buiten de loop
+from urllib.parse import urlsplit, parse_qs
+
+from cprint import cprint                                   # Printen in kleurtjes
+from batch_cli import asteroide_records, land_records, top_records  # Dezelfde records als de batch-modus
+from dreiging_ranking import ranking_van_kolommen, MATEN
+from instrumentatie import tel
+from kolom_opslag import kolommen_naar_object
+from landen_cache import get_landen_index
+from neo_cache import laad_neo_data, ververs_cache
+from neo_details import object_met_nadering, NADERINGEN
+from resultaten_cache import impact_van_paar_gecachet
+
+# Lokale HTTP-service voor dashboards:
+#   GET /asteroiden[?start=0&limiet=100]        alle asteroïden in de cache
+#   GET /landen[?start=0&limiet=100]            alle landen
+#   GET /simulatie?asteroide=<id of naam>&land=<naam>   hetzelfde resultaat als impact_simulatie() in het menu
+#       [&nadering=dichtstbij|snelst|volgende]          met die nadering uit de lookup-API (zie neo_details.py)
+#   GET /top[?maat=joules&k=10&gevaarlijk=1&land=<naam>]  de gevaarlijkste asteroïden (zie dreiging_ranking.py)
+# Alles draait in één asyncio event loop; het lezen van de cache en het rekenen gebeurt in een kleine thread pool.
+# De data wordt gedeeld door alle verzoeken en antwoorden worden als kant-en-klare bytes bewaard in een LRU-cache,
+# die geleegd wordt zodra er nieuwe data geladen is.
+HOST = "127.0.0.1"
+POORT = 8080
+MAX_THREADS = 4
+ANTWOORD_CACHE_GROOTTE = 10_000
+# Hoe vaak (in seconden) er gekeken wordt of de cache op schijf ververst is
+VERVERS_INTERVAL_S = 60
+
+STATUS_TEKST = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                500: "Internal Server Error", 503: "Service Unavailable"}
+
+# -------------------------------------------------- Service --------------------------------------------------------- #
+class Webservice:
+    """
+    Beantwoordt de HTTP-verzoeken en houdt de gedeelde data en de antwoord-cache bij.
+    """
+    def __init__(self, max_threads=MAX_THREADS, cache_grootte=ANTWOORD_CACHE_GROOTTE):
+        self.pool = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="webservice")
+        self.cache_grootte = cache_grootte
+        self.antwoorden = OrderedDict()
+        self.kolommen = None
+        self.neo_index = None
+        self.landen = []
+        self.landen_index = None
+        # (kolommen, ranglijst over die kolommen), pas bij de eerste /top opgebouwd
+        self.ranking = None
+        self.verversing = None
+
+    async def in_pool(self, functie, *args):
+        """Voert blokkerend werk uit in de thread pool, zodat de event loop andere verzoeken kan blijven afhandelen."""
+        return await asyncio.get_running_loop().run_in_executor(self.pool, functie, *args)
+
+    async def laad(self):
+        """
+        Laadt de NEO-data en landen (uit de caches van neo_cache/landen_cache). Is er iets veranderd,
+        dan worden de bewaarde antwoorden weggegooid.
+        """
+        kolommen, neo_index = await self.in_pool(laad_neo_data)
+        landen, landen_index = await self.in_pool(get_landen_index)
+        if kolommen is not self.kolommen or landen is not self.landen:
+            self.kolommen, self.neo_index = kolommen, neo_index
+            self.landen, self.landen_index = landen, landen_index
+            self.ranking = None
+            self.antwoorden.clear()
+
+    async def ververs_periodiek(self, interval=VERVERS_INTERVAL_S):
+        """
+        Start zo nodig een verversing van de cache op de achtergrond en laadt daarna nieuwe data in.
+        Gaat dat mis (bijv. een kapot cachebestand), dan blijft de oude data staan en volgt de volgende poging
+        na het interval.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.in_pool(ververs_cache)
+                await self.laad()
+            except Exception as fout:
+                cprint(f"Verversen van de data mislukt: {fout!r}", c="rB")
+                tel("webservice_verversing_fouten")
+
+    def uit_cache(self, sleutel):
+        """Geeft een bewaard antwoord (en markeert het als recent gebruikt), of None."""
+        antwoord = self.antwoorden.get(sleutel)
+        if antwoord is not None:
+            self.antwoorden.move_to_end(sleutel)
+            tel("webservice_cache_hits")
+        return antwoord
+
+    def in_cache(self, sleutel, antwoord):
+        """Bewaart een antwoord, het langst niet gebruikte antwoord valt eruit als de cache vol is."""
+        self.antwoorden[sleutel] = antwoord
+        if len(self.antwoorden) > self.cache_grootte:
+            self.antwoorden.popitem(last=False)
+        tel("webservice_cache_misses")
+        return antwoord
+
+    async def beantwoord(self, pad, query):
+        """
+        Geeft (statuscode, JSON-bytes) voor één verzoek.
+        De data wordt aan het begin één keer vastgepakt: laadt laad() ondertussen nieuwe data in, dan rekent dit
+        verzoek nog helemaal met de oude (en komt het antwoord niet in de geleegde cache).
+        """
+        kolommen, neo_index = self.kolommen, self.neo_index
+        landen, landen_index = self.landen, self.landen_index
+
+        def bewaar(sleutel, antwoord):
+            return self.in_cache(sleutel, antwoord) if kolommen is self.kolommen and landen is self.landen else antwoord
+
+        if pad in ("/asteroiden", "/landen"):
+            try:
+                start = int(query.get("start", 0))
+                limiet = int(query["limiet"]) if "limiet" in query else None
+            except ValueError:
+                return 400, fout_json("start en limiet moeten gehele getallen zijn")
+            # Negatief zou via de slice vanaf het eind tellen
+            if start < 0 or (limiet is not None and limiet < 0):
+                return 400, fout_json("start en limiet mogen niet negatief zijn")
+            sleutel = (pad, start, limiet)
+            antwoord = self.uit_cache(sleutel)
+            if antwoord is None:
+                antwoord = bewaar(sleutel, await self.in_pool(self.lijst, kolommen, landen, pad, start, limiet))
+            return 200, antwoord
+
+        if pad == "/simulatie":
+            if kolommen is None or not landen:
+                return 503, fout_json("er is (nog) geen data beschikbaar")
+            if "asteroide" not in query or "land" not in query:
+                return 400, fout_json("geef 'asteroide' en 'land' mee")
+            rij = neo_index.zoek_exact(query["asteroide"])
+            if rij is None:
+                return 404, fout_json(f"onbekende asteroïde: {query['asteroide']}")
+            positie = landen_index.zoek_exact(query["land"])
+            if positie is None:
+                return 404, fout_json(f"onbekend land: {query['land']}")
+            nadering = query.get("nadering", "feed")
+            if nadering not in ("feed",) + NADERINGEN:
+                return 400, fout_json(f"nadering moet een van feed, {', '.join(NADERINGEN)} zijn")
+            # Sleutel op het echte id en de echte landnaam, zo delen "Netherlands" en "netherlands" één antwoord
+            sleutel = ("/simulatie", int(kolommen["id"][rij]), landen[positie][0], nadering)
+            antwoord = self.uit_cache(sleutel)
+            if antwoord is None:
+                antwoord = bewaar(sleutel, await self.in_pool(self.simulatie, kolommen, landen, rij, positie,
+                                                              nadering))
+            return 200, antwoord
+
+        if pad == "/top":
+            try:
+                k = int(query.get("k", 10))
+            except ValueError:
+                return 400, fout_json("k moet een geheel getal zijn")
+            if k < 0:
+                return 400, fout_json("k mag niet negatief zijn")
+            maat = query.get("maat", "joules")
+            if maat not in MATEN:
+                return 400, fout_json(f"maat moet een van {', '.join(MATEN)} zijn")
+            gevaarlijk = query.get("gevaarlijk", "").lower() in ("1", "true", "ja")
+            land = None
+            if "land" in query:
+                positie = None if landen_index is None else landen_index.zoek_exact(query["land"])
+                if positie is None:
+                    return 404, fout_json(f"onbekend land: {query['land']}")
+                land = landen[positie]
+            sleutel = ("/top", maat, k, gevaarlijk, None if land is None else land[0])
+            antwoord = self.uit_cache(sleutel)
+            if antwoord is None:
+                antwoord = bewaar(sleutel, await self.in_pool(self.top, kolommen, maat, k, gevaarlijk, land))
+            return 200, antwoord
+
+        return 404, fout_json(f"onbekend pad: {pad}")
+
+    @staticmethod
+    def lijst(kolommen, landen, pad, start, limiet):
+        """De JSON voor /asteroiden of /landen (draait in de thread pool)."""
+        if pad == "/asteroiden":
+            aantal = 0 if kolommen is None else len(kolommen["id"])
+            rijen = range(aantal)[start:None if limiet is None else start + limiet]
+            records = list(asteroide_records(kolommen, rijen))
+        else:
+            posities = range(len(landen))[start:None if limiet is None else start + limiet]
+            records = list(land_records(landen, posities))
+        return json.dumps(records, ensure_ascii=False).encode("utf-8")
+
+    @staticmethod
+    def simulatie(kolommen, landen, rij, positie, nadering="feed"):
+        """De JSON voor één asteroïde en één land (draait in de thread pool)."""
+        asteroid = kolommen_naar_object(kolommen, rij)
+        if nadering != "feed":
+            asteroid = object_met_nadering(asteroid, nadering)
+        land = landen[positie]
+        return json.dumps({
+            "asteroide": {"id": asteroid["id"], "naam": asteroid["name"],
+                          "nadering": asteroid["close_approach_data"][0]["close_approach_date"]},
+            "land": next(land_records(landen, [positie])),
+            "resultaat": impact_van_paar_gecachet(asteroid, land),
+        }, ensure_ascii=False).encode("utf-8")
+
+    def ranglijst(self, kolommen):
+        """
+        De ranglijst over dezelfde kolommen als de rest van het verzoek, één keer opgebouwd per data-load.
+        Niet de gedeelde ranglijst van dreiging_ranking.get_ranking(): die gaat mee met de cache op schijf, ook als
+        de service de nieuwe data nog niet geladen heeft.
+        """
+        bewaard = self.ranking
+        if bewaard is not None and bewaard[0] is kolommen:
+            return bewaard[1]
+        ranking = ranking_van_kolommen(kolommen)
+        if kolommen is self.kolommen:
+            self.ranking = (kolommen, ranking)
+        return ranking
+
+    def top(self, kolommen, maat, k, gevaarlijk, land):
+        """De JSON voor /top (draait in de thread pool)."""
+        ranking = self.ranglijst(kolommen)
+        rijen = ranking.top(k, maat, gevaarlijk) if land is None else ranking.top_voor_land(land, k, gevaarlijk)
+        return json.dumps(list(top_records(rijen)), ensure_ascii=False).encode("utf-8")
+
+    async def verbinding(self, reader, writer):
+        """
+        Handelt één (keep-alive) verbinding af: verzoek lezen, beantwoorden, en door tot de client stopt.
+        Alleen GET zonder body wordt ondersteund, meer hebben de dashboards niet nodig.
+        """
+        try:
+            while True:
+                try:
+                    kop = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                regels = kop.decode("latin-1").split("\r\n")
+                try:
+                    methode, doel, versie = regels[0].split(" ", 2)
+                except ValueError:
+                    await stuur(writer, 400, fout_json("ongeldig verzoek"), False)
+                    break
+                headers = {}
+                for regel in regels[1:]:
+                    naam, _, waarde = regel.partition(":")
+                    headers[naam.strip().lower()] = waarde.strip()
+                open_houden = (headers.get("connection", "").lower() != "close"
+                               and (versie == "HTTP/1.1" or headers.get("connection", "").lower() == "keep-alive"))
+
+                if methode != "GET":
+                    status, body = 405, fout_json("alleen GET wordt ondersteund")
+                else:
+                    url = urlsplit(doel)
+                    query = {sleutel: waarden[0] for sleutel, waarden in parse_qs(url.query).items()}
+                    pad = url.path.rstrip("/") or "/"
+                    try:
+                        status, body = await self.beantwoord(pad, query)
+                    except Exception as fout:
+                        # Eén kapot verzoek mag de verbinding (en zeker de service) niet laten vallen
+                        cprint(f"Fout bij GET {doel}: {fout!r}", c="rB")
+                        tel("webservice_fouten")
+                        status, body = 500, fout_json("interne fout")
+                tel("webservice_verzoeken")
+                await stuur(writer, status, body, open_houden)
+                if not open_houden:
+                    break
+        finally:
+            writer.close()
+
+    async def start(self, host=HOST, poort=POORT):
+        """
+        Laadt de data en start de server.
+
+        :return: De asyncio.Server (met server.sockets[0].getsockname() voor de echte poort als poort 0 is).
+        """
+        await self.in_pool(ververs_cache)
+        await self.laad()
+        server = await asyncio.start_server(self.verbinding, host, poort)
+        self.verversing = asyncio.create_task(self.ververs_periodiek())
+        return server
+
+    async def stop(self, server):
+        """
+        Stopt de server, de periodieke verversing en de thread pool. Werk dat nog in de pool wacht wordt geannuleerd,
+        op werk dat al draait wordt gewacht (buiten de event loop).
+        """
+        server.close()
+        await server.wait_closed()
+        if self.verversing is not None:
+            self.verversing.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.verversing
+            self.verversing = None
+        await asyncio.to_thread(self.pool.shutdown, wait=True, cancel_futures=True)
+
+# -------------------------------------------------- Hulpfuncties ---------------------------------------------------- #
+def fout_json(melding):
+    return json.dumps({"fout": melding}, ensure_ascii=False).encode("utf-8")
+
+async def stuur(writer, status, body, open_houden):
+    """Schrijft een HTTP/1.1-antwoord met JSON-body."""
+    writer.write(
+        f"HTTP/1.1 {status} {STATUS_TEKST[status]}\r\n"
+        f"Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if open_houden else 'close'}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+
+def draai(host=HOST, poort=POORT, max_threads=MAX_THREADS):
+    """
+    Start de service en blijft draaien tot Ctrl+C.
+    """
+    async def hoofd():
+        server = await Webservice(max_threads).start(host, poort)
+        host_echt, poort_echt = server.sockets[0].getsockname()[:2]
+        cprint(f"ASTRO-impact service draait op http://{host_echt}:{poort_echt} (stoppen met Ctrl+C)", c="g")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(hoofd())
+    except KeyboardInterrupt:
+        cprint("Service gestopt.", c="y")
@@ -0,0 +1,113 @@
+# ----------------------------------------- Import van modules en packages ------------------------------------------- #
+import heapq # Alleen de beste suggesties sorteren in plaats van alles
+import unicodedata # Accenten weghalen, zodat "Curacao" ook "Curaçao" vindt
+from collections import defaultdict
+
+# --------------------------------------------------- Hulpfuncties --------------------------------------------------- #
+def normaliseer(tekst):
+    """
+    Maakt een naam vergelijkbaar: kleine letters, zonder accenten, haakjes en dubbele spaties.
+    Zo worden bijv. "(2024 AB1)", "2024 ab1" en " 2024  AB1 " dezelfde sleutel.
+    """
+    tekst = unicodedata.normalize("NFKD", str(tekst))
+    tekst = "".join(teken for teken in tekst if not unicodedata.combining(teken))
+    tekst = tekst.lower().replace("(", " ").replace(")", " ")
+    return " ".join(tekst.split())
+
+def ngrammen(tekst, n=3):
+    """
+    Alle n-grammen (standaard trigrammen) van een genormaliseerde tekst, met spaties als begin- en eindmarkering.
+    """
+    tekst = f"  {tekst} "
+    return {tekst[i:i + n] for i in range(len(tekst) - n + 1)}
+
+# ---------------------------------------------------- Zoekindex ----------------------------------------------------- #
+class Zoekindex:
+    """
+    Index over een lijst namen (en optioneel unieke sleutels zoals NEO id's), één keer opgebouwd per dataset:
+    - een hash map voor exacte sleutels en namen: O(1),
+    - een prefix-trie voor namen die beginnen met de invoer: O(lengte prefix),
+    - een trigram-index voor suggesties bij typfouten of andere schrijfwijzen.
+    Met 'aliassen' (per naam een lijst andere namen, bijv. "USA" voor "United States") vindt zoek_exact() ook die.
+    De zoekfuncties geven posities in de oorspronkelijke lijst terug.
+    """
+    def __init__(self, namen, sleutels=None, aliassen=None):
+        self.namen = list(namen)
+        self.exact = {}
+        self.trie = {}
+        self.trigrammen = defaultdict(list)
+        self.aantal_trigrammen = []
+
+        if sleutels is not None:
+            for positie, sleutel in enumerate(sleutels):
+                self.exact.setdefault(str(sleutel), positie)
+
+        for positie, naam in enumerate(self.namen):
+            genormaliseerd = normaliseer(naam)
+            self.exact.setdefault(genormaliseerd, positie)
+
+            # Elke knoop in de trie houdt bij welke namen eronder vallen, zodat een prefix direct antwoord geeft
+            knoop = self.trie
+            for teken in genormaliseerd:
+                knoop = knoop.setdefault(teken, {})
+                knoop.setdefault("", []).append(positie)
+
+            grammen = ngrammen(genormaliseerd)
+            self.aantal_trigrammen.append(len(grammen))
+            for gram in grammen:
+                self.trigrammen[gram].append(positie)
+
+        # Pas na alle namen, zodat een alias nooit de echte naam van een ander item verdringt
+        if aliassen is not None:
+            for positie, andere_namen in enumerate(aliassen):
+                for alias in andere_namen:
+                    self.exact.setdefault(normaliseer(alias), positie)
+
+    def __len__(self):
+        return len(self.namen)
+
+    def zoek_exact(self, invoer):
+        """
+        Zoekt een exacte sleutel (bijv. een NEO id), naam of alias, hoofdletters en accenten maken niet uit.
+
+        :return: De positie in de lijst, of None.
+        """
+        invoer = str(invoer).strip()
+        if invoer in self.exact:
+            return self.exact[invoer]
+        return self.exact.get(normaliseer(invoer))
+
+    def zoek_prefix(self, prefix, limiet=10):
+        """
+        Geeft de posities van de (eerste 'limiet') namen die beginnen met de prefix.
+        """
+        knoop = self.trie
+        for teken in normaliseer(prefix):
+            knoop = knoop.get(teken)
+            if knoop is None:
+                return []
+        return knoop.get("", [])[:limiet]
+
+    def suggesties(self, invoer, limiet=5):
+        """
+        Geeft de best passende namen voor de invoer, gerangschikt op score (hoog → laag).
+        De score is de Dice-overeenkomst van de trigrammen; namen die met de invoer beginnen krijgen een bonus.
+
+        :return: Lijst met (positie, score) tuples.
+        """
+        genormaliseerd = normaliseer(invoer)
+        if not genormaliseerd:
+            return []
+        grammen = ngrammen(genormaliseerd)
+        gedeeld = defaultdict(int)
+        for gram in grammen:
+            for positie in self.trigrammen.get(gram, ()):
+                gedeeld[positie] += 1
+
+        scores = {
+            positie: 2 * aantal / (len(grammen) + self.aantal_trigrammen[positie])
+            for positie, aantal in gedeeld.items()
+        }
+        for positie in self.zoek_prefix(genormaliseerd, limiet):
+            scores[positie] = scores.get(positie, 0) + 1
+        return heapq.nlargest(limiet, scores.items(), key=lambda item: item[1])